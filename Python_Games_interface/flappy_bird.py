@@ -1,7 +1,11 @@
 import tkinter as tk
 import random
-from tkinter import simpledialog
 import leaderboard_core as lb
+from game_loop import FixedStepLoop
+from game_window import GameWindow, main
+
+# physics step; GRAVITY, FLAP_STRENGTH and the pipe speeds are per step
+STEP_S = 0.02
 
 WIDTH = 400
 HEIGHT = 600
@@ -22,245 +26,217 @@ MAX_PIPE_SPEED = 5
 BASE_MIN_PIPE_DISTANCE = 200
 MIN_MIN_PIPE_DISTANCE = 140
 
-bird_x = 80
-bird_y = HEIGHT // 2
-bird_vy = 0
-
-pipes = []
-score = 0
-best_score = 0
-game_over = False
-score_saved = False
-PLAYER_NAME = "Player"
-
-root = tk.Tk()
-root.title("Flappy Bird")
-root.configure(bg="#1e1e2f")
-root.resizable(False, False)
-
-canvas = tk.Canvas(
-    root, width=WIDTH, height=HEIGHT, bg="#222333", highlightthickness=0
-)
-canvas.pack(padx=10, pady=10)
-
-score_label = tk.Label(
-    root,
-    text="Score: 0 | Best: 0",
-    font=("Arial", 14, "bold"),
-    bg="#1e1e2f",
-    fg="#f8f8f2",
-)
-score_label.pack(pady=(0, 10))
-
-bird_item = None
-
-
-def difficulty_factor():
-    return min(score / 10.0, 1.0)
-
-
-def get_pipe_gap():
-    f = difficulty_factor()
-    return int(BASE_PIPE_GAP - (BASE_PIPE_GAP - MIN_PIPE_GAP) * f)
-
-
-def get_pipe_interval():
-    f = difficulty_factor()
-    return int(BASE_PIPE_INTERVAL - (BASE_PIPE_INTERVAL - MIN_PIPE_INTERVAL) * f)
-
-
-def get_pipe_speed():
-    f = min(score / 15.0, 1.0)
-    return BASE_PIPE_SPEED + (MAX_PIPE_SPEED - BASE_PIPE_SPEED) * f
-
-
-def get_min_pipe_distance():
-    f = difficulty_factor()
-    return int(BASE_MIN_PIPE_DISTANCE - (BASE_MIN_PIPE_DISTANCE - MIN_MIN_PIPE_DISTANCE) * f)
-
-
-def draw_ground():
-    canvas.create_rectangle(0, GROUND_Y, WIDTH, HEIGHT, fill="#444444", outline="")
-
-
-def draw_bird():
-    global bird_item
-    r = 14
-    if bird_item is not None:
-        canvas.delete(bird_item)
-    bird_item = canvas.create_oval(
-        bird_x - r, bird_y - r, bird_x + r, bird_y + r, fill="#ffeb3b", outline=""
-    )
-
-
-def reset_game():
-    global bird_y, bird_vy, pipes, score, game_over, score_saved
-    bird_y = HEIGHT // 2
-    bird_vy = 0
-    pipes = []
-    score = 0
-    game_over = False
-    score_saved = False
-    update_score_label()
-    canvas.delete("all")
-    draw_ground()
-    draw_bird()
-    root.after(20, game_loop)
-    root.after(get_pipe_interval(), spawn_pipe)
-
-
-def spawn_pipe():
-    if game_over:
-        return
-    if pipes:
-        last_x = pipes[-1]["x"]
-        distance = WIDTH - last_x
-        if distance < get_min_pipe_distance():
-            root.after(200, spawn_pipe)
-            return
-    gap = get_pipe_gap()
-    gap_y = random.randint(100, HEIGHT - 150 - gap)
-    pipes.append({"x": WIDTH, "gap_y": gap_y, "gap": gap, "passed": False})
-    root.after(get_pipe_interval(), spawn_pipe)
-
-
-def bird_collides_with_rect(rect):
-    x1, y1, x2, y2 = rect
-    r = 14
-    bx1 = bird_x - r
-    by1 = bird_y - r
-    bx2 = bird_x + r
-    by2 = bird_y + r
-    return not (bx2 < x1 or bx1 > x2 or by2 < y1 or by1 > y2)
-
-
-def update_pipes():
-    global score, best_score, game_over
-    new_pipes = []
-    speed = get_pipe_speed()
-
-    for p in pipes:
-        p["x"] -= speed
-        x = p["x"]
-        gap_y = p["gap_y"]
-        gap = p["gap"]
-
-        top_rect = (x, 0, x + 70, gap_y)
-        bottom_rect = (x, gap_y + gap, x + 70, GROUND_Y)
-
-        if bird_collides_with_rect(top_rect) or bird_collides_with_rect(bottom_rect):
-            game_over = True
-
-        if x + 70 < bird_x and not p["passed"]:
-            p["passed"] = True
-            score += 1
-            if score > best_score:
-                best_score = score
-            update_score_label()
-
-        if x + 70 > 0:
-            new_pipes.append(p)
-
-    return new_pipes
-
-
-def update_score_label():
-    score_label.config(text=f"Score: {score} | Best: {best_score}")
-
-
-def save_score_if_needed():
-    global score_saved
-    if score_saved:
-        return
-    score_saved = True
-    if PLAYER_NAME and score > 0:
-        lb.add_score(
-            "flappy_bird",
-            PLAYER_NAME,
-            score,
-            extra={"best_session": best_score},
-        )
-
-
-def game_loop():
-    global bird_y, bird_vy, game_over, pipes
-
-    if game_over:
-        save_score_if_needed()
-        canvas.create_text(
-            WIDTH // 2,
-            HEIGHT // 2,
-            text="Game Over",
-            fill="white",
-            font=("Arial", 24, "bold"),
-        )
-        canvas.create_text(
-            WIDTH // 2,
-            HEIGHT // 2 + 40,
-            text="Press Space to restart",
-            fill="white",
-            font=("Arial", 12),
+BIRD_X = 80
+
+
+class FlappyBird(GameWindow):
+    title = "Flappy Bird"
+
+    def __init__(self, window):
+        super().__init__(window)
+        self.bird_y = HEIGHT // 2
+        # where the bird was one update ago, for drawing between updates
+        self.prev_bird_y = self.bird_y
+        self.bird_vy = 0
+        self.pipes = []
+        # ms of game time until the next spawn_pipe()
+        self.spawn_in_ms = 0
+        self.score = 0
+        self.best_score = 0
+        self.game_over = False
+        self.score_saved = False
+        self.bird_item = None
+        self.loop = FixedStepLoop(self, self.update, self.render, STEP_S, name="flappy_bird")
+
+        self.root.configure(bg="#1e1e2f")
+        self.root.resizable(False, False)
+
+        self.canvas = tk.Canvas(
+            self.root, width=WIDTH, height=HEIGHT, bg="#222333", highlightthickness=0
         )
-        return
-
-    bird_vy += GRAVITY
-    bird_y += bird_vy
-
-    if bird_y < 0:
-        bird_y = 0
-        bird_vy = 0
-    if bird_y + 14 > GROUND_Y:
-        bird_y = GROUND_Y - 14
-        game_over = True
-
-    pipes[:] = update_pipes()
-
-    canvas.delete("all")
-    draw_ground()
-    for p in pipes:
-        x = p["x"]
-        gap_y = p["gap_y"]
-        gap = p["gap"]
-        canvas.create_rectangle(x, 0, x + 70, gap_y, fill="#4caf50", outline="")
-        canvas.create_rectangle(
-            x, gap_y + gap, x + 70, GROUND_Y, fill="#4caf50", outline=""
+        self.canvas.pack(padx=10, pady=10)
+
+        self.score_label = tk.Label(
+            self.root,
+            text="Score: 0 | Best: 0",
+            font=("Arial", 14, "bold"),
+            bg="#1e1e2f",
+            fg="#f8f8f2",
         )
-    draw_bird()
+        self.score_label.pack(pady=(0, 10))
 
-    root.after(20, game_loop)
+        self.root.bind("<space>", self.flap)
+        self.root.bind("<Button-1>", self.flap)
 
+        self.player_name = self.ask_player_name()
+        self.reset_game()
+        self.center(WIDTH + 40, HEIGHT + 80)
 
-def flap(event=None):
-    global bird_vy, game_over
-    if game_over:
-        reset_game()
-    else:
-        bird_vy = FLAP_STRENGTH
+    def difficulty_factor(self):
+        return min(self.score / 10.0, 1.0)
 
+    def get_pipe_gap(self):
+        f = self.difficulty_factor()
+        return int(BASE_PIPE_GAP - (BASE_PIPE_GAP - MIN_PIPE_GAP) * f)
 
-def ask_player_name():
-    global PLAYER_NAME
-    name = simpledialog.askstring(
-        "Player Name",
-        "Enter your name:",
-        parent=root,
-    )
-    if not name:
-        name = "Player"
-    PLAYER_NAME = name
+    def get_pipe_interval(self):
+        f = self.difficulty_factor()
+        return int(BASE_PIPE_INTERVAL - (BASE_PIPE_INTERVAL - MIN_PIPE_INTERVAL) * f)
 
+    def get_pipe_speed(self):
+        f = min(self.score / 15.0, 1.0)
+        return BASE_PIPE_SPEED + (MAX_PIPE_SPEED - BASE_PIPE_SPEED) * f
 
-root.bind("<space>", flap)
-root.bind("<Button-1>", flap)
+    def get_min_pipe_distance(self):
+        f = self.difficulty_factor()
+        return int(BASE_MIN_PIPE_DISTANCE - (BASE_MIN_PIPE_DISTANCE - MIN_MIN_PIPE_DISTANCE) * f)
 
-ask_player_name()
-reset_game()
+    def draw_ground(self):
+        self.canvas.create_rectangle(0, GROUND_Y, WIDTH, HEIGHT, fill="#444444", outline="")
 
-sw = root.winfo_screenwidth()
-sh = root.winfo_screenheight()
-ww, wh = WIDTH + 40, HEIGHT + 80
-x = int(sw / 2 - ww / 2)
-y = int(sh / 2 - wh / 2)
-root.geometry(f"{ww}x{wh}+{x}+{y}")
+    def draw_bird(self, y):
+        r = 14
+        if self.bird_item is not None:
+            self.canvas.delete(self.bird_item)
+        self.bird_item = self.canvas.create_oval(
+            BIRD_X - r, y - r, BIRD_X + r, y + r, fill="#ffeb3b", outline=""
+        )
 
-root.mainloop()
+    def reset_game(self):
+        self.bird_y = HEIGHT // 2
+        self.prev_bird_y = self.bird_y
+        self.bird_vy = 0
+        self.pipes = []
+        self.score = 0
+        self.game_over = False
+        self.score_saved = False
+        self.spawn_in_ms = self.get_pipe_interval()
+        self.update_score_label()
+        self.render(0.0)
+        self.loop.start()
+
+    def spawn_pipe(self):
+        if self.pipes:
+            last_x = self.pipes[-1]["x"]
+            distance = WIDTH - last_x
+            if distance < self.get_min_pipe_distance():
+                self.spawn_in_ms = 200
+                return
+        gap = self.get_pipe_gap()
+        gap_y = random.randint(100, HEIGHT - 150 - gap)
+        self.pipes.append({"x": WIDTH, "prev_x": WIDTH, "gap_y": gap_y, "gap": gap, "passed": False})
+        self.spawn_in_ms = self.get_pipe_interval()
+
+    def bird_collides_with_rect(self, rect):
+        x1, y1, x2, y2 = rect
+        r = 14
+        bx1 = BIRD_X - r
+        by1 = self.bird_y - r
+        bx2 = BIRD_X + r
+        by2 = self.bird_y + r
+        return not (bx2 < x1 or bx1 > x2 or by2 < y1 or by1 > y2)
+
+    def update_pipes(self):
+        new_pipes = []
+        speed = self.get_pipe_speed()
+
+        for p in self.pipes:
+            p["prev_x"] = p["x"]
+            p["x"] -= speed
+            x = p["x"]
+            gap_y = p["gap_y"]
+            gap = p["gap"]
+
+            top_rect = (x, 0, x + 70, gap_y)
+            bottom_rect = (x, gap_y + gap, x + 70, GROUND_Y)
+
+            if self.bird_collides_with_rect(top_rect) or self.bird_collides_with_rect(bottom_rect):
+                self.game_over = True
+
+            if x + 70 < BIRD_X and not p["passed"]:
+                p["passed"] = True
+                self.score += 1
+                if self.score > self.best_score:
+                    self.best_score = self.score
+                self.update_score_label()
+
+            if x + 70 > 0:
+                new_pipes.append(p)
+
+        return new_pipes
+
+    def update_score_label(self):
+        self.score_label.config(text=f"Score: {self.score} | Best: {self.best_score}")
+
+    def save_score_if_needed(self):
+        if self.score_saved:
+            return
+        self.score_saved = True
+        if self.player_name and self.score > 0:
+            lb.submit_score(
+                "flappy_bird",
+                self.player_name,
+                self.score,
+                extra={"best_session": self.best_score},
+            )
+
+    def update(self, dt):
+        self.prev_bird_y = self.bird_y
+        self.bird_vy += GRAVITY
+        self.bird_y += self.bird_vy
+
+        if self.bird_y < 0:
+            self.bird_y = 0
+            self.bird_vy = 0
+        if self.bird_y + 14 > GROUND_Y:
+            self.bird_y = GROUND_Y - 14
+            self.game_over = True
+
+        self.pipes[:] = self.update_pipes()
+
+        self.spawn_in_ms -= dt * 1000
+        if self.spawn_in_ms <= 0:
+            self.spawn_pipe()
+
+        if self.game_over:
+            self.loop.stop()
+            self.save_score_if_needed()
+            self.render(1.0)
+            self.canvas.create_text(
+                WIDTH // 2,
+                HEIGHT // 2,
+                text="Game Over",
+                fill="white",
+                font=("Arial", 24, "bold"),
+            )
+            self.canvas.create_text(
+                WIDTH // 2,
+                HEIGHT // 2 + 40,
+                text="Press Space to restart",
+                fill="white",
+                font=("Arial", 12),
+            )
+
+    def render(self, alpha):
+        # alpha: how far the real time is between the last update and the next
+        self.canvas.delete("all")
+        self.draw_ground()
+        for p in self.pipes:
+            x = p["prev_x"] + (p["x"] - p["prev_x"]) * alpha
+            gap_y = p["gap_y"]
+            gap = p["gap"]
+            self.canvas.create_rectangle(x, 0, x + 70, gap_y, fill="#4caf50", outline="")
+            self.canvas.create_rectangle(
+                x, gap_y + gap, x + 70, GROUND_Y, fill="#4caf50", outline=""
+            )
+        self.draw_bird(self.prev_bird_y + (self.bird_y - self.prev_bird_y) * alpha)
+
+    def flap(self, event=None):
+        if self.game_over:
+            self.reset_game()
+        else:
+            self.bird_vy = FLAP_STRENGTH
+
+
+if __name__ == "__main__":
+    main(FlappyBird)
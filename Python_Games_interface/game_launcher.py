@@ -0,0 +1,178 @@
+# game_launcher.py
+# Warm process that starts the games game_menu runs as separate processes.
+# It imports tkinter, leaderboard_core and the game modules once, then
+# forks a child per game, so a launch skips interpreter start-up and every
+# import. Nothing Tk or leaderboard related is *created* before the fork:
+# each child opens its own Tk root and its own store.
+#
+# game_menu talks to it over stdin/stdout, one line per message:
+#   menu -> launcher   "<module> <class> <t0>"   t0: time.time() of the click
+#   launcher -> menu   "started <pid> <module> <fork_ms>"
+#                      "exited <pid> <exit code>"
+#                      "failed <module> <error>"
+#
+# POSIX only (os.fork); game_menu falls back to subprocess.Popen elsewhere.
+import importlib
+import os
+import select
+import signal
+import subprocess
+import sys
+import threading
+import time
+import traceback
+
+# imported before the first fork; game modules are added by the menu
+PRELOAD = ["tkinter", "tkinter.messagebox", "tkinter.simpledialog", "leaderboard_core", "game_window"]
+
+AVAILABLE = hasattr(os, "fork")
+
+
+def _run_child(module_name, class_name, launched_at):
+    # in the child: the pipes to the menu belong to the launcher
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.dup2(2, 1)
+    signal.set_wakeup_fd(-1)
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    code = 0
+    try:
+        import game_window
+        os.environ[game_window.LAUNCH_ENV] = launched_at
+        game_class = getattr(importlib.import_module(module_name), class_name)
+        game_window.main(game_class)
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        # never return into the launcher's loop
+        _exit_child(code)
+
+
+def _exit_child(code):
+    # os._exit skips atexit, where leaderboard_core saves the scores still
+    # queued for its writer thread
+    lb = sys.modules.get("leaderboard_core")
+    if lb is not None:
+        try:
+            lb.flush()
+        except Exception:
+            traceback.print_exc()
+            code = code or 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(code)
+
+
+def _reap(children, out):
+    while children:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+        children.discard(pid)
+        out.write(f"exited {pid} {os.waitstatus_to_exitcode(status)}\n")
+        out.flush()
+
+
+def serve(preload, out=sys.stdout):
+    for name in preload:
+        importlib.import_module(name)
+
+    # SIGCHLD wakes the select below through this pipe
+    wake_r, wake_w = os.pipe()
+    os.set_blocking(wake_w, False)
+    signal.set_wakeup_fd(wake_w)
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+
+    children = set()
+    pending = b""
+    out.write("ready\n")
+    out.flush()
+    while True:
+        readable, _, _ = select.select([0, wake_r], [], [])
+        if wake_r in readable:
+            os.read(wake_r, 512)
+            _reap(children, out)
+        if 0 not in readable:
+            continue
+        # raw reads: a buffered readline could hold back a second request
+        # that select() would then never report
+        data = os.read(0, 4096)
+        if not data:
+            # the menu is gone; running games carry on on their own
+            return
+        *lines, pending = (pending + data).split(b"\n")
+        for line in lines:
+            try:
+                module_name, class_name, launched_at = line.decode().split()
+            except ValueError:
+                continue
+            started = time.perf_counter()
+            try:
+                pid = os.fork()
+            except OSError as exc:
+                out.write(f"failed {module_name} {exc}\n")
+                out.flush()
+                continue
+            if pid == 0:
+                _run_child(module_name, class_name, launched_at)
+            children.add(pid)
+            out.write(f"started {pid} {module_name} {(time.perf_counter() - started) * 1000:.1f}\n")
+            out.flush()
+
+
+class Launcher:
+    """game_menu's handle on a launcher process.
+
+    on_message(kind, fields) is called on a reader thread for every line
+    the launcher sends back ("started", "exited", "failed").
+    """
+
+    def __init__(self, modules, on_message, env=None):
+        self.on_message = on_message
+        # env is inherited by every game forked from the launcher
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), *modules],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            env=env,
+        )
+        self._lock = threading.Lock()
+        threading.Thread(target=self._read, name="game-launcher", daemon=True).start()
+
+    def _read(self):
+        for line in self.process.stdout:
+            kind, _, rest = line.strip().partition(" ")
+            self.on_message(kind, rest.split())
+        self.on_message("closed", [])
+
+    def alive(self):
+        return self.process.poll() is None
+
+    def launch(self, module_name, class_name):
+        """Ask for a new game; False if the launcher is not running."""
+        with self._lock:
+            if not self.alive():
+                return False
+            try:
+                self.process.stdin.write(f"{module_name} {class_name} {time.time()!r}\n")
+                self.process.stdin.flush()
+            except (BrokenPipeError, ValueError):
+                return False
+        return True
+
+    def close(self):
+        with self._lock:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+
+
+if __name__ == "__main__":
+    serve(PRELOAD + sys.argv[1:])
@@ -0,0 +1,118 @@
+# game_loop.py
+# Fixed-timestep loop for the real-time games, driven by Tk's after().
+#
+# update(dt) always advances the game by the same dt, however long frames
+# take, so a game runs at the same speed on a slow and on a fast machine.
+# render(alpha) runs once per frame with alpha in [0, 1): how far the real
+# time is between the last update and the next one, for drawing moving
+# things between their two positions. Frames are scheduled against
+# time.perf_counter deadlines rather than "now + delay", so the time spent
+# updating and drawing does not add up to drift.
+import os
+import sys
+import time
+
+FRAME_MS = 16
+# updates run per frame at most; a longer stall is dropped, not replayed
+MAX_CATCH_UP = 5
+# GAME_LOOP_STATS=1 prints the frame budget figures when a loop stops
+PRINT_STATS = os.environ.get("GAME_LOOP_STATS") == "1"
+
+
+class FixedStepLoop:
+    def __init__(self, owner, update, render, step_s, frame_ms=FRAME_MS, name="loop"):
+        """owner: anything with after(ms, fn) (a GameWindow or a widget)."""
+        self.owner = owner
+        self.update = update
+        self.render = render
+        self.step_s = step_s
+        self.frame_s = frame_ms / 1000
+        self.name = name
+        self.running = False
+        # every start() gets a new one, so a tick of the previous run
+        # that is still scheduled does nothing
+        self._generation = 0
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.frames = 0
+        self.updates = 0
+        self.dropped_steps = 0
+        self.over_budget = 0
+        self.work_s = 0.0
+        self.worst_work_s = 0.0
+
+    def start(self):
+        self._generation += 1
+        self.running = True
+        self._reset_stats()
+        self._accumulator = 0.0
+        self._last = time.perf_counter()
+        self._deadline = self._last + self.frame_s
+        generation = self._generation
+        self.owner.after(int(self.frame_s * 1000), lambda: self._tick(generation))
+
+    def stop(self):
+        if self.running and PRINT_STATS:
+            print(f"{self.name}: {self.format_stats()}", file=sys.stderr)
+        self.running = False
+
+    def set_step(self, step_s):
+        """Change dt; takes effect with the next update."""
+        self.step_s = step_s
+
+    def stats(self):
+        frames = self.frames or 1
+        return {
+            "frames": self.frames,
+            "updates": self.updates,
+            "dropped_steps": self.dropped_steps,
+            "over_budget": self.over_budget,
+            "avg_work_ms": self.work_s / frames * 1000,
+            "worst_work_ms": self.worst_work_s * 1000,
+        }
+
+    def format_stats(self):
+        s = self.stats()
+        return (
+            f"{s['frames']} frames, {s['updates']} updates, "
+            f"{s['dropped_steps']} steps dropped, {s['over_budget']} frames over "
+            f"{self.frame_s * 1000:.0f} ms, work avg {s['avg_work_ms']:.2f} ms / "
+            f"worst {s['worst_work_ms']:.2f} ms"
+        )
+
+    def _tick(self, generation):
+        if not self.running or generation != self._generation:
+            return
+        now = time.perf_counter()
+        self._accumulator += now - self._last
+        self._last = now
+        limit = self.step_s * MAX_CATCH_UP
+        if self._accumulator > limit:
+            self.dropped_steps += int((self._accumulator - limit) / self.step_s)
+            self._accumulator = limit
+
+        while self._accumulator >= self.step_s:
+            self._accumulator -= self.step_s
+            self.updates += 1
+            self.update(self.step_s)
+            if not self.running or generation != self._generation:
+                # the update ended (or restarted) the game
+                return
+        self.render(self._accumulator / self.step_s)
+
+        done = time.perf_counter()
+        work = done - now
+        self.frames += 1
+        self.work_s += work
+        self.worst_work_s = max(self.worst_work_s, work)
+        if work > self.frame_s:
+            self.over_budget += 1
+
+        # next frame on the fixed grid of deadlines; after a long stall
+        # start a new grid instead of firing a burst of late frames
+        self._deadline += self.frame_s
+        if self._deadline < done:
+            self._deadline = done + self.frame_s
+        delay_ms = max(0, int((self._deadline - done) * 1000))
+        self.owner.after(delay_ms, lambda: self._tick(generation))
@@ -1,54 +1,181 @@
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, ttk
+import atexit
+import importlib
+import shutil
 import subprocess
 import sys
 import os
+import tempfile
+import time
+import game_launcher
+from game_supervisor import HEARTBEAT_ENV, Supervisor
+from game_window import LAUNCH_ENV, format_mb, on_first_frame, rss_mb
 
 PYTHON = sys.executable
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# "inprocess": every game is a Toplevel of this window, sharing one Tk, one
+# Python and one leaderboard cache; "subprocess": every game in a process
+# of its own, forked from game_launcher
+LAUNCH_MODE = os.environ.get("GAME_LAUNCH_MODE", "inprocess")
 
-def run_game(filename):
-    path = os.path.join(BASE_DIR, filename)
-    if not os.path.exists(path):
+# button text, module, class
+GAMES = [
+    ("Tic Tac Toe", "tic_tac_toe", "TicTacToe"),
+    ("Snake", "snake", "SnakeGame"),
+    ("Snake XL", "snake", "BigSnakeGame"),
+    ("Minesweeper", "minesweeper", "Minesweeper"),
+    ("2048 (5x5)", "game_2048", "Game2048"),
+    ("Flappy Bird", "flappy_bird", "FlappyBird"),
+    ("Memory Match", "memory_match", "MemoryMatch"),
+    ("Typing Test", "typing_speed_test", "TypingTest"),
+]
+LEADERBOARDS = ("Leaderboards", "leaderboard_menu", "LeaderboardMenu")
+
+# games open at the same time, in-process and separate ones together;
+# changed at runtime in the "Running games" panel
+MAX_RUNNING = int(os.environ.get("GAME_MAX_RUNNING", "4"))
+# how often the running games are sampled (CPU%, RSS, heartbeat)
+SUPERVISE_MS = 1000
+
+# separate-process games are forked from a warm game_launcher process that
+# has already imported tkinter, leaderboard_core and every game; started
+# when the mode is first used (POSIX only, Popen elsewhere)
+launcher = None
+# separate games heartbeat into this directory, see game_supervisor
+heartbeat_dir = tempfile.mkdtemp(prefix="game-menu-")
+atexit.register(shutil.rmtree, heartbeat_dir, ignore_errors=True)
+supervisor = Supervisor(heartbeat_dir)
+child_env = dict(os.environ, **{HEARTBEAT_ENV: heartbeat_dir})
+# launches asked of the launcher that it has not answered yet
+pending_launches = 0
+# games open as Toplevels of this window
+open_windows = []
+
+
+def run_game(module_name, class_name):
+    filename = module_name + ".py"
+    if not os.path.exists(os.path.join(BASE_DIR, filename)):
         messagebox.showerror("Error", f"Game file not found:\n{filename}")
         return
-    subprocess.Popen([PYTHON, path])
+    # the game prints its own time to first frame, counted from now
+    env = dict(child_env, **{LAUNCH_ENV: repr(time.time())})
+    # by class, like the launcher: a module can hold more than one game
+    code = (
+        f"import sys; sys.path.insert(0, {BASE_DIR!r}); import game_window, {module_name}; "
+        f"game_window.main({module_name}.{class_name})"
+    )
+    proc = subprocess.Popen([PYTHON, "-c", code], env=env)
+    supervisor.add(proc.pid, module_name, popen=proc)
+
+
+def start_launcher():
+    global launcher
+    if not game_launcher.AVAILABLE:
+        return None
+    if launcher is None or not launcher.alive():
+        modules = [module_name for _, module_name, _ in GAMES + [LEADERBOARDS]]
+        launcher = game_launcher.Launcher(modules, on_launcher_message, env=child_env)
+    return launcher
 
 
-def play_tictactoe():
-    run_game("tic_tac_toe.py")
+def on_launcher_message(kind, fields):
+    # reader thread: hand over to the Tk loop
+    try:
+        root.after(0, handle_launcher_message, kind, fields)
+    except (RuntimeError, tk.TclError):
+        # the menu is closing
+        pass
 
 
-def play_snake():
-    run_game("snake.py")
+def handle_launcher_message(kind, fields):
+    global pending_launches
+    if kind == "started":
+        pid, module_name, fork_ms = fields
+        pending_launches = max(0, pending_launches - 1)
+        supervisor.add(int(pid), module_name)
+        print(f"{module_name}: forked as pid {pid} in {fork_ms} ms", file=sys.stderr)
+    elif kind == "exited":
+        supervisor.remove(int(fields[0]))
+    elif kind == "failed":
+        pending_launches = max(0, pending_launches - 1)
+        print(f"{fields[0]}: could not start: {' '.join(fields[1:])}", file=sys.stderr)
+    elif kind == "closed":
+        pending_launches = 0
 
 
-def play_minesweeper():
-    run_game("minesweeper.py")
+def start_game_process(module_name, class_name):
+    global pending_launches
+    # a launcher that died is started again once, then Popen takes over
+    for _ in range(2):
+        pool = start_launcher()
+        if pool is None:
+            break
+        if pool.launch(module_name, class_name):
+            pending_launches += 1
+            return
+    run_game(module_name, class_name)
 
 
-def play_2048():
-    run_game("game_2048.py")
+def open_game(module_name, class_name):
+    started = time.perf_counter()
+    rss_before = rss_mb()
+    # imported on first use only, the menu itself starts with none of them
+    game_class = getattr(importlib.import_module(module_name), class_name)
+    window = tk.Toplevel(root)
 
+    def report():
+        rss_after = rss_mb()
+        grown = rss_after - rss_before if rss_after is not None and rss_before is not None else None
+        print(
+            f"{game_class.title}: first frame after "
+            f"{(time.perf_counter() - started) * 1000:.0f} ms, "
+            f"RSS +{format_mb(grown)} MB, {format_mb(rss_after)} MB total (in-process)",
+            file=sys.stderr,
+        )
 
-def play_flappy():
-    run_game("flappy_bird.py")
+    on_first_frame(window, report)
+    open_windows.append(game_class(window))
 
 
-def play_memory():
-    run_game("memory_match.py")
+def max_running():
+    try:
+        return max(1, max_running_var.get())
+    except tk.TclError:
+        # the spinbox holds something that is not a number
+        return MAX_RUNNING
 
 
-def show_leaderboards():
-    # deschide fereastra cu leaderboard-uri
-    run_game("leaderboard_menu.py")
+def running_count():
+    open_windows[:] = [game for game in open_windows if not game.closed]
+    return len(supervisor) + pending_launches + len(open_windows)
+
+
+def launch(module_name, class_name):
+    limit = max_running()
+    if running_count() >= limit:
+        messagebox.showinfo(
+            "Too many games",
+            f"{limit} games are already open.\nClose one to start another.",
+            parent=root,
+        )
+        return
+    if separate_var.get():
+        start_game_process(module_name, class_name)
+    else:
+        open_game(module_name, class_name)
 
 
 root = tk.Tk()
 root.title("Game Menu")
 root.configure(bg="#1E1E2F")
 
+separate_var = tk.BooleanVar(root, value=LAUNCH_MODE == "subprocess")
+max_running_var = tk.IntVar(root, value=MAX_RUNNING)
+# the "Running games" window, while it is open
+panel = {"window": None, "tree": None}
+
 title_label = tk.Label(
     root,
     text="Choose a game",
@@ -70,18 +197,19 @@ btn_style = {
     "activeforeground": "#1E1E2F",
 }
 
-tk.Button(root, text="Tic Tac Toe", command=play_tictactoe, **btn_style).pack(pady=4)
-tk.Button(root, text="Snake", command=play_snake, **btn_style).pack(pady=4)
-tk.Button(root, text="Minesweeper", command=play_minesweeper, **btn_style).pack(pady=4)
-tk.Button(root, text="2048 (5x5)", command=play_2048, **btn_style).pack(pady=4)
-tk.Button(root, text="Flappy Bird", command=play_flappy, **btn_style).pack(pady=4)
-tk.Button(root, text="Memory Match", command=play_memory, **btn_style).pack(pady=4)
+for text, module_name, class_name in GAMES:
+    tk.Button(
+        root,
+        text=text,
+        command=lambda m=module_name, c=class_name: launch(m, c),
+        **btn_style,
+    ).pack(pady=4)
 
 # buton pentru leaderboard
 tk.Button(
     root,
-    text="Leaderboards",
-    command=show_leaderboards,
+    text=LEADERBOARDS[0],
+    command=lambda: launch(*LEADERBOARDS[1:]),
     font=("Arial", 12, "bold"),
     width=22,
     bd=0,
@@ -92,6 +220,129 @@ tk.Button(
     activeforeground="#1E1E2F",
 ).pack(pady=(10, 4))
 
+
+def format_cpu(cpu):
+    return "?" if cpu is None else f"{cpu:.0f}%"
+
+
+def refresh_panel(rows):
+    tree = panel["tree"]
+    shown = set()
+    for pid, name, cpu, rss, status in rows:
+        iid = str(pid)
+        values = (name, pid, format_cpu(cpu), format_mb(rss), status)
+        if tree.exists(iid):
+            tree.item(iid, values=values)
+        else:
+            tree.insert("", "end", iid=iid, values=values)
+        shown.add(iid)
+    for game in open_windows:
+        if game.closed:
+            continue
+        iid = f"w{id(game)}"
+        if not tree.exists(iid):
+            tree.insert("", "end", iid=iid, values=(game.title, os.getpid(), "-", "-", "in menu"))
+        shown.add(iid)
+    for iid in tree.get_children():
+        if iid not in shown:
+            tree.delete(iid)
+
+
+def supervise():
+    # cheap: a couple of small /proc reads and a stat() per game
+    rows = supervisor.sample()
+    running_count()
+    if panel["window"] is not None:
+        refresh_panel(rows)
+    root.after(SUPERVISE_MS, supervise)
+
+
+def kill_selected():
+    for iid in panel["tree"].selection():
+        if iid.startswith("w"):
+            for game in open_windows:
+                if f"w{id(game)}" == iid and not game.closed:
+                    game.root.destroy()
+        else:
+            supervisor.kill(int(iid))
+
+
+def close_panel():
+    panel["window"].destroy()
+    panel["window"] = panel["tree"] = None
+
+
+def show_running_games():
+    if panel["window"] is not None:
+        panel["window"].lift()
+        return
+    window = tk.Toplevel(root)
+    window.title("Running games")
+    window.configure(bg="#1E1E2F")
+    window.protocol("WM_DELETE_WINDOW", close_panel)
+
+    columns = ("game", "pid", "cpu", "rss", "status")
+    tree = ttk.Treeview(window, columns=columns, show="headings", height=8)
+    for column, text, width in zip(
+        columns, ("Game", "PID", "CPU", "RSS MB", "Status"), (140, 70, 60, 70, 120)
+    ):
+        tree.heading(column, text=text)
+        tree.column(column, width=width, anchor="w" if column in ("game", "status") else "e")
+    tree.pack(fill="both", expand=True, padx=10, pady=10)
+
+    controls = tk.Frame(window, bg="#1E1E2F")
+    controls.pack(fill="x", padx=10, pady=(0, 10))
+    tk.Label(controls, text="Max games:", font=("Arial", 10), bg="#1E1E2F", fg="#F8F8F2").pack(side="left")
+    tk.Spinbox(controls, from_=1, to=32, width=4, textvariable=max_running_var).pack(side="left", padx=(4, 0))
+    tk.Button(
+        controls,
+        text="Kill selected",
+        command=kill_selected,
+        font=("Arial", 10, "bold"),
+        bd=0,
+        bg="#FF5555",
+        fg="#1E1E2F",
+        padx=10,
+    ).pack(side="right")
+
+    panel["window"], panel["tree"] = window, tree
+    refresh_panel(supervisor.sample())
+
+
+tk.Button(
+    root,
+    text="Running games",
+    command=show_running_games,
+    font=("Arial", 12, "bold"),
+    width=22,
+    bd=0,
+    relief="flat",
+    bg="#44475A",
+    fg="#F8F8F2",
+    activebackground="#8BE9FD",
+    activeforeground="#1E1E2F",
+).pack(pady=4)
+
+
+def on_mode_changed():
+    if separate_var.get():
+        # warm it up now, before the first game is asked for
+        start_launcher()
+
+
+tk.Checkbutton(
+    root,
+    text="Open games as separate processes",
+    variable=separate_var,
+    command=on_mode_changed,
+    font=("Arial", 10),
+    bg="#1E1E2F",
+    fg="#F8F8F2",
+    selectcolor="#25253A",
+    activebackground="#1E1E2F",
+    activeforeground="#F8F8F2",
+).pack(pady=(4, 0))
+
 tk.Button(
     root,
     text="Exit",
@@ -107,11 +358,16 @@ tk.Button(
 ).pack(pady=12)
 
 window_width = 360
-window_height = 520  # puțin mai înalt pentru butonul nou
+window_height = 695  # loc pentru Snake XL, Typing Test, modul de lansare si panou
 screen_width = root.winfo_screenwidth()
 screen_height = root.winfo_screenheight()
 x = int((screen_width - window_width) / 2)
 y = int((screen_height - window_height) / 2)
 root.geometry(f"{window_width}x{window_height}+{x}+{y}")
 
+on_mode_changed()
+supervise()
 root.mainloop()
+if launcher is not None:
+    # the launcher exits; games it started keep running
+    launcher.close()
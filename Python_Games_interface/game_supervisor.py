@@ -0,0 +1,181 @@
+# game_supervisor.py
+# Bookkeeping for the games game_menu runs as separate processes: CPU% and
+# RSS per game, read from /proc (Linux; "?" elsewhere), and a heartbeat to
+# tell a game that is still alive from one whose Tk loop is stuck.
+#
+# Heartbeat: game_menu passes GAME_HEARTBEAT_DIR to its children; every
+# GameWindow in such a child touches <dir>/<pid> each HEARTBEAT_MS. A file
+# that has not changed for HUNG_S means the game has stopped processing
+# events. The time is measured with time.monotonic() from the sample that
+# last saw the file change, not from its mtime, so a clock jump or a suspend
+# of the whole machine does not make every game look hung.
+import os
+import signal
+import time
+
+HEARTBEAT_ENV = "GAME_HEARTBEAT_DIR"
+HEARTBEAT_MS = 1000
+# no heartbeat for this long: "not responding"
+HUNG_S = float(os.environ.get("GAME_HUNG_S", "10"))
+# ... and for this long: killed (0 = never kill automatically)
+HUNG_KILL_S = float(os.environ.get("GAME_HUNG_KILL_S", "30"))
+# ... and not seen to change on this many samples in a row
+HUNG_KILL_SAMPLES = 3
+# after SIGTERM, wait this long before SIGKILL
+KILL_GRACE_S = 2.0
+
+try:
+    CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+    PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    CLOCK_TICKS = PAGE_SIZE = None
+
+
+def read_cpu_ticks(pid):
+    """utime + stime of a process in clock ticks, None if unknown."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # the command name may hold spaces and parentheses, fields follow the last ")"
+    fields = stat[stat.rindex(b")") + 2:].split()
+    return int(fields[11]) + int(fields[12])
+
+
+def read_rss_mb(pid):
+    if PAGE_SIZE is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/statm", "rb") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+class Supervisor:
+    """The running game processes of one game_menu.
+
+    add() a pid when a game starts, sample() periodically; a game that
+    exits is dropped on the next sample (or right away via remove()).
+    """
+
+    def __init__(self, heartbeat_dir=None):
+        self.heartbeat_dir = heartbeat_dir
+        # pid -> {"name", "started", "popen", "ticks", "sampled", "cpu", "rss",
+        #         "killing", "beat", "beat_at", "stale"}
+        # beat: heartbeat mtime last seen, beat_at: when it was seen to
+        # change, stale: samples since then
+        self.games = {}
+
+    def __len__(self):
+        return len(self.games)
+
+    def add(self, pid, name, popen=None):
+        now = time.monotonic()
+        self.games[pid] = {
+            "name": name, "started": now, "popen": popen,
+            "ticks": read_cpu_ticks(pid), "sampled": now,
+            "cpu": None, "rss": None, "killing": None,
+            "beat": None, "beat_at": now, "stale": 0,
+        }
+
+    def remove(self, pid):
+        self.games.pop(pid, None)
+        self._forget_heartbeat(pid)
+
+    def _forget_heartbeat(self, pid):
+        if self.heartbeat_dir:
+            try:
+                os.remove(os.path.join(self.heartbeat_dir, str(pid)))
+            except OSError:
+                pass
+
+    def _exited(self, pid, game):
+        if game["popen"] is not None:
+            # reaps it as well
+            return game["popen"].poll() is not None
+        return not pid_alive(pid)
+
+    def silent_for(self, pid):
+        """Seconds since a sample last saw the game's heartbeat change (since
+        its start if it has not sent one yet); None without a heartbeat dir."""
+        game = self.games.get(pid)
+        if game is None or not self.heartbeat_dir:
+            return None
+        return time.monotonic() - game["beat_at"]
+
+    def _check_heartbeat(self, pid, game, now):
+        try:
+            beat = os.stat(os.path.join(self.heartbeat_dir, str(pid))).st_mtime_ns
+        except OSError:
+            beat = None
+        if beat != game["beat"]:
+            game["beat"], game["beat_at"], game["stale"] = beat, now, 0
+        else:
+            game["stale"] += 1
+
+    def sample(self):
+        """Refresh CPU% and RSS; returns [(pid, name, cpu, rss, status)].
+
+        status is "running", "not responding" or "killed"; games whose
+        heartbeat stayed the same for HUNG_KILL_S and HUNG_KILL_SAMPLES
+        samples are killed here.
+        """
+        now = time.monotonic()
+        rows = []
+        for pid, game in list(self.games.items()):
+            if self._exited(pid, game):
+                self.remove(pid)
+                continue
+            ticks = read_cpu_ticks(pid)
+            if ticks is not None and game["ticks"] is not None and now > game["sampled"]:
+                game["cpu"] = (ticks - game["ticks"]) / CLOCK_TICKS / (now - game["sampled"]) * 100
+            game["ticks"], game["sampled"] = ticks, now
+            game["rss"] = read_rss_mb(pid)
+
+            status = "running"
+            silent = None
+            if self.heartbeat_dir:
+                self._check_heartbeat(pid, game, now)
+                silent = now - game["beat_at"]
+            if game["killing"] is not None:
+                status = "killed"
+                if now - game["killing"] > KILL_GRACE_S:
+                    self._signal(pid, game, getattr(signal, "SIGKILL", signal.SIGTERM))
+            elif silent is not None and silent > HUNG_S:
+                status = "not responding"
+                if HUNG_KILL_S and silent > HUNG_KILL_S and game["stale"] >= HUNG_KILL_SAMPLES:
+                    self.kill(pid)
+                    status = "killed"
+            rows.append((pid, game["name"], game["cpu"], game["rss"], status))
+        return rows
+
+    def _signal(self, pid, game, signum):
+        try:
+            if game["popen"] is not None:
+                game["popen"].send_signal(signum)
+            else:
+                os.kill(pid, signum)
+        except OSError:
+            pass
+
+    def kill(self, pid):
+        """SIGTERM now, SIGKILL on a later sample if it is still there."""
+        game = self.games.get(pid)
+        if game is None or game["killing"] is not None:
+            return
+        game["killing"] = time.monotonic()
+        self._signal(pid, game, signal.SIGTERM)
@@ -0,0 +1,105 @@
+# game_window.py
+# Common base of the games. A game builds itself into the window it is
+# given: its own Tk root when started as a script, or a Toplevel of
+# game_menu's root when opened in-process.
+import os
+import sys
+import time
+import tkinter as tk
+from tkinter import simpledialog
+from game_supervisor import HEARTBEAT_ENV, HEARTBEAT_MS
+
+# set by game_menu when it starts a game as a separate process: the
+# time.time() of the click, so the game can report its first frame
+LAUNCH_ENV = "GAME_LAUNCH_T0"
+
+
+def rss_mb(pid="self"):
+    """Resident memory of a process in MB (Linux only, None elsewhere)."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def format_mb(mb):
+    return "?" if mb is None else f"{mb:.1f}"
+
+
+def on_first_frame(window, callback):
+    """callback() once window is first mapped on screen."""
+    def mapped(event):
+        if event.widget is window:
+            window.unbind("<Map>", binding)
+            callback()
+
+    binding = window.bind("<Map>", mapped, add="+")
+
+
+class GameWindow:
+    title = "Game"
+
+    def __init__(self, window):
+        self.root = window
+        self.closed = False
+        window.title(self.title)
+        window.bind("<Destroy>", self._on_destroy, add="+")
+        launched_at = os.environ.pop(LAUNCH_ENV, None)
+        if launched_at:
+            on_first_frame(window, lambda: print(
+                f"{self.title}: first frame after "
+                f"{(time.time() - float(launched_at)) * 1000:.0f} ms, "
+                f"RSS {format_mb(rss_mb())} MB (subprocess)",
+                file=sys.stderr,
+            ))
+        # started by game_menu as a separate process: show it we are alive
+        heartbeat_dir = os.environ.get(HEARTBEAT_ENV)
+        if heartbeat_dir:
+            self._heartbeat(os.path.join(heartbeat_dir, str(os.getpid())))
+
+    def _on_destroy(self, event):
+        # <Destroy> also fires for every child widget
+        if event.widget is self.root:
+            self.closed = True
+
+    def _heartbeat(self, path):
+        try:
+            with open(path, "a"):
+                os.utime(path)
+        except OSError:
+            # the menu is gone and took the directory with it
+            return
+        self.after(HEARTBEAT_MS, self._heartbeat, path)
+
+    def after(self, ms, fn, *args):
+        """root.after that does nothing once the window is closed; Tk keeps
+        running the callbacks of a destroyed Toplevel otherwise."""
+        def run():
+            if not self.closed:
+                fn(*args)
+
+        return self.root.after(ms, run)
+
+    def ask_player_name(self):
+        name = simpledialog.askstring(
+            "Player Name",
+            "Enter your name:",
+            parent=self.root,
+        )
+        return name or "Player"
+
+    def center(self, width, height):
+        sw = self.root.winfo_screenwidth()
+        sh = self.root.winfo_screenheight()
+        x = int(sw / 2 - width / 2)
+        y = int(sh / 2 - height / 2)
+        self.root.geometry(f"{width}x{height}+{x}+{y}")
+
+
+def main(game_class):
+    """Run a game on its own, as `python snake.py` does."""
+    root = tk.Tk()
+    game_class(root)
+    root.mainloop()
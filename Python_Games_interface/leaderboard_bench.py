@@ -0,0 +1,259 @@
+# leaderboard_bench.py
+# Benchmarks for the leaderboard store, written as JSON so runs can be
+# compared between storage changes.
+#
+#   python leaderboard_bench.py > bench.json
+#   python leaderboard_bench.py --sizes 10 1000 100000 --games 50 -o bench.json
+#
+# For each backend and dataset size it measures, through leaderboard_core:
+#   cold_load  get_all_games right after the in-process cache was dropped
+#   cold_top   get_leaderboard(game, 20), the first read of that board
+#   cold_rank  get_rank, the first read that loads the whole board
+#   foreign_top, foreign_rank
+#              get_leaderboard / get_rank on a loaded board right after
+#              another backend on the same store added a score to it
+#   insert     add_score
+#   top_n      get_leaderboard(game, 20)
+#   page       get_page(game, random offset, 20)
+#   games      get_all_games
+# and, on the bare backends (no cache), backend_top and backend_games.
+# Each result row also carries the size of the store on disk (file_bytes).
+# Retention is off (KEEP_TOP=None) so a dataset of size N really holds N
+# scores. A readable summary goes to stderr.
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import leaderboard_core as lb
+import leaderboard_storage as storage
+
+BACKENDS = ("json", "binary", "sqlite")
+
+
+def make_entries(n, games, rng):
+    data = {}
+    for i in range(n):
+        game = games[i % len(games)]
+        data.setdefault(game, []).append({
+            "player": f"player{rng.randrange(1000)}",
+            "score": rng.randrange(10000),
+            "extra": {"time_s": rng.randrange(600)},
+            "time": "2025-11-08T12:00:00",
+        })
+    for entries in data.values():
+        entries.sort(key=lambda e: e["score"], reverse=True)
+    return data
+
+
+def seed_json(workdir, data):
+    backend = storage.JsonBackend(
+        os.path.join(workdir, "scores.json"), os.path.join(workdir, "scores.log"), keep=None
+    )
+    backend._save_data(data)
+    return backend
+
+
+def seed_binary(workdir, data):
+    backend = storage.BinaryBackend(
+        os.path.join(workdir, "scores.lbin"), os.path.join(workdir, "scores.lbin.log"), keep=None
+    )
+    backend._save_data(data)
+    return backend
+
+
+def seed_sqlite(workdir, data):
+    backend = storage.SqliteBackend(os.path.join(workdir, "scores.db"), keep=None)
+    rows = [
+        (game, e["player"], e["score"], json.dumps(e["extra"]), e["time"])
+        for game, entries in data.items()
+        for e in entries
+    ]
+    backend.conn.execute("BEGIN")
+    backend.conn.executemany("INSERT INTO games (name) VALUES (?)", [(g,) for g in data])
+    backend.conn.executemany(
+        "INSERT INTO scores (game_name, player, score, extra, time) VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+    backend.conn.execute("COMMIT")
+    return backend
+
+
+SEEDERS = {"json": seed_json, "binary": seed_binary, "sqlite": seed_sqlite}
+
+
+def store_bytes(workdir):
+    return sum(
+        os.path.getsize(os.path.join(workdir, name))
+        for name in os.listdir(workdir)
+        if not name.endswith(".lock")
+    )
+
+
+def configure_core(workdir, backend):
+    lb.FILE_NAME = os.path.join(workdir, "scores.json")
+    lb.LOG_NAME = os.path.join(workdir, "scores.log")
+    lb.DB_NAME = os.path.join(workdir, "scores.db")
+    lb.BIN_NAME = os.path.join(workdir, "scores.lbin")
+    lb.BIN_LOG_NAME = os.path.join(workdir, "scores.lbin.log")
+    lb.BACKEND = backend
+    lb.KEEP_TOP = None
+    lb.SERVER_ADDRESS = None
+    # a fresh backend also drops the in-process cache
+    lb.set_backend(lb.make_backend())
+
+
+def measure(fn, max_runs, budget_s, setup=None):
+    """Per-call latencies in seconds, stopping early once budget_s is spent.
+    setup() runs before each call, outside the timing."""
+    samples = []
+    deadline = time.perf_counter() + budget_s
+    while len(samples) < max_runs:
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+        if time.perf_counter() > deadline:
+            break
+    return samples
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000
+
+    total = sum(samples)
+    return {
+        "count": len(samples),
+        "throughput_ops_s": len(samples) / total if total else None,
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p50_ms": pct(50),
+        "p99_ms": pct(99),
+    }
+
+
+def bench_one(backend_name, data, games, rng, args):
+    workdir = tempfile.mkdtemp(prefix=f"lb_bench_{backend_name}_")
+    try:
+        raw = SEEDERS[backend_name](workdir, data)
+        file_bytes = store_bytes(workdir)
+        results = {}
+
+        results["backend_top"] = measure(
+            lambda: raw.top(rng.choice(games), 20), args.ops, args.budget
+        )
+        results["backend_games"] = measure(raw.games, args.ops, args.budget)
+        raw.close()
+
+        def cold_start():
+            configure_core(workdir, backend_name)
+
+        results["cold_load"] = measure(lb.get_all_games, args.cold_runs, args.budget, cold_start)
+        results["cold_top"] = measure(
+            lambda: lb.get_leaderboard(rng.choice(games), 20),
+            args.cold_runs, args.budget, cold_start,
+        )
+        results["cold_rank"] = measure(
+            lambda: lb.get_rank(rng.choice(games), f"player{rng.randrange(1000)}"),
+            args.cold_runs, args.budget, cold_start,
+        )
+
+        # a second backend stands in for another process writing the store
+        foreign = lb.make_backend()
+        game = games[0]
+
+        def foreign_write():
+            foreign.add([(game, {
+                "player": "foreign", "score": rng.randrange(10000),
+                "extra": {}, "time": "2025-11-08T12:00:00",
+            })])
+
+        lb.get_rank(game, "foreign")
+        results["foreign_top"] = measure(
+            lambda: lb.get_leaderboard(game, 20), args.ops, args.budget, foreign_write
+        )
+        results["foreign_rank"] = measure(
+            lambda: lb.get_rank(game, f"player{rng.randrange(1000)}"),
+            args.ops, args.budget, foreign_write,
+        )
+        foreign.close()
+
+        lb.get_all_games()
+        results["top_n"] = measure(
+            lambda: lb.get_leaderboard(rng.choice(games), 20), args.ops, args.budget
+        )
+        size = max(len(data[g]) for g in games if g in data)
+        results["page"] = measure(
+            lambda: lb.get_page(rng.choice(games), rng.randrange(size), 20),
+            args.ops, args.budget,
+        )
+        results["games"] = measure(lb.get_all_games, args.ops, args.budget)
+        results["insert"] = measure(
+            lambda: lb.add_score(rng.choice(games), "bench", rng.randrange(10000)),
+            args.ops, args.budget,
+        )
+        lb.set_backend(None)
+        return file_bytes, {op: summarize(samples) for op, samples in results.items()}
+    finally:
+        lb.set_backend(None)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Leaderboard benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10, 10**2, 10**3, 10**4, 10**5, 10**6])
+    parser.add_argument("--games", type=int, default=50)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--ops", type=int, default=200, help="max calls per measurement")
+    parser.add_argument("--cold-runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=3.0,
+                        help="seconds after which a measurement stops early")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("-o", "--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    games = [f"game{i}" for i in range(args.games)]
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": vars(args),
+        "results": [],
+    }
+    for size in args.sizes:
+        data = make_entries(size, games, random.Random(args.seed))
+        for backend_name in args.backends:
+            file_bytes, ops = bench_one(backend_name, data, games, random.Random(args.seed), args)
+            for op, stats in ops.items():
+                report["results"].append({
+                    "backend": backend_name, "size": size, "op": op,
+                    "file_bytes": file_bytes, **stats,
+                })
+                print(
+                    f"{size:>8} {backend_name:<6} {op:<14} {file_bytes:>11}B "
+                    f"p50={stats['p50_ms']:9.3f}ms p99={stats['p99_ms']:9.3f}ms "
+                    f"{stats['throughput_ops_s']:10.1f} ops/s",
+                    file=sys.stderr,
+                )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# leaderboard_client.py
+# Talks to leaderboard_server.py. One JSON object per line in both
+# directions: {"op": ..., "args": [...]} -> {"ok": true, "result": ...}
+# or {"ok": false, "error": "ValueError", "message": ...}.
+import json
+import socket
+import threading
+
+DEFAULT_ADDRESS = "127.0.0.1:47800"
+
+
+def parse_address(address):
+    """Parse "unix:/path/to.sock" or "host:port" into (family, sockaddr)."""
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+
+def connect(address, timeout):
+    family, sockaddr = parse_address(address)
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(sockaddr)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+class ServerError(Exception):
+    """The server ran the request and it failed."""
+
+    def __init__(self, kind, message):
+        super().__init__(message)
+        self.kind = kind
+
+
+class NotSentError(ConnectionError):
+    """The request never reached the server, it is safe to run it elsewhere."""
+
+
+class LeaderboardClient:
+    """One connection, shared by the threads of a game process."""
+
+    def __init__(self, address=DEFAULT_ADDRESS, timeout=5.0):
+        self.sock = connect(address, timeout=0.2)
+        self.sock.settimeout(timeout)
+        self._file = self.sock.makefile("rb")
+        self._lock = threading.Lock()
+
+    def request(self, op, *args):
+        line = json.dumps({"op": op, "args": args}).encode("utf-8") + b"\n"
+        with self._lock:
+            try:
+                self.sock.sendall(line)
+            except OSError as exc:
+                # at most part of the line went out; the server drops a
+                # line without its newline
+                raise NotSentError(str(exc)) from exc
+            reply = self._file.readline()
+        if not reply:
+            raise ConnectionError("leaderboard server closed the connection")
+        reply = json.loads(reply)
+        if not reply["ok"]:
+            raise ServerError(reply["error"], reply["message"])
+        return reply["result"]
+
+    def close(self):
+        self._file.close()
+        self.sock.close()
+
+
+def subscribe(address, callback):
+    """Call callback(event) from a background thread for every update the
+    server pushes. Returns a function that stops listening.
+
+    Raises OSError if no server is listening.
+    """
+    sock = connect(address, timeout=0.2)
+    sock.settimeout(None)
+    sock.sendall(b'{"op": "subscribe", "args": []}\n')
+    stream = sock.makefile("rb")
+
+    def listen():
+        try:
+            for line in stream:
+                callback(json.loads(line))
+        except (OSError, ValueError):
+            pass
+
+    threading.Thread(target=listen, name="leaderboard-subscriber", daemon=True).start()
+
+    def stop():
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
+
+    return stop
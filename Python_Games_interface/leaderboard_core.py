@@ -1,24 +1,621 @@
 # leaderboard_core.py
+import atexit
+import itertools
 import json
 import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
 from datetime import datetime
+from types import MappingProxyType
+
+import leaderboard_client as lb_client
+import leaderboard_storage as storage
+from leaderboard_index import GameIndex, make_sort_key, score_key
+from leaderboard_sketch import KllSketch
 
 FILE_NAME = "scores.json"
+# json backend: new scores are appended here and merged into FILE_NAME
+LOG_NAME = "scores.log"
+COMPACT_LOG_BYTES = 64 * 1024
+DB_NAME = "scores.db"
+# binary backend: memory-mapped snapshot plus its own log
+BIN_NAME = "scores.lbin"
+BIN_LOG_NAME = "scores.lbin.log"
+# entries kept per game; LEADERBOARD_KEEP=0 keeps every score
+KEEP_TOP = int(os.environ.get("LEADERBOARD_KEEP", "20")) or None
 
+# "sqlite" (default), "json" or "binary"; LEADERBOARD_BACKEND overrides it
+BACKEND = os.environ.get("LEADERBOARD_BACKEND", "sqlite")
 
-def _load_data():
-    if not os.path.exists(FILE_NAME):
-        return {}
-    try:
-        with open(FILE_NAME, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError):
-        return {}
+# time windows: every score also goes on the board of its day and of its
+# ISO week, e.g. "snake@day:2025-11-08" / "snake@week:2025-W45". Only the
+# current bucket is queried; older ones are dropped by the next write.
+WINDOWS = {
+    "day": lambda t: t.strftime("%Y-%m-%d"),
+    "week": lambda t: "%04d-W%02d" % t.isocalendar()[:2],
+}
+
+# extra keys that get boards of their own, one per value, so that
+# get_leaderboard("minesweeper", where={"difficulty": "hard"}) reads the
+# "minesweeper[difficulty=hard]" board instead of filtering entries
+INDEXED_EXTRAS = {
+    "minesweeper": [("difficulty",)],
+    "memory_match": [("difficulty",)],
+}
+
+# order of entries with equal scores: (extra key, "asc" | "desc") pairs
+TIE_BREAKS = {
+    "minesweeper": [("time_s", "asc")],
+    "memory_match": [("time_s", "asc"), ("attempts", "asc")],
+    "typing_test": [("accuracy", "desc")],
+}
+
+# cross-game board: one entry per player, scored by the sum over these games
+# of the share of all runs of the game that their best run beats (0..100
+# each). A player's entry is worked out again each time they submit, against
+# the game sketches of that moment; everyone's once the runs of these games
+# grew by OVERALL_RESCORE_GROWTH since the last time, so the points of
+# players who stopped playing lag behind by at most that much.
+# OVERALL_BESTS holds each player's best score per game, OVERALL_SCORED the
+# number of runs at the last rescore.
+OVERALL = "overall"
+OVERALL_BESTS = "overall@bests"
+OVERALL_SCORED = "overall@scored"
+OVERALL_RESCORE_GROWTH = 0.1
+OVERALL_GAMES = ["flappy_bird", "2048_5x5", "snake", "minesweeper", "memory_match", "typing_test"]
+
+# leaderboard_server.py, if it is running, serves every call instead of the
+# local store; set to None (or LEADERBOARD_SERVER="") to always go local
+SERVER_ADDRESS = os.environ.get("LEADERBOARD_SERVER", lb_client.DEFAULT_ADDRESS) or None
+# how long to wait before trying to reach a server that was down
+SERVER_RETRY_S = 5.0
+
+# submit_score: pending scores waiting for the writer thread
+SUBMIT_QUEUE_SIZE = 256
+
+_backend = None
+# guards creating and swapping _backend; the reindex() after a migration
+# runs outside it, it reads the store through get_backend() again
+_backend_lock = threading.Lock()
+_submit_queue = queue.Queue(maxsize=SUBMIT_QUEUE_SIZE)
+_writer = None
+_writer_lock = threading.Lock()
+# (game_name, entry, exception) of the submitted scores that could not be
+# saved since the last flush()
+_failed_writes = []
+
+# one GameIndex per board, loaded from the store the first time a rank or
+# a player's best is asked for (pages and counts are read off the store's
+# own ranking until then). When the backend signature (file
+# mtime/size/inode, or the SQLite data version) moves, the scores saved
+# since _cache_cursor, by this process or any other, are read from the
+# store's change feed and added in place; only a compaction or a dropped
+# board makes every board load again.
+_cache_signature = None
+_cache_cursor = None
+_cache_boards = {}
+# store position each GameIndex was loaded at: feed records up to it are
+# already on the board
+_cache_positions = {}
+# names of the boards that have entries, None until first listed
+_cache_names = None
+# KllSketch per board, same rules as _cache_boards except that a board
+# the feed brings scores for is read again
+_cache_sketches = {}
+# re-entrant: the first get_backend() inside a query may migrate scores.json
+# and rebuild the INDEXED_EXTRAS boards
+_cache_lock = threading.RLock()
+_cache_stats = {"hits": 0, "misses": 0, "reloads": 0}
+# newest day / week bucket this process has written to
+_current_buckets = {}
+
+_client = None
+_client_retry_at = 0.0
+_client_lock = threading.Lock()
+
+
+def make_backend(kind=None):
+    kind = kind or BACKEND
+    if kind == "json":
+        return storage.JsonBackend(
+            FILE_NAME, LOG_NAME, keep=KEEP_TOP,
+            compact_log_bytes=COMPACT_LOG_BYTES, ordering=_ordering, per_player=_per_player,
+        )
+    if kind == "binary":
+        return storage.BinaryBackend(
+            BIN_NAME, BIN_LOG_NAME, keep=KEEP_TOP,
+            compact_log_bytes=COMPACT_LOG_BYTES, ordering=_ordering, per_player=_per_player,
+        )
+    if kind == "sqlite":
+        return storage.SqliteBackend(
+            DB_NAME, keep=KEEP_TOP, ordering=_ordering, per_player=_per_player
+        )
+    raise ValueError(f"unknown leaderboard backend: {kind!r}")
+
+
+def _migrate_if_needed():
+    target = {"sqlite": DB_NAME, "binary": BIN_NAME}.get(BACKEND)
+    if target is None or os.path.exists(target) or not os.path.exists(FILE_NAME):
+        return False
+    # first run after switching from scores.json; the lock stops two games
+    # started together from both importing it
+    with storage.FileLock(target + ".lock").exclusive():
+        if os.path.exists(target):
+            return False
+        if BACKEND == "sqlite":
+            storage.migrate_json_to_sqlite(
+                FILE_NAME, DB_NAME, LOG_NAME, keep=KEEP_TOP, ordering=_ordering,
+                per_player=_per_player,
+            )
+        else:
+            source = storage.JsonBackend(
+                FILE_NAME, LOG_NAME, keep=KEEP_TOP, ordering=_ordering, per_player=_per_player
+            )
+            target = make_backend("binary")
+            target._save_stats(source.all_stats())
+            target._save_data(source.dump())
+        return True
+
+
+def get_backend():
+    global _backend
+    backend = _backend
+    if backend is not None:
+        return backend
+    with _backend_lock:
+        if _backend is not None:
+            return _backend
+        migrated = _migrate_if_needed()
+        backend = _backend = make_backend()
+    if migrated or _index_missing():
+        reindex()
+    return backend
+
+
+def _index_missing():
+    """True if a kept all-time score has no INDEXED_EXTRAS board to be on,
+    e.g. a scores.json written before the index was declared."""
+    with _cache_lock:
+        _validate_cache()
+        names = set(_board_names())
+        for game_name in INDEXED_EXTRAS:
+            if game_name not in names:
+                continue
+            index = _board_index(game_name)
+            for entry in index.page(0, len(index)):
+                for where in _partitions(game_name, entry["extra"]):
+                    if _board(game_name, where=where) not in names:
+                        return True
+        # OVERALL without OVERALL_BESTS is a board of points stored by an
+        # older version, OVERALL_BESTS without OVERALL one that worked the
+        # points out when read
+        if OVERALL_BESTS not in names:
+            return any(g in names for g in OVERALL_GAMES + [OVERALL])
+        return OVERALL not in names
+    return False
+
+
+def set_backend(backend):
+    """Use another storage backend (see leaderboard_storage) from now on."""
+    global _backend
+    with _backend_lock:
+        old, _backend = _backend, backend
+    if old is not None and old is not backend:
+        old.close()
+    with _cache_lock:
+        _reset_cache()
+
+
+def compact():
+    get_backend().compact()
+
+
+def get_metrics():
+    """Counters for this process, e.g. time spent waiting for the store lock."""
+    return {"lock_wait": get_backend().lock_stats.as_dict(), "cache": cache_info()}
+
+
+def cache_info():
+    return dict(_cache_stats)
+
+
+def _freeze(entry):
+    return MappingProxyType({**entry, "extra": MappingProxyType(dict(entry["extra"]))})
+
+
+def _reset_cache(signature=None, cursor=None):
+    global _cache_signature, _cache_cursor, _cache_names
+    _cache_signature = signature
+    _cache_cursor = cursor
+    _cache_boards.clear()
+    _cache_positions.clear()
+    _cache_sketches.clear()
+    _cache_names = None
+
+
+def _validate_cache():
+    """Bring the loaded boards up to date with the store. Caller holds
+    _cache_lock."""
+    global _cache_signature, _cache_cursor
+    backend = get_backend()
+    if backend.signature() == _cache_signature:
+        _cache_stats["hits"] += 1
+        return
+    _cache_stats["misses"] += 1
+    signature, cursor, records = backend.changes(_cache_cursor)
+    if records is None:
+        _cache_stats["reloads"] += 1
+        _reset_cache(signature, cursor)
+        return
+    _catch_up(records)
+    _cache_signature, _cache_cursor = signature, cursor
+
+
+def _catch_up(records):
+    """Add the change-feed records to the loaded boards."""
+    for position, board, entry in records:
+        index = _cache_boards.get(board)
+        if index is not None and position > _cache_positions[board]:
+            index.add(_freeze(entry))
+            index.trim(_keep(board))
+        # a sketch is cheap to read again, and the feed misses scores
+        # that were trimmed before it was read
+        _cache_sketches.pop(board, None)
+        if _cache_names is not None and board not in _cache_names:
+            _cache_names.append(board)
+
+
+def _board_index(board):
+    """GameIndex of one board, read from the store only on first use.
+    Caller holds _cache_lock and has called _validate_cache()."""
+    index = _cache_boards.get(board)
+    if index is None:
+        while True:
+            _, cursor, entries = get_backend().load_board(board)
+            if cursor[0] == _cache_cursor[0]:
+                break
+            # compacted or dropped since _validate_cache: start over
+            _validate_cache()
+        index = GameIndex((_freeze(e) for e in entries), _sort_key(board), _per_player(board))
+        index.trim(_keep(board))
+        _cache_boards[board] = index
+        _cache_positions[board] = cursor[1]
+    return index
+
+
+def _page(board, offset, limit):
+    """Entries ranked offset+1 .. offset+limit of a board. Same rules as
+    _board_index, but a board that is not loaded is not loaded for this:
+    the store's index serves one page without reading the rest."""
+    index = _cache_boards.get(board)
+    if index is not None:
+        return index.page(offset, limit)
+    keep = _keep(board)
+    if keep is not None:
+        # the store may hold a few entries past keep until its next trim
+        limit = min(limit, keep - offset)
+    if limit <= 0:
+        return ()
+    return tuple(_freeze(e) for e in get_backend().page(board, offset, limit))
+
+
+def _count(board):
+    """Number of entries kept on a board. Same rules as _page."""
+    index = _cache_boards.get(board)
+    if index is not None:
+        return len(index)
+    count = get_backend().count(board)
+    keep = _keep(board)
+    return count if keep is None else min(count, keep)
+
+
+def _board_sketch(board):
+    """KllSketch of one board. Same rules as _board_index."""
+    sketch = _cache_sketches.get(board)
+    if sketch is None and _per_player(board):
+        # the store's sketch also counts every entry that was replaced
+        sketch = _cache_sketches[board] = KllSketch()
+        index = _board_index(board)
+        for entry in index.page(0, len(index)):
+            sketch.update(entry["score"])
+    elif sketch is None:
+        signature, sketch = get_backend().stats(board)
+        if signature == _cache_signature:
+            # else it already counts scores the feed has still to bring
+            _cache_sketches[board] = sketch
+    return sketch
+
+
+def _board_names():
+    """Names of the boards with entries. Same rules as _board_index."""
+    global _cache_names
+    if _cache_names is None:
+        _, names = get_backend().board_names()
+        _cache_names = list(names)
+    return _cache_names
+
+
+def _partition(where):
+    return "[" + ",".join(f"{k}={where[k]}" for k in sorted(where)) + "]"
+
+
+def _board(game_name, window="all", when=None, where=None):
+    name = game_name + _partition(where) if where else game_name
+    if window == "all":
+        return name
+    if window not in WINDOWS:
+        raise ValueError(f"unknown leaderboard window: {window!r}")
+    return f"{name}@{window}:{WINDOWS[window](when or datetime.now())}"
+
+
+def _parse_board(name):
+    """(game_name, partition or None, window, bucket) of a board name."""
+    name, sep, rest = name.rpartition("@") if "@" in name else (name, "", "")
+    window, _, bucket = rest.partition(":") if sep else ("all", "", None)
+    game_name, bracket, partition = name.partition("[")
+    return game_name, (bracket + partition) or None, window, bucket
+
+
+def _check_where(game_name, where):
+    keys = set(where)
+    if not any(keys == set(index) for index in INDEXED_EXTRAS.get(game_name, ())):
+        raise ValueError(
+            f"no index on {sorted(keys)} for {game_name!r}, add it to INDEXED_EXTRAS"
+        )
+
+
+def _ordering(board):
+    return TIE_BREAKS.get(_parse_board(board)[0], ())
+
+
+def _per_player(board):
+    return board in (OVERALL, OVERALL_BESTS, OVERALL_SCORED)
+
+
+def _keep(board):
+    return None if _per_player(board) else KEEP_TOP
+
+
+def _sort_key(board):
+    tie_breaks = _ordering(board)
+    return make_sort_key(tie_breaks) if tie_breaks else score_key
+
+
+def _query(game_name, fn, window="all", where=None):
+    if where:
+        _check_where(game_name, where)
+    board = _board(game_name, window, where=where)
+    with _cache_lock:
+        _validate_cache()
+        return fn(board)
+
+
+def _partitions(game_name, extra):
+    for keys in INDEXED_EXTRAS.get(game_name, ()):
+        if all(k in extra for k in keys):
+            yield {k: extra[k] for k in keys}
+
+
+def _expand(records, main=True):
+    """Every board a score goes on: all-time, today and this week, each of
+    them also once per indexed extra value."""
+    now = datetime.now()
+    current = {window: bucket_of(now) for window, bucket_of in WINDOWS.items()}
+    out = []
+    for game_name, entry in records:
+        when = datetime.fromisoformat(entry["time"])
+        wheres = list(_partitions(game_name, entry["extra"]))
+        if main:
+            wheres.insert(0, None)
+        for where in wheres:
+            out.append((_board(game_name, "all", when, where), entry))
+            for window, bucket_of in WINDOWS.items():
+                # scores from an earlier day or week (imports, a late flush)
+                # only count all-time
+                if bucket_of(when) == current[window]:
+                    out.append((_board(game_name, window, when, where), entry))
+    return out
+
+
+def _expire_windows():
+    now = datetime.now()
+    stale = []
+    for window, bucket_of in WINDOWS.items():
+        current = bucket_of(now)
+        if _current_buckets.get(window) == current:
+            continue
+        _current_buckets[window] = current
+        with _cache_lock:
+            _validate_cache()
+            names = list(_board_names())
+        for name in names:
+            _, _, board_window, bucket = _parse_board(name)
+            if board_window == window and bucket < current:
+                stale.append(name)
+    if stale:
+        _drop(stale)
+
+
+# the cache learns of these writes from the change feed like of anyone
+# else's
+def _drop(names):
+    get_backend().drop(names)
+
+
+def _insert(records):
+    get_backend().add(records)
+
+
+def _write(records):
+    _call("add", records)
+
+
+def _overall_records(records, bests=None):
+    """OVERALL_BESTS entries for the players in records who beat their best
+    score on one of OVERALL_GAMES, and OVERALL entries for everyone in
+    records who played one of them, or for every player when a rescore is
+    due. bests ({player: {game: score}}) replaces the stored board as the
+    starting point (reindex) and always rescores."""
+    reindexing = bests is not None
+    with _cache_lock:
+        _validate_cache()
+        index = None if reindexing else _board_index(OVERALL_BESTS)
+        bests = {} if bests is None else bests
+        # the game sketches as they are once records are saved; reindex
+        # reads scores the sketches already counted
+        sketches = {}
+        improved = {}
+        played = {}
+        for game_name, entry in records:
+            if game_name not in OVERALL_GAMES:
+                continue
+            player = entry["player"]
+            if not reindexing:
+                if game_name not in sketches:
+                    sketches[game_name] = _board_sketch(game_name).copy()
+                sketches[game_name].update(entry["score"])
+            played[player] = entry["time"]
+            if player not in bests:
+                best = index.best(player) if index is not None else None
+                bests[player] = dict(best["extra"]) if best else {}
+            if game_name in bests[player] and entry["score"] <= bests[player][game_name]:
+                continue
+            bests[player][game_name] = entry["score"]
+            improved[player] = entry["time"]
+        for game_name in OVERALL_GAMES:
+            if game_name not in sketches:
+                sketches[game_name] = _board_sketch(game_name)
+
+        out = [
+            (OVERALL_BESTS, {
+                "player": player,
+                # games played; OVERALL ranks by points, not by this
+                "score": len(bests[player]),
+                "extra": dict(bests[player]),
+                "time": when,
+            })
+            for player, when in improved.items()
+        ]
+        runs = sum(sketch.count for sketch in sketches.values())
+        scored = _board_index(OVERALL_SCORED).best("")
+        scored = scored["score"] if scored else 0
+        if reindexing or runs > scored * (1 + OVERALL_RESCORE_GROWTH):
+            players = []
+            for e in index.page(0, len(index)) if index is not None else ():
+                player = e["player"]
+                players.append((player, bests.get(player, e["extra"]), played.get(player, e["time"])))
+            stored = {player for player, _, _ in players}
+            players += [(p, bests[p], played[p]) for p in bests if p not in stored]
+            out += _overall_points(players, sketches)
+            out.append((OVERALL_SCORED, {
+                "player": "", "score": runs, "extra": {},
+                "time": datetime.now().isoformat(timespec="seconds"),
+            }))
+        else:
+            out += _overall_points([(p, bests[p], when) for p, when in played.items()], sketches)
+    return out
+
+
+def _overall_points(players, sketches):
+    """OVERALL entries of players, [(player, {game: best score}, time)]: each
+    best score turned into points against the game's sketch. A run gets the
+    share of the game's runs that scored lower, so a game's first run is
+    worth 0 and the best of n runs about 100 * (n - 1) / n."""
+    points = [{} for _ in players]
+    for game_name in OVERALL_GAMES:
+        played = [i for i, (_, bests, _) in enumerate(players) if game_name in bests]
+        if not played:
+            continue
+        below = sketches[game_name].fractions_below(
+            [players[i][1][game_name] for i in played]
+        )
+        for i, fraction in zip(played, below):
+            points[i][game_name] = round(100 * (fraction or 0.0), 1)
+    return [
+        (OVERALL, {
+            "player": player,
+            "score": round(sum(p.values()), 1),
+            "extra": p,
+            "time": when,
+        })
+        for (player, _, when), p in zip(players, points)
+    ]
 
 
-def _save_data(data):
-    with open(FILE_NAME, "w", encoding="utf-8") as f:
+def _local_write(records):
+    _expire_windows()
+    _insert(_expand(records) + _overall_records(records))
+
+
+def reindex(game_name=None):
+    """Rebuild the boards derived from the kept all-time entries: the
+    INDEXED_EXTRAS boards (e.g. after declaring a new index) and the
+    players' bests and points of OVERALL. Scores that were already cut
+    from the all-time board cannot be recovered."""
+    games = [game_name] if game_name else list(INDEXED_EXTRAS)
+    overall = game_name is None or game_name in OVERALL_GAMES
+    with _cache_lock:
+        _validate_cache()
+        names = list(_board_names())
+        stale = [
+            name for name in names
+            if _parse_board(name)[0] in games and _parse_board(name)[1]
+        ]
+        sources = list(games)
+        if overall:
+            stale += [
+                name for name in (OVERALL_BESTS, OVERALL, OVERALL_SCORED) if name in names
+            ]
+            sources += [g for g in OVERALL_GAMES if g not in sources]
+        records = []
+        for g in sources:
+            if g not in names:
+                continue
+            index = _board_index(g)
+            for e in index.page(0, len(index)):
+                records.append((g, {**e, "extra": dict(e["extra"])}))
+        # oldest first, so the new boards keep the same tie order
+        records.sort(key=lambda r: r[1]["time"])
+        derived = _expand([r for r in records if r[0] in games], main=False)
+        if overall:
+            derived += _overall_records(records, bests={})
+    if stale:
+        _drop(stale)
+    if derived:
+        _insert(derived)
+
+
+def export_json(path, games=None):
+    """Write the all-time boards to path in the old, readable scores.json
+    layout (one ranked list per game)."""
+    data = {}
+    # OVERALL is worked out from the games, importing them rebuilds it
+    for name in games or [g for g in get_all_games() if g != OVERALL]:
+        data[name] = [{**e, "extra": dict(e["extra"])} for e in iter_scores(name)]
+    with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2)
+    return sum(len(entries) for entries in data.values())
+
+
+def import_json(path):
+    """Add every entry of a scores.json-style file, keeping their times."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    records = [(name, entry) for name, entries in data.items() for entry in entries]
+    add_scores(records)
+    return len(records)
+
+
+def _make_entry(player_name, score, extra):
+    return {
+        "player": player_name,
+        "score": score,
+        "extra": extra or {},
+        "time": datetime.now().isoformat(timespec="seconds"),
+    }
 
 
 def add_score(game_name, player_name, score, extra=None):
@@ -28,32 +625,294 @@ def add_score(game_name, player_name, score, extra=None):
     score: number (higher = better)
     extra: dict with extra info (time, attempts, accuracy, etc.)
     """
-    data = _load_data()
-    if game_name not in data:
-        data[game_name] = []
+    _write([(game_name, _make_entry(player_name, score, extra))])
 
-    entry = {
-        "player": player_name,
-        "score": score,
-        "extra": extra or {},
-        "time": datetime.now().isoformat(timespec="seconds"),
+
+def add_scores(records):
+    """Save many scores in one write, e.g. an import.
+
+    records: list of (game_name, entry), entry a dict with "player",
+    "score", "extra" and "time" (ISO format) like the ones get_page
+    returns. The times are kept as given.
+    """
+    records = list(records)
+    if records:
+        _write(records)
+
+
+def submit_score(game_name, player_name, score, extra=None, callback=None):
+    """Same as add_score, but the write happens on a background thread.
+
+    Returns a concurrent.futures.Future that resolves to the saved entry.
+    callback(future) runs on the writer thread, so Tk code must hand any
+    widget updates back with root.after. Blocks only when SUBMIT_QUEUE_SIZE
+    scores are already waiting.
+    """
+    future = Future()
+    future.add_done_callback(_report_failure)
+    if callback is not None:
+        future.add_done_callback(callback)
+    _start_writer()
+    _submit_queue.put((game_name, _make_entry(player_name, score, extra), future))
+    return future
+
+
+class SaveError(Exception):
+    """Scores handed to submit_score() could not be saved."""
+
+    def __init__(self, failures):
+        game_name, entry, exc = failures[-1]
+        super().__init__(
+            f"{len(failures)} score(s) not saved, last: {game_name} {entry['player']} "
+            f"{entry['score']}: {exc!r}"
+        )
+        self.failures = failures
+
+
+def flush():
+    """Wait until every submitted score has been written. Raises SaveError
+    if any of them failed since the last flush()."""
+    if _writer is None:
+        return
+    _submit_queue.join()
+    with _writer_lock:
+        failures = _failed_writes[:]
+        del _failed_writes[:]
+    if failures:
+        raise SaveError(failures) from failures[-1][2]
+
+
+def _report_failure(future):
+    # nobody may ever look at the future, so a failed save is at least logged
+    exc = future.exception()
+    if exc is not None:
+        print(f"leaderboard: could not save a score: {exc!r}", file=sys.stderr)
+
+
+def _start_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(
+                target=_writer_loop, name="leaderboard-writer", daemon=True
+            )
+            _writer.start()
+            atexit.register(flush)
+
+
+def _writer_loop():
+    while True:
+        batch = [_submit_queue.get()]
+        # whatever piled up meanwhile goes into the same write
+        while True:
+            try:
+                batch.append(_submit_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            _write([(game_name, entry) for game_name, entry, _ in batch])
+        except Exception as exc:
+            with _writer_lock:
+                _failed_writes.extend((game_name, entry, exc) for game_name, entry, _ in batch)
+            for _, _, future in batch:
+                future.set_exception(exc)
+        else:
+            for _, entry, future in batch:
+                future.set_result(entry)
+        finally:
+            for _ in batch:
+                _submit_queue.task_done()
+
+
+def _local_page(game_name, offset, limit, window="all", where=None):
+    return _query(game_name, lambda board: _page(board, offset, limit), window, where)
+
+
+def _local_count(game_name, window="all", where=None):
+    return _query(game_name, _count, window, where)
+
+
+def _local_rank(game_name, player_name, window="all", where=None):
+    return _query(game_name, lambda board: _board_index(board).rank(player_name), window, where)
+
+
+def _local_best(game_name, player_name, window="all", where=None):
+    return _query(game_name, lambda board: _board_index(board).best(player_name), window, where)
+
+
+def _summary(sketch, bins):
+    return {
+        "count": sketch.count,
+        "mean": sketch.mean(),
+        "min": sketch.min,
+        "max": sketch.max,
+        "p50": sketch.quantile(0.5),
+        "p90": sketch.quantile(0.9),
+        "p99": sketch.quantile(0.99),
+        "histogram": sketch.histogram(bins),
     }
 
-    data[game_name].append(entry)
-    # sort by score descending and keep only top 20
-    data[game_name].sort(key=lambda e: e["score"], reverse=True)
-    data[game_name] = data[game_name][:20]
 
-    _save_data(data)
+def _local_stats(game_name, bins=10, window="all", where=None):
+    return _query(game_name, lambda board: _summary(_board_sketch(board), bins), window, where)
+
+
+def _local_percentile(game_name, score, window="all", where=None):
+    return _query(
+        game_name, lambda board: _board_sketch(board).fraction_below(score), window, where
+    )
+
+
+def _local_games():
+    with _cache_lock:
+        _validate_cache()
+        return [
+            name for name in _board_names()
+            if _parse_board(name)[1:3] == (None, "all")
+        ]
+
 
+_LOCAL_OPS = {
+    "add": _local_write,
+    "page": _local_page,
+    "count": _local_count,
+    "rank": _local_rank,
+    "best": _local_best,
+    "games": _local_games,
+    "stats": _local_stats,
+    "percentile": _local_percentile,
+}
 
-def get_leaderboard(game_name, limit=10):
-    data = _load_data()
-    entries = data.get(game_name, [])
-    return entries[:limit]
+# server replies are plain JSON, hand them out read-only like local results
+_FROM_SERVER = {
+    "page": lambda entries: tuple(_freeze(e) for e in entries),
+    "best": lambda entry: None if entry is None else _freeze(entry),
+    "stats": lambda stats: {**stats, "histogram": [tuple(b) for b in stats["histogram"]]},
+}
+
+
+def _server():
+    """Connected LeaderboardClient, or None while no server is running."""
+    global _client, _client_retry_at
+    if not SERVER_ADDRESS:
+        return None
+    with _client_lock:
+        if _client is None and time.monotonic() >= _client_retry_at:
+            try:
+                _client = lb_client.LeaderboardClient(SERVER_ADDRESS)
+            except OSError:
+                _client_retry_at = time.monotonic() + SERVER_RETRY_S
+        return _client
+
+
+def _disconnect(server):
+    global _client, _client_retry_at
+    with _client_lock:
+        if _client is server:
+            _client = None
+            _client_retry_at = time.monotonic() + SERVER_RETRY_S
+    server.close()
+
+
+def _call(op, *args):
+    """Run op on the leaderboard server when one is up, else on the local store."""
+    server = _server()
+    if server is not None:
+        try:
+            result = server.request(op, *args)
+        except lb_client.ServerError as exc:
+            if exc.kind == "ValueError":
+                raise ValueError(str(exc)) from None
+            # the server could not do it, try the store ourselves
+        except lb_client.NotSentError:
+            _disconnect(server)
+        except (OSError, ValueError) as exc:
+            _disconnect(server)
+            if op == "add":
+                # sent but not answered: the server may still save these
+                # scores, writing them here as well could save them twice
+                raise ConnectionError(
+                    f"leaderboard server did not confirm the write: {exc}"
+                ) from exc
+        else:
+            return _FROM_SERVER.get(op, lambda r: r)(result)
+    return _LOCAL_OPS[op](*args)
+
+
+def subscribe(callback):
+    """Call callback(event) on a background thread each time the leaderboard
+    server saves scores, e.g. {"event": "scores", "games": ["snake"]}.
+
+    Returns a function that stops the subscription, or None when no server
+    is running (callers then have to poll).
+    """
+    if not SERVER_ADDRESS:
+        return None
+    try:
+        return lb_client.subscribe(SERVER_ADDRESS, callback)
+    except OSError:
+        return None
+
+
+def get_leaderboard(game_name, limit=10, window="all", where=None):
+    """Best entries of all time, of today (window="day") or of this week.
+
+    where={"difficulty": "hard"} reads the board of one indexed extra value,
+    see INDEXED_EXTRAS.
+    """
+    return get_page(game_name, 0, limit, window, where)
+
+
+def get_page(game_name, offset, limit, window="all", where=None):
+    """Entries ranked offset+1 .. offset+limit."""
+    return _call("page", game_name, offset, limit, window, where)
+
+
+def get_count(game_name, window="all", where=None):
+    """Number of entries kept for a game."""
+    return _call("count", game_name, window, where)
+
+
+def get_rank(game_name, player_name, window="all", where=None):
+    """1-based rank of the player's best entry, or None."""
+    return _call("rank", game_name, player_name, window, where)
+
+
+def get_player_best(game_name, player_name, window="all", where=None):
+    """The player's best kept entry, or None."""
+    return _call("best", game_name, player_name, window, where)
+
+
+def get_stats(game_name, bins=10, window="all", where=None):
+    """Distribution of every score ever submitted to the board, not only
+    the kept ones: count, mean, min, max, approximate p50/p90/p99 and a
+    histogram [(low, high, count), ...] of `bins` equal-width bins."""
+    return _call("stats", game_name, bins, window, where)
+
+
+def get_percentile(game_name, score, window="all", where=None):
+    """Approximate fraction (0..1) of submitted runs that scored lower than
+    score, None if the board has none yet."""
+    return _call("percentile", game_name, score, window, where)
 
 
 def get_all_games():
     """Return list of all game names that have scores."""
-    data = _load_data()
-    return list(data.keys())
+    return _call("games")
+
+
+def iter_scores(game_name, window="all", where=None):
+    """Yield every kept entry of a board, best first, like get_page would
+    page through it, but read straight off the local store a chunk at a
+    time so that exporting a large board needs little memory. A running
+    leaderboard server is not asked; the store is safe to read alongside it."""
+    if where:
+        _check_where(game_name, where)
+    board = _board(game_name, window, where=where)
+    entries = get_backend().iter_board(board)
+    keep = _keep(board)
+    if keep is not None:
+        # the store may hold a few entries past keep until its next trim
+        entries = itertools.islice(entries, keep)
+    for entry in entries:
+        yield _freeze(entry)
@@ -0,0 +1,226 @@
+# leaderboard_index.py
+# In-memory ranking structures used by leaderboard_core.
+from bisect import bisect_left, insort
+
+
+class SortedKeyList:
+    """Sorted list of keys that also answers "what is at position i" and
+    "at which position is key k" in O(log n).
+
+    Keys live in buckets of about LOAD items; a Fenwick tree over the bucket
+    sizes turns a bucket number into a position and back. Inserting or
+    removing moves at most 2 * LOAD items inside one bucket.
+    """
+
+    LOAD = 256
+
+    def __init__(self, keys=()):
+        keys = sorted(keys)
+        self._buckets = [keys[i:i + self.LOAD] for i in range(0, len(keys), self.LOAD)]
+        self._maxes = [b[-1] for b in self._buckets]
+        self._len = len(keys)
+        self._build_tree()
+
+    def _build_tree(self):
+        n = len(self._buckets)
+        tree = [0] * (n + 1)
+        for i, bucket in enumerate(self._buckets, 1):
+            tree[i] += len(bucket)
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _tree_add(self, pos, delta):
+        i = pos + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, pos):
+        # number of keys in buckets [0, pos)
+        total = 0
+        while pos > 0:
+            total += self._tree[pos]
+            pos -= pos & -pos
+        return total
+
+    def _locate(self, index):
+        # (bucket, offset inside it) of the key at a flat position
+        n = len(self._tree) - 1
+        pos = 0
+        step = 1 << (n.bit_length() - 1) if n else 0
+        while step:
+            nxt = pos + step
+            if nxt <= n and self._tree[nxt] <= index:
+                pos = nxt
+                index -= self._tree[nxt]
+            step >>= 1
+        return pos, index
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for bucket in self._buckets:
+            yield from bucket
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("SortedKeyList index out of range")
+        pos, offset = self._locate(index)
+        return self._buckets[pos][offset]
+
+    def add(self, key):
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            self._len = 1
+            self._build_tree()
+            return
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            pos -= 1
+            self._buckets[pos].append(key)
+            self._maxes[pos] = key
+        else:
+            insort(self._buckets[pos], key)
+        self._len += 1
+        bucket = self._buckets[pos]
+        if len(bucket) > 2 * self.LOAD:
+            half = len(bucket) // 2
+            self._buckets[pos:pos + 1] = [bucket[:half], bucket[half:]]
+            self._maxes[pos:pos + 1] = [bucket[half - 1], bucket[-1]]
+            self._build_tree()
+        else:
+            self._tree_add(pos, 1)
+
+    def remove(self, key):
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            raise ValueError(f"{key!r} not in list")
+        bucket = self._buckets[pos]
+        i = bisect_left(bucket, key)
+        if i == len(bucket) or bucket[i] != key:
+            raise ValueError(f"{key!r} not in list")
+        del bucket[i]
+        self._len -= 1
+        if bucket:
+            self._maxes[pos] = bucket[-1]
+            self._tree_add(pos, -1)
+        else:
+            del self._buckets[pos]
+            del self._maxes[pos]
+            self._build_tree()
+
+    def pop(self):
+        key = self._buckets[-1][-1]
+        self.remove(key)
+        return key
+
+    def index(self, key):
+        """Position of key, or where it would be inserted."""
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            return self._len
+        return self._prefix(pos) + bisect_left(self._buckets[pos], key)
+
+    def islice(self, start, stop):
+        start = max(start, 0)
+        stop = min(stop, self._len)
+        if start >= stop:
+            return
+        pos, offset = self._locate(start)
+        remaining = stop - start
+        while remaining > 0:
+            chunk = self._buckets[pos][offset:offset + remaining]
+            yield from chunk
+            remaining -= len(chunk)
+            pos += 1
+            offset = 0
+
+
+def make_sort_key(tie_breaks=()):
+    """Ranking key: score descending, then each (extra key, "asc" | "desc")
+    in turn. Entries missing a tie-break value rank after those that have it;
+    "desc" needs numeric values."""
+    tie_breaks = tuple(tie_breaks)
+
+    def sort_key(entry):
+        parts = [-entry["score"]]
+        for name, direction in tie_breaks:
+            value = entry["extra"].get(name)
+            if value is None:
+                parts.append((1, 0))
+            else:
+                parts.append((0, value if direction == "asc" else -value))
+        return tuple(parts)
+
+    return sort_key
+
+
+score_key = make_sort_key()
+
+
+class GameIndex:
+    """One board's kept entries, ranked by sort_key; entries with equal keys
+    rank in the order they were added. With per_player=True a new entry
+    replaces the player's previous one instead of ranking next to it."""
+
+    def __init__(self, entries=(), sort_key=score_key, per_player=False):
+        # entries come from storage in rank order, so older ties come first
+        self._sort_key = sort_key
+        self._per_player = per_player
+        self._seq = 0
+        self._entries = {}
+        self._best = {}
+        keys = [self._register(entry) for entry in entries]
+        self._ranked = SortedKeyList(keys)
+
+    def _register(self, entry):
+        key = (self._sort_key(entry), self._seq)
+        self._seq += 1
+        self._entries[key] = entry
+        best = self._best.get(entry["player"])
+        if best is None or key < best:
+            self._best[entry["player"]] = key
+        return key
+
+    def __len__(self):
+        return len(self._ranked)
+
+    def add(self, entry):
+        if self._per_player:
+            old = self._best.pop(entry["player"], None)
+            if old is not None:
+                self._ranked.remove(old)
+                del self._entries[old]
+        self._ranked.add(self._register(entry))
+
+    def trim(self, keep):
+        """Drop everything ranked below position `keep` (None keeps all)."""
+        if keep is None:
+            return
+        while len(self._ranked) > keep:
+            key = self._ranked.pop()
+            entry = self._entries.pop(key)
+            # a player's other entries rank below their best, so if the best
+            # was dropped they are all gone
+            if self._best.get(entry["player"]) == key:
+                del self._best[entry["player"]]
+
+    def page(self, offset, limit):
+        return tuple(self._entries[k] for k in self._ranked.islice(offset, offset + limit))
+
+    def rank(self, player):
+        """1-based position of the player's best entry, None if not ranked."""
+        key = self._best.get(player)
+        if key is None:
+            return None
+        return self._ranked.index(key) + 1
+
+    def best(self, player):
+        key = self._best.get(player)
+        return None if key is None else self._entries[key]
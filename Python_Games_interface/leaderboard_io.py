@@ -0,0 +1,201 @@
+# leaderboard_io.py
+# Bulk import / export of scores as NDJSON or CSV, streamed so memory stays
+# flat whatever the file size.
+#
+#   python leaderboard_io.py export -o scores.ndjson
+#   python leaderboard_io.py export --game snake --format csv > snake.csv
+#   python leaderboard_io.py import scores.ndjson --batch 5000
+#   python leaderboard_io.py import old.csv --game snake
+#
+# One record per line / row:
+#   NDJSON  {"game": ..., "player": ..., "score": ..., "time": ..., "extra": {...}}
+#   CSV     game,player,score,time,extra   (extra as JSON text; any other
+#           column is added to extra as well)
+# "time" may be left out, it then becomes the moment of the import.
+# Imported scores go through the same path as add_score (ranking,
+# retention, daily/weekly and INDEXED_EXTRAS boards, the leaderboard server
+# if one is running), one write per batch.
+import argparse
+import csv
+import json
+import sys
+from datetime import datetime
+
+import leaderboard_core as lb
+
+FORMATS = ("ndjson", "csv")
+CSV_FIELDS = ["game", "player", "score", "time", "extra"]
+BATCH_SIZE = 5000
+
+
+def guess_format(path):
+    return "csv" if path and path.lower().endswith(".csv") else "ndjson"
+
+
+def _number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _parse_csv_value(text):
+    try:
+        return _number(text)
+    except ValueError:
+        return text
+
+
+def _make_record(row, game=None):
+    """(game_name, entry) from one parsed line, checked like add_score's
+    arguments would be."""
+    if not isinstance(row, dict):
+        raise ValueError(f"expected an object, got {row!r}")
+    game_name = game or row.get("game")
+    if not game_name:
+        raise ValueError("missing game (pass --game to set it for the whole file)")
+    player = row.get("player")
+    if not player:
+        raise ValueError("missing player")
+    score = row.get("score")
+    if isinstance(score, str):
+        score = _number(score)
+    if not isinstance(score, (int, float)) or isinstance(score, bool):
+        raise ValueError(f"score must be a number, got {score!r}")
+    extra = row.get("extra") or {}
+    if not isinstance(extra, dict):
+        raise ValueError("extra must be an object")
+    when = row.get("time") or datetime.now().isoformat(timespec="seconds")
+    try:
+        datetime.fromisoformat(when)
+    except TypeError:
+        raise ValueError(f"time must be an ISO date string, got {when!r}") from None
+    return game_name, {"player": str(player), "score": score, "extra": extra, "time": when}
+
+
+def read_records(stream, fmt="ndjson", game=None):
+    """Yield (game_name, entry) for every line of stream."""
+    if fmt == "ndjson":
+        for number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                yield _make_record(json.loads(line), game)
+            except (ValueError, TypeError) as exc:
+                raise ValueError(f"line {number}: {exc}") from None
+    elif fmt == "csv":
+        for number, row in enumerate(csv.DictReader(stream), 2):
+            try:
+                extra = json.loads(row.pop("extra", None) or "{}")
+                for key, value in row.items():
+                    if key not in CSV_FIELDS and key is not None and value != "":
+                        extra[key] = _parse_csv_value(value)
+                row["extra"] = extra
+                yield _make_record(row, game)
+            except (ValueError, TypeError) as exc:
+                raise ValueError(f"line {number}: {exc}") from None
+    else:
+        raise ValueError(f"unknown format: {fmt!r}")
+
+
+def import_records(records, batch_size=BATCH_SIZE, progress=None):
+    """Save records batch_size at a time; returns how many were saved."""
+    batch = []
+    total = 0
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            lb.add_scores(batch)
+            total += len(batch)
+            batch = []
+            if progress:
+                progress(total)
+    if batch:
+        lb.add_scores(batch)
+        total += len(batch)
+    return total
+
+
+def iter_records(games=None, window="all"):
+    """Yield (game_name, entry) for every kept score, best first per game."""
+    # the overall board is rebuilt from the games' scores on import
+    games = games or [g for g in lb.get_all_games() if g != lb.OVERALL]
+    for game_name in games:
+        for entry in lb.iter_scores(game_name, window=window):
+            yield game_name, entry
+
+
+def write_records(stream, records, fmt="ndjson"):
+    """Write records to stream; returns how many were written."""
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(stream)
+        writer.writerow(CSV_FIELDS)
+        for game_name, e in records:
+            extra = json.dumps(dict(e["extra"])) if e["extra"] else ""
+            writer.writerow([game_name, e["player"], e["score"], e["time"], extra])
+            count += 1
+    elif fmt == "ndjson":
+        for game_name, e in records:
+            line = {"game": game_name, "player": e["player"], "score": e["score"],
+                    "time": e["time"], "extra": dict(e["extra"])}
+            stream.write(json.dumps(line) + "\n")
+            count += 1
+    else:
+        raise ValueError(f"unknown format: {fmt!r}")
+    return count
+
+
+def _open(path, mode):
+    if path in (None, "-"):
+        return sys.stdin if "r" in mode else sys.stdout
+    return open(path, mode, encoding="utf-8", newline="" if path.lower().endswith(".csv") else None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Leaderboard bulk import / export")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    imp = sub.add_parser("import", help="add scores from a file (or - for stdin)")
+    imp.add_argument("path")
+    imp.add_argument("--format", choices=FORMATS)
+    imp.add_argument("--game", help="game for every record, overrides the file")
+    imp.add_argument("--batch", type=int, default=BATCH_SIZE, help="records per write")
+
+    exp = sub.add_parser("export", help="write the kept scores")
+    exp.add_argument("--game", action="append", help="only this game (repeatable)")
+    exp.add_argument("--window", default="all", choices=["all", *lb.WINDOWS])
+    exp.add_argument("--format", choices=FORMATS)
+    exp.add_argument("-o", "--output", help="file to write, stdout if left out")
+
+    args = parser.parse_args(argv)
+    if args.command == "import":
+        fmt = args.format or guess_format(args.path)
+        stream = _open(args.path, "r")
+        try:
+            count = import_records(
+                read_records(stream, fmt, args.game), args.batch,
+                progress=lambda n: print(f"\r{n} imported", end="", file=sys.stderr),
+            )
+        except ValueError as exc:
+            print(f"\nimport stopped: {exc}", file=sys.stderr)
+            return 1
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        lb.flush()
+        print(f"\r{count} imported", file=sys.stderr)
+    else:
+        fmt = args.format or guess_format(args.output)
+        stream = _open(args.output, "w")
+        try:
+            count = write_records(stream, iter_records(args.game, args.window), fmt)
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+        print(f"{count} exported", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,149 +1,347 @@
 import tkinter as tk
+import tkinter.font as tkfont
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk, messagebox
 import leaderboard_core as lb
+from game_window import GameWindow, main
 
-root = tk.Tk()
-root.title("Leaderboards")
-root.configure(bg="#1e1e2f")
-
-title_label = tk.Label(
-    root,
-    text="Leaderboards",
-    font=("Arial", 18, "bold"),
-    bg="#1e1e2f",
-    fg="#f8f8f2",
-)
-title_label.pack(pady=(10, 5), padx=10)
-
-# Dropdown for games
-games_frame = tk.Frame(root, bg="#1e1e2f")
-games_frame.pack(pady=(5, 5), padx=10, fill="x")
-
-tk.Label(
-    games_frame,
-    text="Select game:",
-    font=("Arial", 12),
-    bg="#1e1e2f",
-    fg="#f8f8f2",
-).pack(side="left", padx=(0, 8))
-
-game_var = tk.StringVar()
-game_combo = ttk.Combobox(
-    games_frame,
-    textvariable=game_var,
-    state="readonly",
-    width=25,
-)
-game_combo.pack(side="left", padx=(0, 8))
-
-def refresh_game_list():
-    games = lb.get_all_games()
-    if not games:
-        games = ["(no scores yet)"]
-    game_combo["values"] = games
-    if games:
-        game_var.set(games[0])
-
-refresh_game_list()
-
-# Frame for leaderboard list
-list_frame = tk.Frame(root, bg="#1e1e2f")
-list_frame.pack(padx=10, pady=(5, 10), fill="both", expand=True)
-
-listbox = tk.Listbox(
-    list_frame,
-    font=("Consolas", 11),
-    bg="#25253a",
-    fg="#f8f8f2",
-    width=60,
-    height=12,
-    selectbackground="#44475a",
-    borderwidth=0,
-    highlightthickness=0,
-)
-listbox.pack(side="left", fill="both", expand=True)
-
-scrollbar = tk.Scrollbar(list_frame)
-scrollbar.pack(side="right", fill="y")
-
-listbox.config(yscrollcommand=scrollbar.set)
-scrollbar.config(command=listbox.yview)
-
-def show_leaderboard():
-    game = game_var.get()
-    if not game or game == "(no scores yet)":
-        messagebox.showinfo("No scores", "No scores available yet.")
-        return
-
-    entries = lb.get_leaderboard(game, limit=20)
-    listbox.delete(0, tk.END)
-
-    if not entries:
-        listbox.insert(tk.END, "No scores for this game yet.")
-        return
-
-    for i, e in enumerate(entries, start=1):
-        extra_str = ""
-        if e.get("extra"):
-            parts = []
-            for k, v in e["extra"].items():
-                parts.append(f"{k}={v}")
-                if len(parts) >= 2:
-                    break
-            if parts:
-                extra_str = " | " + ", ".join(parts)
-
-        line = f"{i:2}. {e['player']:<12}  score={e['score']:<6}  {e['time']}{extra_str}"
-        listbox.insert(tk.END, line)
-
-btn_frame = tk.Frame(root, bg="#1e1e2f")
-btn_frame.pack(pady=(0, 10))
-
-btn_refresh = tk.Button(
-    btn_frame,
-    text="Refresh Games",
-    font=("Arial", 10, "bold"),
-    bg="#6272a4",
-    fg="#f8f8f2",
-    bd=0,
-    padx=10,
-    pady=4,
-    command=refresh_game_list,
-)
-btn_refresh.pack(side="left", padx=5)
-
-btn_show = tk.Button(
-    btn_frame,
-    text="Show Leaderboard",
-    font=("Arial", 10, "bold"),
-    bg="#50fa7b",
-    fg="#1e1e2f",
-    bd=0,
-    padx=10,
-    pady=4,
-    command=show_leaderboard,
-)
-btn_show.pack(side="left", padx=5)
-
-btn_close = tk.Button(
-    btn_frame,
-    text="Close",
-    font=("Arial", 10, "bold"),
-    bg="#ff5555",
-    fg="#1e1e2f",
-    bd=0,
-    padx=10,
-    pady=4,
-    command=root.destroy,
-)
-btn_close.pack(side="left", padx=5)
-
-# Center window
-sw = root.winfo_screenwidth()
-sh = root.winfo_screenheight()
-ww, wh = 700, 400
-x = int(sw / 2 - ww / 2)
-y = int(sh / 2 - wh / 2)
-root.geometry(f"{ww}x{wh}+{x}+{y}")
-
-root.mainloop()
+# while no leaderboard server pushes updates, re-read the visible rows this often
+POLL_MS = 2000
+
+# every lb call runs here, one at a time, so the window never waits on the
+# store; shared by all leaderboard windows of the process
+loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="leaderboard-loader")
+
+
+def format_stats(stats):
+    if not stats["count"]:
+        return ""
+    return (
+        f"{stats['count']} runs | mean {stats['mean']:.1f} | "
+        f"median {stats['p50']:g} | top 10% from {stats['p90']:g} | "
+        f"top 1% from {stats['p99']:g}"
+    )
+
+
+def format_entry(game, rank, e):
+    if game == lb.OVERALL:
+        # extra holds the points per game
+        games = ", ".join(f"{g}={p:g}" for g, p in e["extra"].items())
+        return f"{rank:2}. {e['player']:<12}  points={e['score']:<6g}  {games}"
+
+    extra_str = ""
+    if e.get("extra"):
+        parts = []
+        for k, v in e["extra"].items():
+            parts.append(f"{k}={v}")
+            if len(parts) >= 2:
+                break
+        if parts:
+            extra_str = " | " + ", ".join(parts)
+
+    beaten = lb.get_percentile(game, e["score"])
+    beat_str = f"  beat {beaten * 100:.0f}% of runs" if beaten is not None else ""
+    return f"{rank:2}. {e['player']:<12}  score={e['score']:<6}  {e['time']}{beat_str}{extra_str}"
+
+
+def fetch_page(game, offset, rows):
+    # loader thread: no Tk calls in here
+    total = lb.get_count(game)
+    offset = max(0, min(offset, total - rows))
+    entries = lb.get_page(game, offset, rows)
+    lines = [format_entry(game, offset + i, e) for i, e in enumerate(entries, start=1)]
+    return game, total, offset, lines, format_stats(lb.get_stats(game))
+
+
+class LeaderboardMenu(GameWindow):
+    title = "Leaderboards"
+
+    def __init__(self, window):
+        super().__init__(window)
+        root = self.root
+        root.configure(bg="#1e1e2f")
+
+        title_label = tk.Label(
+            root,
+            text="Leaderboards",
+            font=("Arial", 18, "bold"),
+            bg="#1e1e2f",
+            fg="#f8f8f2",
+        )
+        title_label.pack(pady=(10, 5), padx=10)
+
+        # Dropdown for games
+        games_frame = tk.Frame(root, bg="#1e1e2f")
+        games_frame.pack(pady=(5, 5), padx=10, fill="x")
+
+        tk.Label(
+            games_frame,
+            text="Select game:",
+            font=("Arial", 12),
+            bg="#1e1e2f",
+            fg="#f8f8f2",
+        ).pack(side="left", padx=(0, 8))
+
+        self.game_var = tk.StringVar(root)
+        self.game_combo = ttk.Combobox(
+            games_frame,
+            textvariable=self.game_var,
+            state="readonly",
+            width=25,
+        )
+        self.game_combo.pack(side="left", padx=(0, 8))
+
+        # Frame for leaderboard list
+        list_frame = tk.Frame(root, bg="#1e1e2f")
+        list_frame.pack(padx=10, pady=(5, 10), fill="both", expand=True)
+
+        # the Listbox only ever holds the rows on screen; the scrollbar is
+        # driven by hand over the whole board
+        self.listbox = tk.Listbox(
+            list_frame,
+            font=("Consolas", 11),
+            bg="#25253a",
+            fg="#f8f8f2",
+            width=60,
+            height=12,
+            selectbackground="#44475a",
+            borderwidth=0,
+            highlightthickness=0,
+        )
+        self.listbox.pack(side="left", fill="both", expand=True)
+
+        self.scrollbar = tk.Scrollbar(list_frame)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.row_height = tkfont.Font(root, font=self.listbox["font"]).metrics("linespace") + 1
+
+        # what is on screen: board, first rank shown (0-based), rows that fit
+        # and the board size; at most one page is loading at a time,
+        # scrolling during the load marks it `dirty` and the latest position
+        # is fetched next
+        self.view = {"game": None, "offset": 0, "rows": 12, "total": 0, "loading": False, "dirty": False}
+
+        # distribution of every run of the game, not only the ones listed
+        self.stats_label = tk.Label(
+            root,
+            text="",
+            font=("Arial", 10),
+            bg="#1e1e2f",
+            fg="#8be9fd",
+        )
+        self.stats_label.pack(padx=10, pady=(0, 5))
+
+        self.scrollbar.config(command=self.on_scrollbar)
+        self.listbox.bind("<MouseWheel>", self.on_wheel)
+        self.listbox.bind("<Button-4>", self.on_wheel)
+        self.listbox.bind("<Button-5>", self.on_wheel)
+        self.listbox.bind("<Configure>", self.on_resize)
+        self.game_combo.bind("<<ComboboxSelected>>", lambda event: self.show_leaderboard())
+
+        # pushed updates when leaderboard_server.py is running, None otherwise
+        self.stop_updates = lb.subscribe(self.on_scores_saved)
+        if self.stop_updates is None:
+            self.after(POLL_MS, self.poll)
+        else:
+            root.bind("<Destroy>", self.on_close, add="+")
+
+        btn_frame = tk.Frame(root, bg="#1e1e2f")
+        btn_frame.pack(pady=(0, 10))
+
+        btn_refresh = tk.Button(
+            btn_frame,
+            text="Refresh Games",
+            font=("Arial", 10, "bold"),
+            bg="#6272a4",
+            fg="#f8f8f2",
+            bd=0,
+            padx=10,
+            pady=4,
+            command=self.refresh_game_list,
+        )
+        btn_refresh.pack(side="left", padx=5)
+
+        btn_show = tk.Button(
+            btn_frame,
+            text="Show Leaderboard",
+            font=("Arial", 10, "bold"),
+            bg="#50fa7b",
+            fg="#1e1e2f",
+            bd=0,
+            padx=10,
+            pady=4,
+            command=self.show_leaderboard,
+        )
+        btn_show.pack(side="left", padx=5)
+
+        btn_close = tk.Button(
+            btn_frame,
+            text="Close",
+            font=("Arial", 10, "bold"),
+            bg="#ff5555",
+            fg="#1e1e2f",
+            bd=0,
+            padx=10,
+            pady=4,
+            command=root.destroy,
+        )
+        btn_close.pack(side="left", padx=5)
+
+        self.center(700, 400)
+        self.refresh_game_list()
+
+    def run_in_background(self, fn, *args, done):
+        """fn(*args) on the loader thread, then done(result_or_exception) on the Tk thread."""
+        def finished(future):
+            exc = future.exception()
+            try:
+                self.after(0, done, exc if exc is not None else future.result())
+            except (RuntimeError, tk.TclError):
+                # the window (or the whole app) was closed meanwhile
+                pass
+
+        loader.submit(fn, *args).add_done_callback(finished)
+
+    def set_games(self, games, select_first):
+        if isinstance(games, Exception):
+            return
+        if lb.OVERALL in games:
+            # the cross-game ranking goes first
+            games = [lb.OVERALL] + [g for g in games if g != lb.OVERALL]
+        self.game_combo["values"] = games or ["(no scores yet)"]
+        # the "(no scores yet)" placeholder gives way to the first game played
+        if select_first or self.game_var.get() not in games:
+            self.game_var.set(games[0] if games else "(no scores yet)")
+            if games:
+                self.show_leaderboard()
+
+    def refresh_game_list(self, select_first=True):
+        self.run_in_background(
+            lb.get_all_games, done=lambda games: self.set_games(games, select_first)
+        )
+
+    def load_visible(self):
+        """Fetch the rows currently on screen, in the background."""
+        view = self.view
+        if not view["game"]:
+            return
+        if view["loading"]:
+            view["dirty"] = True
+            return
+        view["loading"] = True
+        self.run_in_background(fetch_page, view["game"], view["offset"], view["rows"], done=self.show_page)
+
+    def show_page(self, result):
+        view = self.view
+        view["loading"] = False
+        if view["dirty"]:
+            view["dirty"] = False
+            self.load_visible()
+        if isinstance(result, Exception):
+            self.set_rows([f"Could not load scores: {result}"])
+            return
+        game, total, offset, lines, stats_text = result
+        if game != view["game"]:
+            return
+        if view["loading"] and offset != view["offset"]:
+            # already fetching where the user scrolled to, keep the scrollbar there
+            self.set_rows(lines)
+            return
+        view["total"], view["offset"] = total, offset
+        self.set_rows(lines or ["No scores for this game yet."])
+        self.update_scrollbar()
+        self.stats_label.config(text=stats_text)
+
+    def set_rows(self, lines):
+        # touch only the rows that changed, so a refresh does not flicker
+        listbox = self.listbox
+        for i, line in enumerate(lines):
+            if i < listbox.size():
+                if listbox.get(i) == line:
+                    continue
+                listbox.delete(i)
+            listbox.insert(i, line)
+        if listbox.size() > len(lines):
+            listbox.delete(len(lines), tk.END)
+
+    def update_scrollbar(self):
+        view = self.view
+        total = view["total"]
+        if total <= view["rows"]:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(view["offset"] / total, (view["offset"] + view["rows"]) / total)
+
+    def scroll_to(self, offset):
+        view = self.view
+        offset = max(0, min(int(offset), view["total"] - view["rows"]))
+        if offset != view["offset"]:
+            view["offset"] = offset
+            self.update_scrollbar()
+            self.load_visible()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        view = self.view
+        if action == "moveto":
+            self.scroll_to(float(amount) * view["total"])
+        elif unit == "pages":
+            self.scroll_to(view["offset"] + int(amount) * view["rows"])
+        else:
+            self.scroll_to(view["offset"] + int(amount))
+
+    def on_wheel(self, event):
+        if getattr(event, "num", None) == 4 or event.delta > 0:
+            self.scroll_to(self.view["offset"] - 3)
+        else:
+            self.scroll_to(self.view["offset"] + 3)
+        return "break"
+
+    def on_resize(self, event):
+        rows = max(1, event.height // self.row_height)
+        if rows != self.view["rows"]:
+            self.view["rows"] = rows
+            self.load_visible()
+
+    def show_leaderboard(self):
+        game = self.game_var.get()
+        if not game or game == "(no scores yet)":
+            messagebox.showinfo("No scores", "No scores available yet.", parent=self.root)
+            return
+
+        view = self.view
+        if game != view["game"]:
+            view["game"], view["offset"], view["total"] = game, 0, 0
+            self.listbox.delete(0, tk.END)
+            self.stats_label.config(text="")
+        self.load_visible()
+
+    def apply_update(self, event):
+        self.refresh_game_list(select_first=False)
+        # only reload a leaderboard that is already on screen; every score
+        # can move the overall ranking
+        game = self.view["game"]
+        if game == lb.OVERALL or game in event.get("games", ()):
+            self.load_visible()
+
+    def on_scores_saved(self, event):
+        # runs on the subscriber thread, Tk work goes back to the main loop
+        try:
+            self.after(0, self.apply_update, event)
+        except (RuntimeError, tk.TclError):
+            pass
+
+    def on_close(self, event):
+        if event.widget is self.root and self.stop_updates is not None:
+            self.stop_updates()
+            self.stop_updates = None
+
+    def poll(self):
+        # without a server nobody tells us about new scores; re-reading the
+        # game list and the visible rows is cheap while the store is unchanged
+        self.refresh_game_list(select_first=False)
+        self.load_visible()
+        self.after(POLL_MS, self.poll)
+
+
+if __name__ == "__main__":
+    main(LeaderboardMenu)
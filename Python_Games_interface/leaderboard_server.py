@@ -0,0 +1,149 @@
+# leaderboard_server.py
+# Optional leaderboard daemon. While it runs, every game process talks to it
+# instead of opening the score store itself, so the store is opened once and
+# every board, once read, stays in memory here.
+#
+#   python leaderboard_server.py
+#   python leaderboard_server.py --address unix:/tmp/leaderboard.sock
+#
+# Games find it through LEADERBOARD_SERVER (default 127.0.0.1:47800) and
+# fall back to the local store when nothing is listening.
+import argparse
+import asyncio
+import json
+import os
+import socket
+
+import leaderboard_client as lb_client
+import leaderboard_core as lb
+
+# scores arriving within this window are saved in one write
+BATCH_WINDOW_S = 0.05
+
+
+def _encode(message):
+    # MappingProxyType entries from leaderboard_core become plain objects
+    return json.dumps(message, default=dict).encode("utf-8") + b"\n"
+
+
+class LeaderboardServer:
+    def __init__(self, batch_window=BATCH_WINDOW_S):
+        self.batch_window = batch_window
+        self.pending = []
+        self.subscribers = set()
+        self.wakeup = asyncio.Event()
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.endswith(b"\n"):
+                    # closed, possibly halfway through a request
+                    break
+                request = json.loads(line)
+                if request["op"] == "subscribe":
+                    self.subscribers.add(writer)
+                    continue
+                try:
+                    if request["op"] == "add":
+                        result = await self.add(request["args"][0])
+                    else:
+                        # a board read from disk for the first time must not
+                        # hold up the other clients
+                        result = await asyncio.get_running_loop().run_in_executor(
+                            None, lb._LOCAL_OPS[request["op"]], *request["args"]
+                        )
+                    reply = {"ok": True, "result": result}
+                except Exception as exc:
+                    reply = {"ok": False, "error": type(exc).__name__, "message": str(exc)}
+                writer.write(_encode(reply))
+                await writer.drain()
+        except (ConnectionError, json.JSONDecodeError):
+            pass
+        finally:
+            self.subscribers.discard(writer)
+            writer.close()
+
+    async def add(self, records):
+        """Queue scores for the next batch; returns once they are saved."""
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((records, future))
+        self.wakeup.set()
+        await future
+        return None
+
+    async def save_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.wakeup.wait()
+            await asyncio.sleep(self.batch_window)
+            self.wakeup.clear()
+            batch, self.pending = self.pending, []
+            records = [tuple(r) for records, _ in batch for r in records]
+            try:
+                await loop.run_in_executor(None, lb._local_write, records)
+            except Exception:
+                # a bad record must only fail the request that sent it
+                batch = await self.save_each(batch)
+            else:
+                for _, future in batch:
+                    future.set_result(None)
+            if batch:
+                games = {r[0] for records, _ in batch for r in records}
+                self.publish({"event": "scores", "games": sorted(games)})
+
+    async def save_each(self, batch):
+        """Save the requests of a failed batch one by one; returns the saved ones."""
+        loop = asyncio.get_running_loop()
+        saved = []
+        for records, future in batch:
+            try:
+                await loop.run_in_executor(None, lb._local_write, [tuple(r) for r in records])
+            except Exception as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(None)
+                saved.append((records, future))
+        return saved
+
+    def publish(self, event):
+        data = _encode(event)
+        for writer in list(self.subscribers):
+            if writer.is_closing():
+                self.subscribers.discard(writer)
+            else:
+                writer.write(data)
+
+
+async def serve(address):
+    server = LeaderboardServer()
+    family, sockaddr = lb_client.parse_address(address)
+    if family == socket.AF_UNIX:
+        if os.path.exists(sockaddr):
+            os.remove(sockaddr)
+        listener = await asyncio.start_unix_server(server.handle, path=sockaddr)
+    else:
+        host, port = sockaddr
+        listener = await asyncio.start_server(server.handle, host, port)
+    # open the store (migrating or reindexing it if needed) before the
+    # first client waits on it
+    lb.get_all_games()
+    print(f"leaderboard server listening on {address}", flush=True)
+    async with listener:
+        await asyncio.gather(listener.serve_forever(), server.save_batches())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Leaderboard server")
+    parser.add_argument("--address", default=lb.SERVER_ADDRESS or lb_client.DEFAULT_ADDRESS)
+    args = parser.parse_args()
+    # this process is the server, it must use the store directly
+    lb.SERVER_ADDRESS = None
+    try:
+        asyncio.run(serve(args.address))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# leaderboard_sketch.py
+# Approximate score distribution of a board, kept in bounded memory no
+# matter how many scores were submitted.
+import math
+import random
+from bisect import bisect_left
+from itertools import accumulate
+
+
+class KllSketch:
+    """KLL quantile sketch (Karnin, Lang, Liberty 2016).
+
+    Values go into level 0; when the sketch holds more than its capacity
+    the lowest full level is sorted and every other value, starting at a
+    random offset, moves one level up with twice the weight. With k=200
+    quantiles are off by about 1% of the count, using a few hundred stored
+    values. Count, sum, min and max are exact. Sketches of the same k can
+    be merged, e.g. two stores of the same game.
+    """
+
+    C = 2 / 3
+
+    def __init__(self, k=200):
+        self.k = k
+        self.levels = [[]]
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._size = 0
+        self._capacity = self._capacity_of()
+
+    def _level_capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, math.ceil(self.k * self.C ** depth))
+
+    def _capacity_of(self):
+        return sum(self._level_capacity(h) for h in range(len(self.levels)))
+
+    def __len__(self):
+        return self.count
+
+    def update(self, value):
+        self.levels[0].append(value)
+        self._size += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if self._size > self._capacity:
+            self._compress()
+
+    def _compress(self):
+        while self._size > self._capacity:
+            for level, items in enumerate(self.levels):
+                if len(items) >= self._level_capacity(level):
+                    break
+            if level + 1 == len(self.levels):
+                self.levels.append([])
+                self._capacity = self._capacity_of()
+            items.sort()
+            # an odd value out stays behind
+            keep = [items.pop()] if len(items) % 2 else []
+            promoted = items[random.getrandbits(1)::2]
+            self.levels[level + 1].extend(promoted)
+            self._size -= len(items) - len(promoted)
+            self.levels[level] = keep
+
+    def merge(self, other):
+        """Add everything other has seen to this sketch."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+            self._size += len(items)
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+        self._capacity = self._capacity_of()
+        self._compress()
+
+    def copy(self):
+        return KllSketch.from_dict(self.to_dict())
+
+    def _weighted(self):
+        pairs = [(v, 1 << level) for level, items in enumerate(self.levels) for v in items]
+        pairs.sort()
+        return pairs
+
+    def _weight_where(self, test):
+        # no sorting needed, every stored value stands for 2**level scores
+        return sum(
+            sum(1 for v in items if test(v)) << level
+            for level, items in enumerate(self.levels)
+        )
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q):
+        """Approximate value below which a fraction q of the scores fall."""
+        if not self.count:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        pairs = self._weighted()
+        stored = sum(w for _, w in pairs)
+        target = q * stored
+        seen = 0
+        for value, weight in pairs:
+            seen += weight
+            if seen >= target:
+                return value
+        return self.max
+
+    def fraction_below(self, value):
+        """Approximate fraction of the scores strictly lower than value."""
+        if not self.count:
+            return None
+        return self._weight_where(lambda v: v < value) / self.count
+
+    def fractions_below(self, values):
+        """fraction_below() of each of values, sorting the stored values once."""
+        if not self.count:
+            return [None] * len(values)
+        pairs = self._weighted()
+        stored = [v for v, _ in pairs]
+        weight_before = [0, *accumulate(w for _, w in pairs)]
+        return [weight_before[bisect_left(stored, v)] / self.count for v in values]
+
+    def fraction_at_most(self, value):
+        """Approximate fraction of the scores lower than or equal to value."""
+        if not self.count:
+            return None
+        return self._weight_where(lambda v: v <= value) / self.count
+
+    def histogram(self, bins=10):
+        """[(low, high, count), ...] over equal-width bins from min to max;
+        counts are estimates that add up to the exact count."""
+        if not self.count:
+            return []
+        if self.min == self.max:
+            return [(self.min, self.max, self.count)]
+        width = (self.max - self.min) / bins
+        pairs = self._weighted()
+        stored = sum(w for _, w in pairs)
+        weights = [0] * bins
+        for value, weight in pairs:
+            weights[min(bins - 1, int((value - self.min) / width))] += weight
+        out = []
+        given = 0
+        for i, weight in enumerate(weights):
+            if i == bins - 1:
+                count = self.count - given
+            else:
+                count = round(weight * self.count / stored)
+                given += count
+            out.append((self.min + i * width, self.min + (i + 1) * width, count))
+        return out
+
+    def to_dict(self):
+        return {
+            "k": self.k, "count": self.count, "total": self.total,
+            "min": self.min, "max": self.max, "levels": self.levels,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        sketch = cls(state["k"])
+        sketch.levels = [list(items) for items in state["levels"]] or [[]]
+        sketch.count = state["count"]
+        sketch.total = state["total"]
+        sketch.min = state["min"]
+        sketch.max = state["max"]
+        sketch._size = sum(len(items) for items in sketch.levels)
+        sketch._capacity = sketch._capacity_of()
+        return sketch
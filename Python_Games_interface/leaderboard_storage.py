@@ -0,0 +1,1143 @@
+# leaderboard_storage.py
+# Storage backends used by leaderboard_core. Boards are named by the core
+# (a game name, or e.g. "snake@day:2025-11-08"). Every backend keeps, per
+# board, (at least) the best `keep` entries ordered by score descending; on
+# equal scores the older entry ranks first (same as a stable sort of the
+# old scores.json). keep=None keeps everything.
+#
+# `ordering` maps a board name to its tie-break list, [(extra key, "asc" |
+# "desc"), ...], applied after the score (see leaderboard_index).
+# `per_player(board)` marks boards that hold one entry per player, the
+# newest one, and are never trimmed.
+#
+# Next to the kept entries every backend keeps a KllSketch per board of
+# all the scores ever added to it (see stats()).
+#
+# changes(cursor) is the change feed readers use to keep boards they hold
+# in memory up to date: the scores added since `cursor`, each with its
+# position in the store (SQLite row id, log offset), in the order they
+# were written. load_board() returns the cursor it was read at, so a
+# reader can skip the scores a board already had.
+#
+# iter_board(name) yields one board in rank order without building the
+# whole list where the format allows it (exports).
+import heapq
+import itertools
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import time
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+from leaderboard_index import make_sort_key, score_key
+from leaderboard_sketch import KllSketch
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class LockStats:
+    """How long callers waited for the store's cross-process lock."""
+
+    def __init__(self):
+        self.acquisitions = 0
+        self.wait_total_s = 0.0
+        self.wait_max_s = 0.0
+
+    def record(self, waited):
+        self.acquisitions += 1
+        self.wait_total_s += waited
+        self.wait_max_s = max(self.wait_max_s, waited)
+
+    def as_dict(self):
+        mean = self.wait_total_s / self.acquisitions if self.acquisitions else 0.0
+        return {
+            "acquisitions": self.acquisitions,
+            "wait_total_s": self.wait_total_s,
+            "wait_mean_s": mean,
+            "wait_max_s": self.wait_max_s,
+        }
+
+
+class FileLock:
+    """Advisory lock on a side file, shared between processes.
+
+    Every acquire opens its own descriptor, so threads of one process
+    exclude each other the same way separate processes do. Shared mode is
+    only honoured where flock exists; on Windows every lock is exclusive.
+    """
+
+    def __init__(self, path, stats=None):
+        self.path = path
+        self.stats = stats
+
+    def acquire(self, shared=False):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        start = time.perf_counter()
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            else:
+                while True:
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        # LK_LOCK gives up after ~10 seconds, keep waiting
+                        continue
+        except BaseException:
+            os.close(fd)
+            raise
+        if self.stats is not None:
+            self.stats.record(time.perf_counter() - start)
+        return fd
+
+    def release(self, fd):
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        os.close(fd)
+
+    def shared(self):
+        return _Held(self, shared=True)
+
+    def exclusive(self):
+        return _Held(self, shared=False)
+
+
+class _Held:
+    def __init__(self, lock, shared):
+        self.lock = lock
+        self.shared = shared
+        self.fd = None
+
+    def __enter__(self):
+        self.fd = self.lock.acquire(shared=self.shared)
+        return self
+
+    def __exit__(self, *exc):
+        self.lock.release(self.fd)
+
+
+def file_signature(*paths):
+    """(mtime_ns, size, inode) of every path, None for missing ones."""
+    sig = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            sig.append(None)
+        else:
+            sig.append((st.st_mtime_ns, st.st_size, st.st_ino))
+    return tuple(sig)
+
+
+def _by_board(records):
+    """{board: [entry, ...]} of change-feed records, in order."""
+    boards = {}
+    for _, name, entry in records:
+        boards.setdefault(name, []).append(entry)
+    return boards
+
+
+def _insert_sorted(entries, entry, keep, sort_key):
+    # goes after every entry ranked >= it, like append + stable sort
+    pos = bisect_right(entries, sort_key(entry), key=sort_key)
+    if keep is not None and pos >= keep:
+        return
+    entries.insert(pos, entry)
+    if keep is not None:
+        del entries[keep:]
+
+
+class JsonBackend:
+    """scores.json snapshot plus an append-only log of newer scores.
+
+    Writers hold an exclusive lock on <path>.lock, readers a shared one, so
+    several game processes can save scores at the same time. The score
+    sketches live in <path>.stats, rewritten on compaction; until then the
+    log is replayed into them.
+    """
+
+    # what a damaged snapshot raises while being read
+    _READ_ERRORS = (ValueError, OSError)
+
+    def __init__(self, path="scores.json", log_path="scores.log", keep=20,
+                 compact_log_bytes=64 * 1024, ordering=None, per_player=None):
+        self.path = path
+        self.log_path = log_path
+        self.keep = keep
+        self.ordering = ordering
+        self.per_player = per_player
+        self.compact_log_bytes = compact_log_bytes
+        self.lock_stats = LockStats()
+        self.lock = FileLock(path + ".lock", self.lock_stats)
+        self.stats_path = path + ".stats"
+        self._memo = None
+        self._stats_memo = None
+
+    def _load_snapshot(self, strict=False):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            # compaction must not overwrite a file it could not read
+            if strict:
+                raise
+            return {}
+
+    def _read_log(self, offset=0):
+        """([(position, board, entry), ...], end) of the log lines past byte
+        `offset`, in the order they were written. A line's position is the
+        offset it ends at; end is where the last whole line ends. None if
+        the log is shorter than offset, i.e. it was started afresh."""
+        try:
+            with open(self.log_path, "rb") as f:
+                if os.fstat(f.fileno()).st_size < offset:
+                    return None
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return ([], 0) if offset == 0 else None
+        except OSError:
+            return [], offset
+        # a last line without its newline is still being written, or was
+        # cut short by a crash; it is read once the line is complete
+        whole = data.rfind(b"\n") + 1
+        records = []
+        position = offset
+        for line in data[:whole].splitlines(keepends=True):
+            position += len(line)
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # a half-written line from a crashed game
+                continue
+            records.append((position, record["game"], record["entry"]))
+        return records, offset + whole
+
+    def _merge(self, name, entries, logged):
+        sort_key = self._sort_key(name)
+        if self.per_player and self.per_player(name):
+            for entry in logged:
+                entries[:] = [e for e in entries if e["player"] != entry["player"]]
+                _insert_sorted(entries, entry, None, sort_key)
+            return entries
+        for entry in logged:
+            _insert_sorted(entries, entry, self.keep, sort_key)
+        return entries
+
+    def _replay_log(self, data, records):
+        for name, logged in _by_board(records).items():
+            self._merge(name, data.setdefault(name, []), logged)
+
+    def _sort_key(self, name):
+        tie_breaks = self.ordering(name) if self.ordering else ()
+        return make_sort_key(tie_breaks) if tie_breaks else score_key
+
+    def _load_data(self, strict=False):
+        data = self._load_snapshot(strict)
+        self._replay_log(data, self._read_log()[0])
+        return data
+
+    def _save_data(self, data):
+        # write a temp file and rename it over the old one, so readers see
+        # either the old or the new snapshot and never a torn one
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def _append_log(self, records):
+        lines = "".join(
+            json.dumps({"game": game_name, "entry": entry}) + "\n"
+            for game_name, entry in records
+        )
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(lines)
+            return f.tell()
+
+    def add(self, records):
+        """records: list of (game_name, entry) in submission order.
+
+        Returns the store signature from just before and just after the
+        write, so a caller can tell whether anyone else wrote in between.
+        """
+        with self.lock.exclusive():
+            before = self.signature()
+            log_size = self._append_log(records)
+            if log_size >= self.compact_log_bytes:
+                self._compact()
+            return before, self.signature()
+
+    def _load_stats(self, logged=None):
+        """{board: KllSketch} from the stats file plus the log records
+        `logged` (default: the whole log). Lock held."""
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                sketches = {
+                    name: KllSketch.from_dict(state) for name, state in json.load(f).items()
+                }
+        except FileNotFoundError:
+            # store from before sketches were kept: start from its entries
+            sketches = {}
+            for name, entries in self._load_snapshot().items():
+                sketch = sketches[name] = KllSketch()
+                for entry in entries:
+                    sketch.update(entry["score"])
+        except (ValueError, KeyError, OSError):
+            sketches = {}
+        self._replay_stats(sketches, self._read_log()[0] if logged is None else logged)
+        return sketches
+
+    @staticmethod
+    def _replay_stats(sketches, records):
+        for _, name, entry in records:
+            sketches.setdefault(name, KllSketch()).update(entry["score"])
+
+    def _save_stats(self, sketches):
+        tmp_path = f"{self.stats_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({name: s.to_dict() for name, s in sketches.items()}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.stats_path)
+
+    def _compact(self):
+        try:
+            data = self._load_data(strict=True)
+        except self._READ_ERRORS:
+            return
+        # sketches first: while the old snapshot is in place a missing
+        # stats file would be rebuilt from it
+        self._save_stats(self._load_stats())
+        self._save_data(data)
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+
+    def compact(self):
+        """Merge the append log into the snapshot and start a fresh log."""
+        with self.lock.exclusive():
+            self._compact()
+
+    def drop(self, names):
+        """Delete whole boards. Returns the signatures around the write."""
+        with self.lock.exclusive():
+            before = self.signature()
+            try:
+                data = self._load_data(strict=True)
+            except self._READ_ERRORS:
+                return before, before
+            sketches = self._load_stats()
+            for name in names:
+                data.pop(name, None)
+                sketches.pop(name, None)
+            self._save_stats(sketches)
+            self._save_data(data)
+            if os.path.exists(self.log_path):
+                os.remove(self.log_path)
+            return before, self.signature()
+
+    def stats(self, name):
+        """(signature, KllSketch of every score added to the board)."""
+        with self.lock.shared():
+            signature, _, sketches = self._current_stats()
+            sketch = sketches.get(name)
+            return signature, sketch.copy() if sketch else KllSketch()
+
+    def all_stats(self):
+        with self.lock.shared():
+            return self._load_stats()
+
+    def signature(self):
+        """Changes whenever the snapshot or the log is written."""
+        return file_signature(self.path, self.log_path)
+
+    def changes(self, cursor):
+        """(signature, cursor, records): the scores logged since cursor, as
+        (position, board, entry). records is None when the snapshot was
+        rewritten since (compaction, dropped boards) and the scores in
+        between cannot be told apart; the caller reloads what it holds."""
+        with self.lock.shared():
+            signature = self.signature()
+            snap = file_signature(self.path)
+            if cursor is not None and cursor[0] == snap:
+                tail = self._read_log(cursor[1])
+                if tail is not None:
+                    return signature, (snap, tail[1]), tail[0]
+            return signature, (snap, self._read_log()[1]), None
+
+    def _current_stats(self):
+        # (signature, cursor, {board: KllSketch}), same rules as _current
+        signature = self.signature()
+        memo = self._stats_memo
+        if memo is not None and memo[0] == signature:
+            return memo
+        snap = file_signature(self.path)
+        tail = None
+        if memo is not None and memo[1][0] == snap:
+            sketches = memo[2]
+            tail = self._read_log(memo[1][1])
+            if tail is not None:
+                self._replay_stats(sketches, tail[0])
+        if tail is None:
+            tail = self._read_log()
+            sketches = self._load_stats(tail[0])
+        self._stats_memo = (signature, (snap, tail[1]), sketches)
+        return self._stats_memo
+
+    def _current(self):
+        # (signature, cursor, parsed store), reused while the files stay
+        # the same and caught up from the log while only the log grew; lock
+        # held
+        signature = self.signature()
+        memo = self._memo
+        if memo is not None and memo[0] == signature:
+            return memo
+        snap = file_signature(self.path)
+        tail = None
+        if memo is not None and memo[1][0] == snap:
+            data = memo[2]
+            tail = self._read_log(memo[1][1])
+        if tail is None:
+            data = self._load_snapshot()
+            tail = self._read_log()
+        records, end = tail
+        self._replay_log(data, records)
+        self._memo = (signature, (snap, end), data)
+        return self._memo
+
+    def snapshot(self):
+        """(signature, data) read together under the lock."""
+        with self.lock.shared():
+            signature, _, data = self._current()
+            return signature, {name: list(entries) for name, entries in data.items()}
+
+    def load_board(self, name):
+        """(signature, cursor, ranked entries of one board)."""
+        with self.lock.shared():
+            signature, cursor, data = self._current()
+            return signature, cursor, list(data.get(name, ()))
+
+    def page(self, name, offset, limit):
+        """Entries ranked offset+1 .. offset+limit of one board."""
+        with self.lock.shared():
+            return self._current()[2].get(name, [])[offset:offset + limit]
+
+    def iter_board(self, name):
+        """Entries of one board in rank order. The whole file is parsed
+        anyway, so this only hands out the parsed list."""
+        with self.lock.shared():
+            entries = list(self._current()[2].get(name, ()))
+        yield from entries
+
+    def count(self, name):
+        """Number of entries on one board."""
+        with self.lock.shared():
+            return len(self._current()[2].get(name, ()))
+
+    def board_names(self):
+        """(signature, names of the boards that have entries)."""
+        with self.lock.shared():
+            signature, _, data = self._current()
+            return signature, [name for name, entries in data.items() if entries]
+
+    def dump(self):
+        return self.snapshot()[1]
+
+    def top(self, game_name, limit):
+        return self.page(game_name, 0, limit)
+
+    def games(self):
+        return self.board_names()[1]
+
+    def close(self):
+        pass
+
+
+# Binary snapshot layout (all integers little-endian):
+#   header   "LBIN", u16 version, u32 board count
+#   table    per board: u16 name length, name, u64 offset, u64 length,
+#            u32 entries
+#   sections per board, its entries in rank order:
+#            u8 flags (1: float score, 2: time kept as text),
+#            score (i64 or f64), time (i64 seconds since 1970-01-01 local
+#            time, or u16 length + text), u16 length + player,
+#            u32 length + compact JSON of extra (0 for {})
+BIN_MAGIC = b"LBIN"
+BIN_VERSION = 1
+_BIN_HEADER = struct.Struct("<4sHI")
+_BIN_TABLE_ROW = struct.Struct("<QQI")
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _pack_str(text, width="H"):
+    raw = text.encode("utf-8")
+    return struct.pack("<" + width, len(raw)) + raw
+
+
+def _encode_entry(entry):
+    flags = 0
+    score = entry["score"]
+    if isinstance(score, float):
+        flags |= 1
+        parts = [struct.pack("<d", score)]
+    else:
+        parts = [struct.pack("<q", score)]
+    try:
+        when = datetime.fromisoformat(entry["time"])
+        seconds = (when - _EPOCH) // timedelta(seconds=1)
+        exact = (_EPOCH + timedelta(seconds=seconds)).isoformat(timespec="seconds") == entry["time"]
+    except (TypeError, ValueError):
+        exact = False
+    if exact:
+        parts.append(struct.pack("<q", seconds))
+    else:
+        flags |= 2
+        parts.append(_pack_str(str(entry["time"])))
+    parts.append(_pack_str(entry["player"]))
+    extra = json.dumps(entry["extra"], separators=(",", ":")) if entry["extra"] else ""
+    parts.append(_pack_str(extra, "I"))
+    return bytes([flags]) + b"".join(parts)
+
+
+def _decode_section(buf, count):
+    return list(_iter_section(buf, count))
+
+
+def _iter_section(buf, count):
+    pos = 0
+    for _ in range(count):
+        flags = buf[pos]
+        pos += 1
+        (score,) = struct.unpack_from("<d" if flags & 1 else "<q", buf, pos)
+        pos += 8
+        if flags & 2:
+            (n,) = struct.unpack_from("<H", buf, pos)
+            when = bytes(buf[pos + 2:pos + 2 + n]).decode("utf-8")
+            pos += 2 + n
+        else:
+            (seconds,) = struct.unpack_from("<q", buf, pos)
+            when = (_EPOCH + timedelta(seconds=seconds)).isoformat(timespec="seconds")
+            pos += 8
+        (n,) = struct.unpack_from("<H", buf, pos)
+        player = bytes(buf[pos + 2:pos + 2 + n]).decode("utf-8")
+        pos += 2 + n
+        (n,) = struct.unpack_from("<I", buf, pos)
+        extra = json.loads(bytes(buf[pos + 4:pos + 4 + n])) if n else {}
+        pos += 4 + n
+        yield {"player": player, "score": score, "extra": extra, "time": when}
+
+
+def _read_table(buf):
+    """{board: (offset, length, entries)} from the start of a binary file."""
+    magic, version, count = _BIN_HEADER.unpack_from(buf, 0)
+    if magic != BIN_MAGIC or version != BIN_VERSION:
+        raise ValueError("not a leaderboard binary file")
+    table = {}
+    pos = _BIN_HEADER.size
+    for _ in range(count):
+        (n,) = struct.unpack_from("<H", buf, pos)
+        name = bytes(buf[pos + 2:pos + 2 + n]).decode("utf-8")
+        pos += 2 + n
+        table[name] = _BIN_TABLE_ROW.unpack_from(buf, pos)
+        pos += _BIN_TABLE_ROW.size
+    return table
+
+
+def encode_binary(data):
+    names = [name for name, entries in data.items() if entries]
+    sections = [b"".join(_encode_entry(e) for e in data[name]) for name in names]
+    table_size = sum(2 + len(n.encode("utf-8")) + _BIN_TABLE_ROW.size for n in names)
+    offset = _BIN_HEADER.size + table_size
+    out = [_BIN_HEADER.pack(BIN_MAGIC, BIN_VERSION, len(names))]
+    for name, section in zip(names, sections):
+        out.append(_pack_str(name))
+        out.append(_BIN_TABLE_ROW.pack(offset, len(section), len(data[name])))
+        offset += len(section)
+    out.extend(sections)
+    return b"".join(out)
+
+
+class BinaryBackend(JsonBackend):
+    """Like JsonBackend, but the snapshot is a compact binary file with an
+    offset table, memory-mapped so reading one board only touches that
+    board's bytes. New scores still go to a JSON-lines log."""
+
+    _READ_ERRORS = (ValueError, struct.error, OSError)
+
+    def __init__(self, path="scores.lbin", log_path="scores.lbin.log", **kwargs):
+        super().__init__(path, log_path, **kwargs)
+        self._lazy_memo = None
+
+    def _load_snapshot(self, strict=False):
+        try:
+            with open(self.path, "rb") as f:
+                buf = f.read()
+            if not buf:
+                return {}
+            table = _read_table(buf)
+            return {
+                name: _decode_section(memoryview(buf)[offset:offset + length], count)
+                for name, (offset, length, count) in table.items()
+            }
+        except FileNotFoundError:
+            return {}
+        except (ValueError, struct.error, OSError):
+            if strict:
+                raise
+            return {}
+
+    def _save_data(self, data):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(encode_binary(data))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def _lazy(self, signature):
+        # (cursor, offset table, {board: logged entries}); the table is
+        # re-read only when the snapshot changed, the log from where it was
+        # last read up to while only the log grew
+        memo = self._lazy_memo
+        if memo is not None and memo[0] == signature:
+            return memo[1:]
+        snap = file_signature(self.path)
+        tail = None
+        if memo is not None and memo[1][0] == snap:
+            table, logged = memo[2], memo[3]
+            tail = self._read_log(memo[1][1])
+        if tail is None:
+            table, logged = self._read_table(), {}
+            tail = self._read_log()
+        records, end = tail
+        for name, entries in _by_board(records).items():
+            logged.setdefault(name, []).extend(entries)
+        self._lazy_memo = (signature, (snap, end), table, logged)
+        return self._lazy_memo[1:]
+
+    def _read_table(self):
+        try:
+            with open(self.path, "rb") as f:
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        return _read_table(mm)
+        except FileNotFoundError:
+            pass
+        except (ValueError, struct.error):
+            # unreadable snapshot, only the log is left to serve
+            pass
+        return {}
+
+    def _section(self, table, name, limit=None):
+        # decode one board straight from the mapped file, only its first
+        # `limit` entries if given
+        if name not in table:
+            return []
+        offset, length, count = table[name]
+        with open(self.path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _decode_section(mm[offset:offset + length], min(count, limit or count))
+
+    def load_board(self, name):
+        with self.lock.shared():
+            signature = self.signature()
+            cursor, table, logged = self._lazy(signature)
+            entries = self._merge(name, self._section(table, name), logged.get(name, ()))
+            return signature, cursor, entries
+
+    def page(self, name, offset, limit):
+        # the first offset + limit of snapshot + log are within the
+        # snapshot's first offset + limit entries and the log
+        with self.lock.shared():
+            _, table, logged = self._lazy(self.signature())
+            logged = logged.get(name, ())
+            # per-player boards may drop one section entry per logged one
+            entries = self._section(table, name, offset + limit + len(logged))
+            return self._merge(name, entries, logged)[offset:offset + limit]
+
+    def iter_board(self, name):
+        # the board's bytes are copied out of the mapping, a fraction of
+        # its decoded size, so that no lock or open file is held while the
+        # caller goes through the entries
+        with self.lock.shared():
+            _, table, logged = self._lazy(self.signature())
+            logged = list(logged.get(name, ()))
+            count = 0
+            section = b""
+            if name in table:
+                offset, length, count = table[name]
+                with open(self.path, "rb") as f:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        section = mm[offset:offset + length]
+        sort_key = self._sort_key(name)
+        entries = _iter_section(section, count)
+        if self.per_player and self.per_player(name):
+            latest = {}
+            for entry in logged:
+                # a player's newest entry ranks after older equal ones
+                latest.pop(entry["player"], None)
+                latest[entry["player"]] = entry
+            entries = (e for e in entries if e["player"] not in latest)
+            logged = list(latest.values())
+        # stable on both sides: snapshot entries rank before logged ties
+        merged = heapq.merge(entries, sorted(logged, key=sort_key), key=sort_key)
+        if self.keep is not None and not (self.per_player and self.per_player(name)):
+            merged = itertools.islice(merged, self.keep)
+        yield from merged
+
+    def count(self, name):
+        with self.lock.shared():
+            _, table, logged = self._lazy(self.signature())
+            logged = logged.get(name, ())
+            if self.per_player and self.per_player(name):
+                return len(self._merge(name, self._section(table, name), logged))
+            # a logged entry is either kept or falls off the end
+            count = table[name][2] if name in table else 0
+            count += len(logged)
+            return count if self.keep is None else min(count, self.keep)
+
+    def board_names(self):
+        with self.lock.shared():
+            signature = self.signature()
+            _, table, logged = self._lazy(signature)
+            names = [name for name, (_, _, count) in table.items() if count]
+            names += [name for name in logged if name not in table]
+            return signature, names
+
+
+class SqliteBackend:
+    """One row per kept score, with an index serving the top-N queries."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS games (
+            name TEXT PRIMARY KEY
+        );
+        CREATE TABLE IF NOT EXISTS scores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            game_name TEXT NOT NULL,
+            player TEXT NOT NULL,
+            score NUMERIC NOT NULL,
+            extra TEXT NOT NULL,
+            time TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_scores_game_score
+            ON scores (game_name, score DESC, id);
+        -- replacing a player's entry on a per_player board
+        CREATE INDEX IF NOT EXISTS idx_scores_game_player
+            ON scores (game_name, player);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+    """
+    # one KllSketch per board, plus the scores added since it was last
+    # saved; they are folded in once a board has STATS_FOLD of them
+    STATS_SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS stats (board TEXT PRIMARY KEY, sketch TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS stats_pending (board TEXT NOT NULL, score NUMERIC NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS idx_stats_pending ON stats_pending (board)",
+    )
+    STATS_FOLD = 256
+
+    def __init__(self, path="scores.db", keep=20, timeout=10.0, ordering=None,
+                 per_player=None):
+        self.path = path
+        self.keep = keep
+        self.timeout = timeout
+        self.ordering = ordering
+        self.per_player = per_player
+        # SQLite does the cross-process locking, we only time BEGIN IMMEDIATE
+        self.lock_stats = LockStats()
+        self._lock = threading.Lock()
+        # data_version only moves for other connections' commits
+        self._commits = 0
+        self._untrimmed = {}
+        self.conn = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self._create_stats()
+
+    def _create_stats(self):
+        if self._has_stats_table():
+            return
+        cur = self._begin_write()
+        try:
+            if not self._has_stats_table():
+                for statement in self.STATS_SCHEMA:
+                    cur.execute(statement)
+                # database from before sketches were kept: start from the
+                # kept scores
+                cur.execute(
+                    "INSERT INTO stats_pending (board, score)"
+                    " SELECT game_name, score FROM scores ORDER BY id"
+                )
+            cur.execute("COMMIT")
+        except BaseException:
+            cur.execute("ROLLBACK")
+            raise
+
+    def _has_stats_table(self):
+        return self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'stats'"
+        ).fetchone() is not None
+
+    def _begin_write(self):
+        cur = self.conn.cursor()
+        start = time.perf_counter()
+        cur.execute("BEGIN IMMEDIATE")
+        self.lock_stats.record(time.perf_counter() - start)
+        return cur
+
+    def add(self, records):
+        """records: list of (game_name, entry) in submission order.
+
+        Returns the signature from just before and just after the write.
+        """
+        with self._lock:
+            cur = self._begin_write()
+            before = self._signature()
+            try:
+                touched = set()
+                for game_name, entry in records:
+                    cur.execute("INSERT OR IGNORE INTO games (name) VALUES (?)", (game_name,))
+                    if self.per_player and self.per_player(game_name):
+                        cur.execute(
+                            "DELETE FROM scores WHERE game_name = ? AND player = ?",
+                            (game_name, entry["player"]),
+                        )
+                    cur.execute(
+                        "INSERT INTO scores (game_name, player, score, extra, time)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        (
+                            game_name,
+                            entry["player"],
+                            entry["score"],
+                            json.dumps(entry["extra"]),
+                            entry["time"],
+                        ),
+                    )
+                    cur.execute(
+                        "INSERT INTO stats_pending (board, score) VALUES (?, ?)",
+                        (game_name, entry["score"]),
+                    )
+                    touched.add(game_name)
+                for game_name in touched:
+                    self._maybe_fold(cur, game_name)
+                if self.keep is not None:
+                    for game_name in touched:
+                        if not (self.per_player and self.per_player(game_name)):
+                            self._maybe_trim(cur, game_name, len(records))
+                cur.execute("COMMIT")
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+            self._commits += 1
+            return before, self._signature()
+
+    def drop(self, names):
+        """Delete whole boards. Returns the signatures around the write."""
+        with self._lock:
+            cur = self._begin_write()
+            before = self._signature()
+            try:
+                for name in names:
+                    cur.execute("DELETE FROM scores WHERE game_name = ?", (name,))
+                    cur.execute("DELETE FROM games WHERE name = ?", (name,))
+                    cur.execute("DELETE FROM stats WHERE board = ?", (name,))
+                    cur.execute("DELETE FROM stats_pending WHERE board = ?", (name,))
+                    self._untrimmed.pop(name, None)
+                self._new_generation(cur)
+                cur.execute("COMMIT")
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+            self._commits += 1
+            return before, self._signature()
+
+    def _cursor(self, cur):
+        # (generation, last row id); the generation moves whenever rows go
+        # other than by trimming or a per-player replacement, which readers
+        # repeat themselves
+        row = cur.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        (last_id,) = cur.execute(
+            "SELECT COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'scores'), 0)"
+        ).fetchone()
+        return (row[0] if row else 0), last_id
+
+    def _new_generation(self, cur):
+        cur.execute(
+            "INSERT INTO meta (key, value) VALUES ('generation', 1)"
+            " ON CONFLICT (key) DO UPDATE SET value = value + 1"
+        )
+
+    def changes(self, cursor):
+        """(signature, cursor, records): the rows added since cursor, as
+        (row id, board, entry). records is None when boards were dropped
+        or the sketches replaced since; the caller reloads what it holds."""
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                signature = self._signature()
+                now = self._cursor(self.conn)
+                if cursor is None or cursor[0] != now[0]:
+                    return signature, now, None
+                rows = self.conn.execute(
+                    "SELECT id, game_name, player, score, extra, time FROM scores"
+                    " WHERE id > ? ORDER BY id",
+                    (cursor[1],),
+                ).fetchall()
+            finally:
+                self.conn.execute("COMMIT")
+        records = [
+            (i, name, {"player": p, "score": s, "extra": json.loads(x), "time": t})
+            for i, name, p, s, x, t in rows
+        ]
+        return signature, now, records
+
+    def _maybe_trim(self, cur, game_name, added):
+        # the DELETE walks `keep` index entries, so with a large retention it
+        # only runs every keep/8 inserts; readers cut the surplus themselves
+        pending = self._untrimmed.get(game_name, 0) + added
+        if pending * 8 < self.keep:
+            self._untrimmed[game_name] = pending
+            return
+        self._untrimmed[game_name] = 0
+        self._trim(cur, game_name)
+
+    def _read_sketch(self, cur, name):
+        row = cur.execute("SELECT sketch FROM stats WHERE board = ?", (name,)).fetchone()
+        sketch = KllSketch.from_dict(json.loads(row[0])) if row else KllSketch()
+        for (score,) in cur.execute(
+            "SELECT score FROM stats_pending WHERE board = ? ORDER BY rowid", (name,)
+        ):
+            sketch.update(score)
+        return sketch
+
+    def _write_sketch(self, cur, name, sketch):
+        cur.execute(
+            "INSERT OR REPLACE INTO stats (board, sketch) VALUES (?, ?)",
+            (name, json.dumps(sketch.to_dict())),
+        )
+        cur.execute("DELETE FROM stats_pending WHERE board = ?", (name,))
+
+    def _maybe_fold(self, cur, name):
+        (pending,) = cur.execute(
+            "SELECT COUNT(*) FROM stats_pending WHERE board = ?", (name,)
+        ).fetchone()
+        if pending >= self.STATS_FOLD:
+            self._write_sketch(cur, name, self._read_sketch(cur, name))
+
+    def stats(self, name):
+        """(signature, KllSketch of every score added to the board)."""
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                signature = self._signature()
+                sketch = self._read_sketch(self.conn, name)
+            finally:
+                self.conn.execute("COMMIT")
+        return signature, sketch
+
+    def replace_stats(self, sketches):
+        """Overwrite every board's sketch, e.g. with a migrated store's."""
+        with self._lock:
+            cur = self._begin_write()
+            try:
+                cur.execute("DELETE FROM stats")
+                cur.execute("DELETE FROM stats_pending")
+                for name, sketch in sketches.items():
+                    self._write_sketch(cur, name, sketch)
+                self._new_generation(cur)
+                cur.execute("COMMIT")
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+            self._commits += 1
+
+    def _order_by(self, name):
+        # plain "score DESC, id" is served by the index; tie-breaks make
+        # SQLite sort the rows of that one board
+        parts = ["score DESC"]
+        for key, direction in (self.ordering(name) if self.ordering else ()):
+            if not key.isidentifier() or direction not in ("asc", "desc"):
+                raise ValueError(f"bad tie-break for {name!r}: {key!r} {direction!r}")
+            expr = f"json_extract(extra, '$.{key}')"
+            parts.append(f"{expr} IS NULL, {expr} {direction.upper()}")
+        parts.append("id")
+        return ", ".join(parts)
+
+    def _trim(self, cur, game_name):
+        cur.execute(
+            "DELETE FROM scores WHERE id IN ("
+            " SELECT id FROM scores WHERE game_name = ?"
+            f" ORDER BY {self._order_by(game_name)} LIMIT -1 OFFSET ?)",
+            (game_name, self.keep),
+        )
+
+    def top(self, game_name, limit):
+        return self.page(game_name, 0, limit)
+
+    def page(self, name, offset, limit):
+        """Entries ranked offset+1 .. offset+limit, read off the index. Rows
+        past `keep` that are not trimmed yet are included."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT player, score, extra, time FROM scores WHERE game_name = ?"
+                f" ORDER BY {self._order_by(name)} LIMIT ? OFFSET ?",
+                (name, limit, offset),
+            ).fetchall()
+        return self._rows_to_entries(rows)
+
+    # rows fetched at a time by iter_board
+    ITER_CHUNK = 1000
+
+    def iter_board(self, name):
+        """Rows of one board in rank order, untrimmed ones included. They
+        are fetched ITER_CHUNK at a time on a connection of their own, all
+        from the database as it was when the first ones were read."""
+        conn = sqlite3.connect(self.path, timeout=self.timeout)
+        try:
+            rows = conn.execute(
+                "SELECT player, score, extra, time FROM scores WHERE game_name = ?"
+                f" ORDER BY {self._order_by(name)}",
+                (name,),
+            )
+            while True:
+                chunk = rows.fetchmany(self.ITER_CHUNK)
+                if not chunk:
+                    break
+                yield from self._rows_to_entries(chunk)
+        finally:
+            conn.close()
+
+    def count(self, name):
+        """Rows of one board, untrimmed ones included."""
+        with self._lock:
+            (count,) = self.conn.execute(
+                "SELECT COUNT(*) FROM scores WHERE game_name = ?", (name,)
+            ).fetchone()
+        return count
+
+    def games(self):
+        return self.board_names()[1]
+
+    def _signature(self):
+        (version,) = self.conn.execute("PRAGMA data_version").fetchone()
+        return version, self._commits
+
+    def signature(self):
+        """Changes whenever any connection commits to the database."""
+        with self._lock:
+            return self._signature()
+
+    def snapshot(self):
+        """(signature, data) read in one transaction."""
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                sig = self._signature()
+                rows = self.conn.execute(
+                    "SELECT s.game_name, s.player, s.score, s.extra, s.time"
+                    " FROM games g JOIN scores s ON s.game_name = g.name"
+                    " ORDER BY g.rowid, s.score DESC, s.id"
+                ).fetchall()
+            finally:
+                self.conn.execute("COMMIT")
+        data = {}
+        for game_name, p, s, x, t in rows:
+            data.setdefault(game_name, []).append(
+                {"player": p, "score": s, "extra": json.loads(x), "time": t}
+            )
+        return sig, data
+
+    def _rows_to_entries(self, rows):
+        return [
+            {"player": p, "score": s, "extra": json.loads(x), "time": t}
+            for p, s, x, t in rows
+        ]
+
+    def load_board(self, name):
+        """(signature, cursor, ranked entries of one board), read in one
+        transaction."""
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                signature = self._signature()
+                cursor = self._cursor(self.conn)
+                rows = self.conn.execute(
+                    "SELECT player, score, extra, time FROM scores WHERE game_name = ?"
+                    f" ORDER BY {self._order_by(name)}",
+                    (name,),
+                ).fetchall()
+            finally:
+                self.conn.execute("COMMIT")
+        return signature, cursor, self._rows_to_entries(rows)
+
+    def board_names(self):
+        """(signature, names of the boards that have entries)."""
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                signature = self._signature()
+                rows = self.conn.execute(
+                    "SELECT name FROM games WHERE EXISTS"
+                    " (SELECT 1 FROM scores WHERE scores.game_name = games.name)"
+                    " ORDER BY rowid"
+                ).fetchall()
+            finally:
+                self.conn.execute("COMMIT")
+        return signature, [name for (name,) in rows]
+
+    def dump(self):
+        return self.snapshot()[1]
+
+    def compact(self):
+        with self._lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def migrate_json_to_sqlite(json_path, db_path, log_path=None, keep=20, ordering=None,
+                           per_player=None):
+    """One-shot copy of scores.json (+ its log) into a new SQLite database.
+
+    The database is built under a temporary name and renamed into place, so
+    a game starting at the same time never sees a half-filled file.
+    """
+    source = JsonBackend(
+        json_path, log_path or json_path + ".nolog", keep=keep, ordering=ordering,
+        per_player=per_player,
+    )
+    data = source.dump()
+    tmp_path = f"{db_path}.{os.getpid()}.tmp"
+    target = SqliteBackend(tmp_path, keep=keep, ordering=ordering, per_player=per_player)
+    try:
+        # lists are already ranked, inserting in order keeps the tie order
+        target.add([(name, e) for name, entries in data.items() for e in entries])
+        target.replace_stats(source.all_stats())
+        target.conn.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        target.close()
+    os.replace(tmp_path, db_path)
+    return sum(len(entries) for entries in data.values())
@@ -0,0 +1,91 @@
+# leaderboard_stress.py
+# Starts N processes that all call leaderboard_core.add_score at the same
+# time, then checks that every score made it into the store.
+#
+#   python leaderboard_stress.py --procs 8 --scores 200 --backend json
+#
+# Exits with status 1 if any score is missing or the score sketch (see
+# get_stats) did not count every one.
+import argparse
+import multiprocessing as mp
+import os
+import shutil
+import sys
+import tempfile
+
+import leaderboard_core as lb
+
+GAME = "stress"
+
+
+def configure(workdir, backend, keep, compact_bytes):
+    lb.FILE_NAME = os.path.join(workdir, "scores.json")
+    lb.LOG_NAME = os.path.join(workdir, "scores.log")
+    lb.DB_NAME = os.path.join(workdir, "scores.db")
+    lb.BIN_NAME = os.path.join(workdir, "scores.lbin")
+    lb.BIN_LOG_NAME = os.path.join(workdir, "scores.lbin.log")
+    lb.BACKEND = backend
+    lb.KEEP_TOP = keep
+    lb.COMPACT_LOG_BYTES = compact_bytes
+    # exercise the store itself even if a leaderboard server is running
+    lb.SERVER_ADDRESS = None
+
+
+def worker(proc_id, args, workdir, barrier, results):
+    configure(workdir, args.backend, args.procs * args.scores, args.compact_bytes)
+    barrier.wait()
+    for i in range(args.scores):
+        lb.add_score(GAME, f"p{proc_id}", proc_id * args.scores + i)
+    results.put(lb.get_metrics()["lock_wait"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent add_score stress test")
+    parser.add_argument("--procs", type=int, default=8)
+    parser.add_argument("--scores", type=int, default=200, help="scores per process")
+    parser.add_argument("--backend", choices=["json", "binary", "sqlite"], default=lb.BACKEND)
+    parser.add_argument(
+        "--compact-bytes", type=int, default=4096,
+        help="json/binary backends: small value so compaction races with appends",
+    )
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="lb_stress_")
+    try:
+        barrier = mp.Barrier(args.procs)
+        results = mp.Queue()
+        procs = [
+            mp.Process(target=worker, args=(i, args, workdir, barrier, results))
+            for i in range(args.procs)
+        ]
+        for p in procs:
+            p.start()
+        waits = [results.get() for _ in procs]
+        for p in procs:
+            p.join()
+
+        configure(workdir, args.backend, args.procs * args.scores, args.compact_bytes)
+        stored = lb.get_leaderboard(GAME, limit=args.procs * args.scores + 1)
+        expected = set(range(args.procs * args.scores))
+        got = [e["score"] for e in stored]
+        missing = expected - set(got)
+        duplicates = len(got) - len(set(got))
+        # the score sketch must have seen every add as well
+        counted = lb.get_stats(GAME)["count"]
+
+        total_wait = sum(w["wait_total_s"] for w in waits)
+        max_wait = max(w["wait_max_s"] for w in waits)
+        acquisitions = sum(w["acquisitions"] for w in waits)
+        print(f"backend={args.backend} procs={args.procs} scores/proc={args.scores}")
+        print(f"stored={len(got)} expected={len(expected)} missing={len(missing)} "
+              f"duplicates={duplicates} stats_count={counted}")
+        print(f"lock wait: total={total_wait:.3f}s "
+              f"mean={total_wait / max(acquisitions, 1) * 1000:.2f}ms max={max_wait * 1000:.2f}ms")
+        lb.set_backend(None)
+        return 1 if missing or duplicates or counted != len(expected) else 0
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,14 @@
 import tkinter as tk
 from tkinter import messagebox, simpledialog
-import random
+import sys
 import time
 from collections import deque
 import leaderboard_core as lb
+from game_loop import FixedStepLoop
+from game_window import GameWindow, main
+from snake_engine import BASE_SPEED, GRID_HEIGHT, GRID_WIDTH, SnakeEngine
 
 GRID_SIZE = 20
-GRID_WIDTH = 25
-GRID_HEIGHT = 25
-
-BASE_SPEED = 140   # ms (la început)
-MIN_SPEED = 60     # ms (limită minimă – foarte rapid)
-SPEED_ACCEL_PER_SEC = 1.0  # scade cu 1 ms pe secundă
 
 COLORS = {
     "bg": "#1e1e2f",
@@ -23,38 +20,17 @@ COLORS = {
     "hud_text": "#f8f8f2",
 }
 
-snake = []
-direction = (1, 0)
-foods = []
-walls = []
-game_over = False
-score = 0
-high_score = 0
-start_time = 0.0
-PLAYER_NAME = "Player"
-
-
-root = tk.Tk()
-root.title("Snake")
-root.configure(bg=COLORS["bg"])
-
-canvas = tk.Canvas(
-    root,
-    width=GRID_SIZE * GRID_WIDTH,
-    height=GRID_SIZE * GRID_HEIGHT,
-    bg=COLORS["board_bg"],
-    highlightthickness=0,
-)
-canvas.pack(padx=10, pady=(10, 5))
-
-hud_label = tk.Label(
-    root,
-    text="Score: 0   High: 0   Time: 00:00",
-    font=("Arial", 14, "bold"),
-    bg=COLORS["bg"],
-    fg=COLORS["hud_text"],
-)
-hud_label.pack(pady=(0, 10))
+# Snake XL: square boards of BIG_MIN..BIG_MAX cells per side, shown
+# BIG_VIEW cells at a time, BIG_CELL_PX pixels per cell
+BIG_MIN = 50
+BIG_MAX = 1000
+BIG_DEFAULT = 200
+BIG_VIEW = 120
+BIG_CELL_PX = 5
+# the view recenters when the head gets this close to its edge
+BIG_VIEW_MARGIN = 15
+# pixel color of a cell, by grid value (the head is drawn over it)
+CELL_COLORS = (COLORS["board_bg"], COLORS["wall"], COLORS["snake_body"], COLORS["food"])
 
 
 def format_time(seconds):
@@ -64,253 +40,288 @@ def format_time(seconds):
     return f"{m:02d}:{s:02d}"
 
 
-def get_current_speed():
-    elapsed = max(0.0, time.time() - start_time)
-    speed = BASE_SPEED - int(SPEED_ACCEL_PER_SEC * elapsed)
-    if speed < MIN_SPEED:
-        speed = MIN_SPEED
-    return speed
-
-
-def update_hud():
-    elapsed = time.time() - start_time
-    hud_label.config(
-        text=f"Score: {score}   High: {high_score}   Time: {format_time(elapsed)}"
-    )
-    if not game_over:
-        root.after(250, update_hud)
-
-
-def draw_cell_rect(x, y, color):
-    x1 = x * GRID_SIZE
-    y1 = y * GRID_SIZE
-    x2 = x1 + GRID_SIZE
-    y2 = y1 + GRID_SIZE
-    canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline=COLORS["board_bg"])
-
-
-def draw_snake_segment(x, y, is_head=False):
-    color = COLORS["snake_head"] if is_head else COLORS["snake_body"]
-    draw_cell_rect(x, y, color)
-
-
-def draw_food(x, y):
-    padding = GRID_SIZE * 0.20
-    x1 = x * GRID_SIZE + padding
-    y1 = y * GRID_SIZE + padding
-    x2 = (x + 1) * GRID_SIZE - padding
-    y2 = (y + 1) * GRID_SIZE - padding
-    canvas.create_oval(x1, y1, x2, y2, fill=COLORS["food"], outline="")
-
-
-def draw_wall(x, y):
-    draw_cell_rect(x, y, COLORS["wall"])
-
-
-def draw():
-    canvas.delete("all")
-    for wx, wy in walls:
-        draw_wall(wx, wy)
-    for fx, fy in foods:
-        draw_food(fx, fy)
-    if snake:
-        head = snake[0]
-        draw_snake_segment(head[0], head[1], is_head=True)
-        for x, y in snake[1:]:
-            draw_snake_segment(x, y, is_head=False)
-
-
-def generate_walls():
-    global walls
-    walls = []
-    num_walls = 40
-    forbidden = set(snake)
-    center_x = GRID_WIDTH // 2
-    center_y = GRID_HEIGHT // 2
-
-    for _ in range(num_walls * 5):
-        if len(walls) >= num_walls:
-            break
-        x = random.randint(0, GRID_WIDTH - 1)
-        y = random.randint(0, GRID_HEIGHT - 1)
-        if (x, y) in forbidden:
-            continue
-        if abs(x - center_x) <= 2 and abs(y - center_y) <= 2:
-            continue
-        if (x, y) in walls:
-            continue
-        walls.append((x, y))
-
-
-def get_reachable_empty_cells():
-    blocked = set(walls) | set(snake)
-    head = snake[0]
-    if head in walls:
-        return []
-    visited = set()
-    q = deque()
-    q.append(head)
-    visited.add(head)
-
-    while q:
-        x, y = q.popleft()
-        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-            nx, ny = x + dx, y + dy
-            if not (0 <= nx < GRID_WIDTH and 0 <= ny < GRID_HEIGHT):
-                continue
-            if (nx, ny) in visited:
-                continue
-            if (nx, ny) in blocked and (nx, ny) != head:
-                continue
-            visited.add((nx, ny))
-            q.append((nx, ny))
-
-    empty = [cell for cell in visited if cell not in set(snake) and cell not in set(walls)]
-    return empty
-
-
-def spawn_initial_foods():
-    global foods
-    foods = []
-    reachable = get_reachable_empty_cells()
-    random.shuffle(reachable)
-    desired = random.randint(5, 8)
-    count = min(desired, len(reachable))
-    foods = reachable[:count]
-
-
-def spawn_single_food():
-    global foods
-    reachable = get_reachable_empty_cells()
-    used = set(foods)
-    candidates = [cell for cell in reachable if cell not in used]
-    if not candidates:
-        return
-    foods.append(random.choice(candidates))
-
-
-def reset_game():
-    global snake, direction, foods, walls, game_over, score, start_time
-    snake = [
-        (GRID_WIDTH // 2, GRID_HEIGHT // 2),
-        (GRID_WIDTH // 2 - 1, GRID_HEIGHT // 2),
-        (GRID_WIDTH // 2 - 2, GRID_HEIGHT // 2),
-    ]
-    direction = (1, 0)
-    game_over = False
-    score = 0
-    start_time = time.time()
-    generate_walls()
-    spawn_initial_foods()
-    draw()
-    update_hud()
-
-
-def change_direction(new_dx, new_dy):
-    global direction
-    dx, dy = direction
-    if (dx, dy) == (-new_dx, -new_dy):
-        return
-    direction = (new_dx, new_dy)
-
-
-def step():
-    global game_over, score, high_score
-
-    if game_over:
-        return
-
-    dx, dy = direction
-    head_x, head_y = snake[0]
-    new_head = (head_x + dx, head_y + dy)
-
-    if not (0 <= new_head[0] < GRID_WIDTH and 0 <= new_head[1] < GRID_HEIGHT):
-        end_game()
-        return
-
-    if new_head in snake:
-        end_game()
-        return
-
-    if new_head in walls:
-        end_game()
-        return
-
-    snake.insert(0, new_head)
-
-    if new_head in foods:
-        score += 1
-        if score > high_score:
-            high_score = score
-        foods.remove(new_head)
-        spawn_single_food()
-    else:
-        snake.pop()
-
-    draw()
-    root.after(get_current_speed(), step)
-
-
-def end_game():
-    global game_over
-    game_over = True
-    elapsed = time.time() - start_time
-
-    # Save to leaderboard
-    if PLAYER_NAME and score > 0:
-        lb.add_score(
-            "snake",
-            PLAYER_NAME,
-            score,
-            extra={
-                "time_s": int(elapsed),
-                "session_high": high_score,
-            },
+class SnakeGame(GameWindow):
+    title = "Snake"
+    board_name = "snake"
+
+    def __init__(self, window):
+        super().__init__(window)
+        width, height = self.board_size()
+        self.engine = SnakeEngine(width, height, view=self)
+        self.high_score = 0
+        self.start_time = 0.0
+        # canvas items kept between steps: one per snake segment (same
+        # order as engine.snake) and one per food cell
+        self.snake_items = deque()
+        self.food_items = {}
+        # one snake move per update; dt follows engine.speed_ms()
+        self.loop = FixedStepLoop(self, self.update, self.render, BASE_SPEED / 1000, name="snake")
+
+        self.root.configure(bg=COLORS["bg"])
+
+        canvas_width, canvas_height = self.canvas_size()
+        self.canvas = tk.Canvas(
+            self.root,
+            width=canvas_width,
+            height=canvas_height,
+            bg=COLORS["board_bg"],
+            highlightthickness=0,
+        )
+        self.canvas.pack(padx=10, pady=(10, 5))
+
+        self.hud_label = tk.Label(
+            self.root,
+            text="Score: 0   High: 0   Time: 00:00",
+            font=("Arial", 14, "bold"),
+            bg=COLORS["bg"],
+            fg=COLORS["hud_text"],
+        )
+        self.hud_label.pack(pady=(0, 10))
+
+        self.root.bind("<KeyPress>", self.on_key_press)
+
+        self.center(canvas_width + 20, canvas_height + 70)
+
+        self.player_name = self.ask_player_name()
+        self.reset_game()
+
+    def board_size(self):
+        return GRID_WIDTH, GRID_HEIGHT
+
+    def canvas_size(self):
+        return GRID_SIZE * self.engine.width, GRID_SIZE * self.engine.height
+
+    def update_hud(self):
+        elapsed = time.time() - self.start_time
+        self.hud_label.config(
+            text=f"Score: {self.engine.score}   High: {self.high_score}   Time: {format_time(elapsed)}"
+        )
+        if not self.engine.game_over:
+            self.after(250, self.update_hud)
+
+    def draw_cell_rect(self, x, y, color):
+        x1 = x * GRID_SIZE
+        y1 = y * GRID_SIZE
+        x2 = x1 + GRID_SIZE
+        y2 = y1 + GRID_SIZE
+        return self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline=COLORS["board_bg"])
+
+    def draw_snake_segment(self, x, y, is_head=False):
+        color = COLORS["snake_head"] if is_head else COLORS["snake_body"]
+        return self.draw_cell_rect(x, y, color)
+
+    def draw_food(self, x, y):
+        padding = GRID_SIZE * 0.20
+        x1 = x * GRID_SIZE + padding
+        y1 = y * GRID_SIZE + padding
+        x2 = (x + 1) * GRID_SIZE - padding
+        y2 = (y + 1) * GRID_SIZE - padding
+        return self.canvas.create_oval(x1, y1, x2, y2, fill=COLORS["food"], outline="")
+
+    def draw_wall(self, x, y):
+        return self.draw_cell_rect(x, y, COLORS["wall"])
+
+    def draw(self):
+        """Draw the whole board from scratch; once per game, the engine's
+        moves keep it up to date through the hooks below."""
+        engine = self.engine
+        self.canvas.delete("all")
+        for wx, wy in engine.walls:
+            self.draw_wall(wx, wy)
+        self.food_items = {}
+        for fx, fy in engine.foods:
+            self.food_items[(fx, fy)] = self.draw_food(fx, fy)
+        self.snake_items = deque(
+            self.draw_snake_segment(x, y, is_head=(i == 0)) for i, (x, y) in enumerate(engine.snake)
         )
 
-    messagebox.showinfo(
-        "Game Over",
-        f"You died!\nScore: {score}\nHighscore: {high_score}\nTime: {format_time(elapsed)}",
-    )
-    reset_game()
-    root.after(get_current_speed(), step)
-
-
-def on_key_press(event):
-    key = event.keysym
-    if key in ("Up", "w", "W"):
-        change_direction(0, -1)
-    elif key in ("Down", "s", "S"):
-        change_direction(0, 1)
-    elif key in ("Left", "a", "A"):
-        change_direction(-1, 0)
-    elif key in ("Right", "d", "D"):
-        change_direction(1, 0)
-
-
-def ask_player_name():
-    global PLAYER_NAME
-    name = simpledialog.askstring(
-        "Player Name",
-        "Enter your name:",
-        parent=root,
-    )
-    if not name:
-        name = "Player"
-    PLAYER_NAME = name
-
-
-root.bind("<KeyPress>", on_key_press)
-
-window_width = GRID_SIZE * GRID_WIDTH + 20
-window_height = GRID_SIZE * GRID_HEIGHT + 70
-screen_width = root.winfo_screenwidth()
-screen_height = root.winfo_screenheight()
-x_coord = int((screen_width / 2) - (window_width / 2))
-y_coord = int((screen_height / 2) - (window_height / 2))
-root.geometry(f"{window_width}x{window_height}+{x_coord}+{y_coord}")
-
-ask_player_name()
-reset_game()
-root.after(get_current_speed(), step)
-root.mainloop()
+    def show_food(self, cell):
+        self.food_items[cell] = self.draw_food(*cell)
+
+    def hide_food(self, cell):
+        self.canvas.delete(self.food_items.pop(cell))
+
+    def move_snake_items(self, tail):
+        """Show the move the engine just made: a new head item if the snake
+        grew (tail is None), else the tail item moved to the head cell."""
+        x, y = self.engine.snake[0]
+        if self.snake_items:
+            self.canvas.itemconfigure(self.snake_items[0], fill=COLORS["snake_body"])
+        if tail is None:
+            self.snake_items.appendleft(self.draw_snake_segment(x, y, is_head=True))
+            return
+        item = self.snake_items.pop()
+        x1 = x * GRID_SIZE
+        y1 = y * GRID_SIZE
+        self.canvas.coords(item, x1, y1, x1 + GRID_SIZE, y1 + GRID_SIZE)
+        self.canvas.itemconfigure(item, fill=COLORS["snake_head"])
+        self.snake_items.appendleft(item)
+
+    def reset_game(self):
+        self.engine.reset()
+        self.start_time = time.time()
+        self.draw()
+        self.update_hud()
+        self.loop.set_step(self.engine.speed_ms() / 1000)
+        self.loop.start()
+
+    def update(self, dt):
+        if not self.engine.step():
+            self.end_game()
+            return
+        if self.engine.score > self.high_score:
+            self.high_score = self.engine.score
+        self.loop.set_step(self.engine.speed_ms() / 1000)
+
+    def render(self, alpha):
+        # the engine's moves already moved the canvas items and the snake
+        # moves cell by cell, so there is nothing to draw between two moves
+        pass
+
+    def end_game(self):
+        self.loop.stop()
+        elapsed = time.time() - self.start_time
+        score = self.engine.score
+
+        # Save to leaderboard
+        if self.player_name and score > 0:
+            lb.submit_score(
+                self.board_name,
+                self.player_name,
+                score,
+                extra={
+                    "time_s": int(elapsed),
+                    "session_high": self.high_score,
+                },
+            )
+
+        messagebox.showinfo(
+            "Game Over",
+            f"You died!\nScore: {score}\nHighscore: {self.high_score}\nTime: {format_time(elapsed)}",
+            parent=self.root,
+        )
+        if self.closed:
+            return
+        self.reset_game()
+
+    def on_key_press(self, event):
+        key = event.keysym
+        if key in ("Up", "w", "W"):
+            self.engine.change_direction(0, -1)
+        elif key in ("Down", "s", "S"):
+            self.engine.change_direction(0, 1)
+        elif key in ("Left", "a", "A"):
+            self.engine.change_direction(-1, 0)
+        elif key in ("Right", "d", "D"):
+            self.engine.change_direction(1, 0)
+
+
+class BigSnakeGame(SnakeGame):
+    """Snake on a board of up to BIG_MAX x BIG_MAX cells.
+
+    The visible part of the board is one PhotoImage instead of a canvas
+    item per cell: step() only marks the cells it changed, render() paints
+    those, and the whole image is repainted when the view moves to keep
+    up with the head.
+    """
+
+    title = "Snake XL"
+    board_name = "snake_xl"
+
+    def __init__(self, window):
+        self.image = None
+        # top-left board cell of the view
+        self.view_x = 0
+        self.view_y = 0
+        self.dirty = set()
+        super().__init__(window)
+
+    def board_size(self):
+        size = simpledialog.askinteger(
+            "Snake XL",
+            f"Board size ({BIG_MIN}-{BIG_MAX} cells per side):",
+            initialvalue=BIG_DEFAULT,
+            minvalue=BIG_MIN,
+            maxvalue=BIG_MAX,
+            parent=self.root,
+        )
+        size = size or BIG_DEFAULT
+        return size, size
+
+    def canvas_size(self):
+        self.view_w = min(self.engine.width, BIG_VIEW)
+        self.view_h = min(self.engine.height, BIG_VIEW)
+        return self.view_w * BIG_CELL_PX, self.view_h * BIG_CELL_PX
+
+    def draw(self):
+        if self.image is None:
+            self.image = tk.PhotoImage(
+                width=self.view_w * BIG_CELL_PX, height=self.view_h * BIG_CELL_PX
+            )
+            self.canvas.create_image(0, 0, image=self.image, anchor="nw")
+        self.follow_head(force=True)
+        self.paint_view()
+
+    def follow_head(self, force=False):
+        """Recenter the view on the head if it got near an edge; True if it moved."""
+        hx, hy = self.engine.snake[0]
+        x, y = self.view_x, self.view_y
+        if force or not (x + BIG_VIEW_MARGIN <= hx < x + self.view_w - BIG_VIEW_MARGIN):
+            x = min(max(hx - self.view_w // 2, 0), self.engine.width - self.view_w)
+        if force or not (y + BIG_VIEW_MARGIN <= hy < y + self.view_h - BIG_VIEW_MARGIN):
+            y = min(max(hy - self.view_h // 2, 0), self.engine.height - self.view_h)
+        if (x, y) == (self.view_x, self.view_y):
+            return False
+        self.view_x, self.view_y = x, y
+        return True
+
+    def paint_view(self):
+        """Repaint the whole image: one put() per row of cells."""
+        px = BIG_CELL_PX
+        # a cell's worth of pixels in one image row, by grid value
+        runs = [" ".join([color] * px) for color in CELL_COLORS]
+        for row in range(self.view_h):
+            start = (self.view_y + row) * self.engine.width + self.view_x
+            line = " ".join([runs[v] for v in self.engine.grid[start:start + self.view_w]])
+            # the one-pixel row is tiled over the px rows of the cell
+            self.image.put("{" + line + "}", to=(0, row * px, self.view_w * px, (row + 1) * px))
+        self.dirty.clear()
+        self.paint_cell(self.engine.snake[0])
+
+    def paint_cell(self, cell):
+        x = cell[0] - self.view_x
+        y = cell[1] - self.view_y
+        if not (0 <= x < self.view_w and 0 <= y < self.view_h):
+            return
+        if cell == self.engine.snake[0]:
+            color = COLORS["snake_head"]
+        else:
+            color = CELL_COLORS[self.engine.grid[cell[1] * self.engine.width + cell[0]]]
+        px = BIG_CELL_PX
+        self.image.put(color, to=(x * px, y * px, (x + 1) * px, (y + 1) * px))
+
+    def show_food(self, cell):
+        self.dirty.add(cell)
+
+    def hide_food(self, cell):
+        self.dirty.add(cell)
+
+    def move_snake_items(self, tail):
+        self.dirty.add(self.engine.snake[0])
+        if len(self.engine.snake) > 1:
+            self.dirty.add(self.engine.snake[1])
+        if tail is not None:
+            self.dirty.add(tail)
+
+    def render(self, alpha):
+        if self.follow_head():
+            self.paint_view()
+            return
+        for cell in self.dirty:
+            self.paint_cell(cell)
+        self.dirty.clear()
+
+
+if __name__ == "__main__":
+    # python snake.py --big: the large board
+    main(BigSnakeGame if "--big" in sys.argv[1:] else SnakeGame)
@@ -0,0 +1,326 @@
+# snake_autopilot.py
+# Policies that play a SnakeEngine: each one looks at the engine and
+# returns the direction (dx, dy) to take on the next step().
+#
+#   greedy  A* to the nearest food, each move taken only if the snake still
+#           has room to fit in afterwards or can reach its tail
+#   cycle   follow a Hamiltonian cycle of the board (never dies on a board
+#           without walls); where a wall or the body is in the way, A* to
+#           the next free cell further along the cycle
+#   auto    greedy, and the cycle when greedy finds no safe move
+#
+# When none of them has a move, the move into the most room is taken.
+# A snake that has not eaten for width * height steps is going round in
+# circles (walls can leave cells of the cycle that are never safe to
+# enter), so "cycle" then goes for the food like greedy until it eats.
+#
+#   pilot = Autopilot("auto")
+#   pilot.play(SnakeEngine(seed=1), max_steps=5000)
+import heapq
+
+from snake_engine import EMPTY, FOOD
+
+# A* gives up after expanding this many cells (large boards)
+ASTAR_LIMIT = 20000
+
+_cycles = {}
+_adjacent = {}
+
+
+def hamiltonian_cycle(width, height):
+    """The cells of a Hamiltonian cycle of the board in order, None for a
+    side of 1. With both sides odd (the classic 25x25) no cycle covers
+    every cell; this one leaves out the bottom-left corner."""
+    if width < 2 or height < 2:
+        return None
+    if width % 2:
+        if height % 2:
+            return _odd_cycle(width, height)
+        return [(x, y) for y, x in hamiltonian_cycle(height, width)]
+    # along the top row, then down and up the columns from the right
+    cycle = [(x, 0) for x in range(width)]
+    for i, x in enumerate(range(width - 1, -1, -1)):
+        rows = range(1, height) if i % 2 == 0 else range(height - 1, 0, -1)
+        cycle.extend((x, y) for y in rows)
+    return cycle
+
+
+def _odd_cycle(width, height):
+    # the cycle of all rows but the last runs along row height - 2 from
+    # x = 1 to the end; every other step of it dips into the last row
+    last = height - 1
+    cycle = hamiltonian_cycle(width, last)
+    out = []
+    for a, b in zip(cycle, cycle[1:] + cycle[:1]):
+        out.append(a)
+        if a[1] == b[1] == last - 1 and min(a[0], b[0]) % 2 == 1:
+            out.extend([(a[0], last), (b[0], last)])
+    return out
+
+
+def _cycle_next(width, height):
+    """grid index -> grid index of the next cell on the cycle, None without one."""
+    key = (width, height)
+    if key not in _cycles:
+        cycle = hamiltonian_cycle(width, height)
+        nxt = None
+        if cycle is not None:
+            # -1: a cell the cycle leaves out
+            nxt = [-1] * (width * height)
+            for (x, y), (nx, ny) in zip(cycle, cycle[1:] + cycle[:1]):
+                nxt[y * width + x] = ny * width + nx
+        _cycles[key] = nxt
+    return _cycles[key]
+
+
+def _adjacency(engine):
+    """grid index -> tuple of the indices next to it, built once per board size."""
+    key = (engine.width, engine.height)
+    if key not in _adjacent:
+        _adjacent[key] = [tuple(engine.neighbours(i)) for i in range(len(engine.grid))]
+    return _adjacent[key]
+
+
+def _free(grid, i):
+    return grid[i] == EMPTY or grid[i] == FOOD
+
+
+def _head(engine):
+    hx, hy = engine.snake[0]
+    return hy * engine.width + hx
+
+
+def _direction(engine, src, dst):
+    w = engine.width
+    return (dst % w - src % w, dst // w - src // w)
+
+
+def room(engine, start, limit):
+    """Free cells reachable from start (start itself not counted), up to limit."""
+    grid = engine.grid
+    adjacent = _adjacency(engine)
+    seen = {start}
+    stack = [start]
+    count = 0
+    while stack and count < limit:
+        for n in adjacent[stack.pop()]:
+            if n not in seen and (grid[n] == EMPTY or grid[n] == FOOD):
+                seen.add(n)
+                stack.append(n)
+                count += 1
+    return count
+
+
+def safe(engine, cell):
+    """Moving into cell leaves room for the whole snake, or a way to the
+    tail (the body moves out of the way behind it)."""
+    need = len(engine.snake)
+    tx, ty = engine.snake[-1]
+    tail = ty * engine.width + tx
+    grid = engine.grid
+    adjacent = _adjacency(engine)
+    seen = {cell}
+    stack = [cell]
+    count = 0
+    while stack and count < need:
+        for n in adjacent[stack.pop()]:
+            if n == tail and count:
+                return True
+            if n not in seen and (grid[n] == EMPTY or grid[n] == FOOD):
+                seen.add(n)
+                stack.append(n)
+                count += 1
+    return count >= need
+
+
+def roomiest_move(engine):
+    head = _head(engine)
+    limit = len(engine.snake) * 2
+    best, best_room = engine.direction, -1
+    for n in engine.neighbours(head):
+        if _free(engine.grid, n):
+            r = room(engine, n, limit)
+            if r > best_room:
+                best, best_room = _direction(engine, head, n), r
+    return best
+
+
+def astar_path(engine):
+    """Grid indices of a shortest path from the head to the nearest food
+    it can reach (head excluded, food last), None without one."""
+    if not engine.reach_valid:
+        engine.compute_reachable()
+    w = engine.width
+    reach = engine.reach
+    foods = [f for f in engine.foods if reach[f[1] * w + f[0]]]
+    if not foods:
+        return None
+    hx, hy = engine.snake[0]
+    fx, fy = min(foods, key=lambda f: abs(f[0] - hx) + abs(f[1] - hy))
+    return astar(engine, fy * w + fx)
+
+
+def astar(engine, target):
+    """Grid indices of a shortest path from the head to target (head
+    excluded, target last), None if none was found within ASTAR_LIMIT."""
+    w = engine.width
+    fx, fy = target % w, target // w
+    hx, hy = engine.snake[0]
+    head = hy * w + hx
+    grid = engine.grid
+    adjacent = _adjacency(engine)
+    came_from = {head: None}
+    cost = {head: 0}
+    heap = [(abs(fx - hx) + abs(fy - hy), head)]
+    expanded = 0
+    while heap and expanded < ASTAR_LIMIT:
+        _, i = heapq.heappop(heap)
+        if i == target:
+            path = []
+            while i != head:
+                path.append(i)
+                i = came_from[i]
+            path.reverse()
+            return path
+        expanded += 1
+        for n in adjacent[i]:
+            if grid[n] != EMPTY and grid[n] != FOOD:
+                continue
+            c = cost[i] + 1
+            if c < cost.get(n, c + 1):
+                cost[n] = c
+                came_from[n] = i
+                heapq.heappush(heap, (c + abs(n % w - fx) + abs(n // w - fy), n))
+    return None
+
+
+def cycle_path(engine, anchor=None):
+    """Grid indices to walk along the Hamiltonian cycle from anchor (the
+    head by default): the next cell on it, or, if that one is taken (a
+    wall, the body, or the corner an odd board leaves out) or the head is
+    elsewhere, an A* path to the next free cell the head can reach further
+    along the cycle. None if there is no cycle or no such cell."""
+    nxt = _cycle_next(engine.width, engine.height)
+    if nxt is None:
+        return None
+    head = _head(engine)
+    grid = engine.grid
+    if anchor is None:
+        anchor = head
+    if nxt[anchor] == -1:
+        # off the cycle: back onto it next to the head
+        for n in engine.neighbours(head):
+            if nxt[n] != -1 and _free(grid, n):
+                return [n]
+        return None
+    if anchor == head and _free(grid, nxt[head]):
+        return [nxt[head]]
+    if not engine.reach_valid:
+        engine.compute_reachable()
+    reach = engine.reach
+    i = nxt[anchor]
+    while i != anchor and i != -1:
+        if reach[i] and _free(grid, i):
+            return astar(engine, i)
+        i = nxt[i]
+    return None
+
+
+POLICIES = ("greedy", "cycle", "auto")
+
+
+class Autopilot:
+    """Plays a SnakeEngine with one of POLICIES.
+
+    The A* path is kept between moves: while the snake walks it the cells
+    ahead stay free (the body only leaves cells behind it), so it is
+    searched again only once its food is gone or the path was left. The
+    same goes for a detour back onto the cycle.
+    """
+
+    def __init__(self, policy="auto"):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown policy {policy!r}, expected one of {POLICIES}")
+        self.policy = policy
+        # cells still to walk to the food, next one first
+        self.path = []
+        # cells still to walk back onto the cycle, and the last of them
+        self.detour = []
+        self.goal = None
+        # the last cell reached going along the cycle (the end of a detour
+        # counts); after a move off it the snake heads for the cycle past
+        # here, not back to where it was
+        self.anchor = None
+        # engine.steps and engine.time_s when the score last went up
+        self.fed_at = 0
+        self.fed_time_s = 0.0
+        self.score = 0
+
+    def greedy_move(self, engine):
+        head = _head(engine)
+        grid = engine.grid
+        path = self.path
+        if not (
+            path
+            and grid[path[-1]] == FOOD
+            and path[0] in engine.neighbours(head)
+            and _free(grid, path[0])
+        ):
+            path = self.path = astar_path(engine) or []
+        if path and safe(engine, path[0]):
+            return _direction(engine, head, path.pop(0))
+        self.path = []
+        return None
+
+    def cycle_move(self, engine):
+        head = _head(engine)
+        grid = engine.grid
+        if self.anchor is None or not self.detour and head == self.goal:
+            self.anchor = head
+        detour = self.detour
+        if not (detour and detour[0] in engine.neighbours(head) and _free(grid, detour[0])):
+            detour = self.detour = cycle_path(engine, self.anchor) or []
+            self.goal = detour[-1] if detour else None
+        # without walls the cycle itself is always safe; walls make the
+        # snake leave it, and the body can then close off the way ahead
+        if detour and (not engine.walls and self.policy == "cycle" or safe(engine, detour[0])):
+            return _direction(engine, head, detour.pop(0))
+        if self.goal is not None:
+            # a cell that cannot be entered safely now (often a dead end
+            # between walls): head for the one after it instead
+            self.anchor = self.goal
+        self.detour = []
+        return None
+
+    def move(self, engine):
+        """The direction to take on the next step."""
+        move = None
+        if engine.score != self.score:
+            self.score, self.fed_at, self.fed_time_s = engine.score, engine.steps, engine.time_s
+        if self.policy != "cycle" or self.stalled(engine):
+            move = self.greedy_move(engine)
+            if move is not None:
+                # off to the food, back onto the cycle from wherever that is
+                self.anchor = None
+                self.detour = []
+        if move is None and self.policy != "greedy":
+            move = self.cycle_move(engine)
+        return move or roomiest_move(engine)
+
+    def stalled(self, engine):
+        """True if the snake has not eaten for width * height steps."""
+        return engine.steps - self.fed_at > engine.width * engine.height
+
+    def play(self, engine, max_steps):
+        """Play one game from engine.reset() until death or max_steps."""
+        engine.reset()
+        self.path = []
+        self.detour = []
+        self.goal = self.anchor = None
+        self.fed_at = self.score = 0
+        self.fed_time_s = 0.0
+        while engine.steps < max_steps:
+            engine.change_direction(*self.move(engine))
+            if not engine.step():
+                break
+        return engine
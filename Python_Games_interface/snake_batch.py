@@ -0,0 +1,143 @@
+# snake_batch.py
+# Plays many seeded snake games with an autopilot across a process pool
+# and reports how they went, as JSON. For tuning the speed curve and the
+# wall density without playing by hand.
+#
+#   python snake_batch.py --games 2000
+#   python snake_batch.py --policy greedy --wall-density 0.1 --accel 2 -o batch.json
+#
+# Game i is played with seed --seed + i, so a run is repeatable whatever
+# the number of workers. Survival time is game time: the sum of the step
+# times of the speed curve (--base-speed, --min-speed, --accel), what a
+# player of the same moves would have lasted. A game still alive after
+# --max-steps is stopped and counted as survived, or as stalled if it had
+# not eaten for width * height steps (going round in circles); a stalled
+# game's survival time ends at its last meal.
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+
+import snake_autopilot as autopilot
+from snake_engine import (
+    BASE_SPEED,
+    GRID_HEIGHT,
+    GRID_WIDTH,
+    MIN_SPEED,
+    SPEED_ACCEL_PER_SEC,
+    WALL_DENSITY,
+    SnakeEngine,
+)
+
+
+def play_seed(config, seed):
+    engine = SnakeEngine(
+        config["width"],
+        config["height"],
+        seed=seed,
+        wall_density=config["wall_density"],
+        base_speed=config["base_speed"],
+        min_speed=config["min_speed"],
+        speed_accel=config["accel"],
+    )
+    pilot = autopilot.Autopilot(config["policy"])
+    pilot.play(engine, config["max_steps"])
+    stalled = not engine.game_over and pilot.stalled(engine)
+    survival_s = pilot.fed_time_s if stalled else engine.time_s
+    return engine.score, engine.steps, survival_s, engine.game_over, stalled
+
+
+def summarize(results, wall_s):
+    scores = [r[0] for r in results]
+    steps = [r[1] for r in results]
+    survival = [r[2] for r in results]
+    died = sum(1 for r in results if r[3])
+    stalled = sum(1 for r in results if r[4])
+    return {
+        "games": len(results),
+        "wall_s": round(wall_s, 3),
+        "games_per_s": round(len(results) / wall_s, 2),
+        "steps_per_s": round(sum(steps) / wall_s, 1),
+        "score_mean": round(statistics.fmean(scores), 2),
+        "score_median": statistics.median(scores),
+        "score_max": max(scores),
+        "survival_s_mean": round(statistics.fmean(survival), 2),
+        "survival_s_median": round(statistics.median(survival), 2),
+        "steps_mean": round(statistics.fmean(steps), 1),
+        "died": died,
+        "survived": len(results) - died - stalled,
+        "stalled": stalled,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snake autopilot batch runner")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--policy", choices=autopilot.POLICIES, default="auto")
+    parser.add_argument("--width", type=int, default=GRID_WIDTH)
+    parser.add_argument("--height", type=int, default=GRID_HEIGHT)
+    parser.add_argument("--wall-density", type=float, default=WALL_DENSITY,
+                        help="walls per cell (default: 40 on 25x25)")
+    parser.add_argument("--base-speed", type=int, default=BASE_SPEED, help="ms per step at the start")
+    parser.add_argument("--min-speed", type=int, default=MIN_SPEED, help="ms per step at the fastest")
+    parser.add_argument("--accel", type=float, default=SPEED_ACCEL_PER_SEC,
+                        help="ms less per step for every second of game time")
+    parser.add_argument("--max-steps", type=int, default=5000, help="steps after which a game is stopped")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="processes (1: play in this process)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    config = {
+        "policy": args.policy,
+        "width": args.width,
+        "height": args.height,
+        "wall_density": args.wall_density,
+        "base_speed": args.base_speed,
+        "min_speed": args.min_speed,
+        "accel": args.accel,
+        "max_steps": args.max_steps,
+    }
+    seeds = range(args.seed, args.seed + args.games)
+    play = partial(play_seed, config)
+    start = time.perf_counter()
+    if args.workers == 1:
+        results = [play(seed) for seed in seeds]
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            chunk = max(1, args.games // (args.workers * 8))
+            results = list(pool.map(play, seeds, chunksize=chunk))
+    stats = summarize(results, time.perf_counter() - start)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": vars(args),
+        "results": stats,
+    }
+    print(
+        f"{stats['games']} games in {stats['wall_s']} s ({stats['games_per_s']} games/s, "
+        f"{stats['steps_per_s']} steps/s): score mean {stats['score_mean']} / max "
+        f"{stats['score_max']}, survival mean {stats['survival_s_mean']} s, "
+        f"{stats['survived']} alive and {stats['stalled']} stalled after {args.max_steps} steps",
+        file=sys.stderr,
+    )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# snake_bench.py
+# What one snake tick costs on the Tk canvas as the snake grows, as JSON.
+#
+#   python snake_bench.py
+#   python snake_bench.py --lengths 10 100 600 --ticks 500 -o snake_bench.json
+#
+# For every length the snake runs around a Hamiltonian cycle of an empty
+# board (it never dies and never eats), and each tick is timed as
+#   incremental  engine.step(): the tail item moves to the new head
+#   full         engine.step() + draw(): every item deleted and created again,
+#                what every tick cost before the canvas items were kept
+# both followed by update_idletasks() so Tk's redraw is counted too.
+# Needs a display (or Xvfb, see startup_bench.py).
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tkinter as tk
+from collections import deque
+from datetime import datetime
+
+import snake
+from snake_autopilot import hamiltonian_cycle
+
+MODES = ("incremental", "full")
+
+
+class BenchSnake(snake.SnakeGame):
+    def ask_player_name(self):
+        return None
+
+    def update_hud(self):
+        pass
+
+
+def bench_length(game, cycle, length, ticks, mode):
+    n = len(cycle)
+    engine = game.engine
+    engine.snake = deque(cycle[(length - 1 - i) % n] for i in range(length))
+    engine.walls = []
+    engine.foods = []
+    engine.reset_grid()
+    engine.game_over = False
+    game.draw()
+    game.canvas.update_idletasks()
+
+    samples = []
+    pos = length - 1
+    for _ in range(ticks):
+        (hx, hy), (nx, ny) = cycle[pos % n], cycle[(pos + 1) % n]
+        engine.direction = (nx - hx, ny - hy)
+        pos += 1
+        start = time.perf_counter()
+        engine.step()
+        if mode == "full":
+            game.draw()
+        game.canvas.update_idletasks()
+        samples.append(time.perf_counter() - start)
+    assert not engine.game_over
+    return samples
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "ticks": len(samples),
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p99_ms": ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snake tick cost benchmark")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 50, 100, 200, 400, 600])
+    parser.add_argument("--ticks", type=int, default=300, help="timed ticks per length and mode")
+    parser.add_argument("--board", type=int, default=40, help="board side in cells (even)")
+    parser.add_argument("-o", "--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+    if args.board % 2 or max(args.lengths) >= args.board * args.board:
+        parser.error("--board must be even and hold the longest snake")
+
+    snake.GRID_WIDTH = snake.GRID_HEIGHT = args.board
+    snake.GRID_SIZE = max(4, 800 // args.board)
+    try:
+        root = tk.Tk()
+    except tk.TclError as exc:
+        print(f"snake_bench: needs a display ({exc})", file=sys.stderr)
+        return 1
+    game = BenchSnake(root)
+    game.loop.stop()
+    cycle = hamiltonian_cycle(args.board, args.board)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "tk": root.tk.call("info", "patchlevel"),
+        "platform": platform.platform(),
+        "params": vars(args),
+        "results": [],
+    }
+    for length in args.lengths:
+        for mode in MODES:
+            stats = summarize(bench_length(game, cycle, length, args.ticks, mode))
+            report["results"].append({"length": length, "mode": mode, **stats})
+            print(
+                f"{length:>5} {mode:<12} mean={stats['mean_ms']:8.3f}ms "
+                f"p50={stats['p50_ms']:8.3f}ms p99={stats['p99_ms']:8.3f}ms",
+                file=sys.stderr,
+            )
+    root.destroy()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,338 @@
+# snake_engine.py
+# The rules of snake without Tk: board, walls, food, moves and collisions.
+# snake.py draws a SnakeEngine; snake_autopilot.py and snake_batch.py play
+# it headless.
+import heapq
+import random
+from collections import deque
+
+GRID_WIDTH = 25
+GRID_HEIGHT = 25
+
+BASE_SPEED = 140   # ms per pas (la început)
+MIN_SPEED = 60     # ms (limită minimă – foarte rapid)
+SPEED_ACCEL_PER_SEC = 1.0  # scade cu 1 ms pe secundă de joc
+
+# what a cell of SnakeEngine.grid holds
+EMPTY, WALL, SNAKE, FOOD = 0, 1, 2, 3
+# translate() table: 1 for the cells the snake cannot go through
+BLOCKED = bytes(1 if v in (WALL, SNAKE) else 0 for v in range(256))
+# 40 walls and 5-8 foods on the classic 25x25 board; bigger boards get
+# the same density
+CLASSIC_CELLS = 25 * 25
+WALL_DENSITY = 40 / CLASSIC_CELLS
+# random picks tried before spawning food falls back to listing the free cells
+SPAWN_TRIES = 64
+# cells the local search in reach_head_moved() looks at before giving up
+LOCAL_SEARCH = 256
+
+
+class SnakeEngine:
+    """One game of snake.
+
+    view, if given, is told what to draw: view.show_food(cell),
+    view.hide_food(cell) and view.move_snake_items(tail) after every move
+    (tail is the cell the tail left, None if the snake grew).
+    """
+
+    def __init__(
+        self,
+        width=GRID_WIDTH,
+        height=GRID_HEIGHT,
+        seed=None,
+        wall_density=WALL_DENSITY,
+        base_speed=BASE_SPEED,
+        min_speed=MIN_SPEED,
+        speed_accel=SPEED_ACCEL_PER_SEC,
+        view=None,
+    ):
+        self.width = width
+        self.height = height
+        self.rng = random.Random(seed)
+        self.wall_density = wall_density
+        self.base_speed = base_speed
+        self.min_speed = min_speed
+        self.speed_accel = speed_accel
+        self.view = view
+        self.snake = deque()
+        self.direction = (1, 0)
+        self.foods = []
+        self.walls = []
+        # one byte per cell (EMPTY/WALL/SNAKE/FOOD), index y * width + x
+        self.grid = bytearray(width * height)
+        # 1 for every free cell the head can get to; kept up to date by
+        # step() while the change is local, rebuilt by a flood fill otherwise
+        self.reach = bytearray(width * height)
+        self.reach_valid = False
+        self.game_over = False
+        self.score = 0
+        self.steps = 0
+        # game time: the sum of the step times, drives the speed-up
+        self.time_s = 0.0
+
+    def reset(self):
+        self.snake = deque([
+            (self.width // 2, self.height // 2),
+            (self.width // 2 - 1, self.height // 2),
+            (self.width // 2 - 2, self.height // 2),
+        ])
+        self.walls = []
+        self.foods = []
+        self.reset_grid()
+        self.direction = (1, 0)
+        self.game_over = False
+        self.score = 0
+        self.steps = 0
+        self.time_s = 0.0
+        self.generate_walls()
+        self.spawn_initial_foods()
+
+    def speed_ms(self):
+        """How long the next step takes, in ms."""
+        speed = self.base_speed - int(self.speed_accel * self.time_s)
+        if speed < self.min_speed:
+            speed = self.min_speed
+        return speed
+
+    def reset_grid(self):
+        """Rebuild the occupancy grid from walls, foods and snake."""
+        self.grid = bytearray(self.width * self.height)
+        for cells, value in ((self.walls, WALL), (self.foods, FOOD), (self.snake, SNAKE)):
+            for x, y in cells:
+                self.grid[y * self.width + x] = value
+        self.reach_valid = False
+
+    def generate_walls(self):
+        self.walls = []
+        num_walls = round(self.wall_density * len(self.grid))
+        center_x = self.width // 2
+        center_y = self.height // 2
+
+        for _ in range(num_walls * 5):
+            if len(self.walls) >= num_walls:
+                break
+            i = self.rng.randrange(len(self.grid))
+            x, y = i % self.width, i // self.width
+            if self.grid[i] != EMPTY:
+                continue
+            if abs(x - center_x) <= 2 and abs(y - center_y) <= 2:
+                continue
+            self.grid[i] = WALL
+            self.walls.append((x, y))
+        self.reach_valid = False
+
+    def neighbours(self, i):
+        """Grid indices of the cells next to cell i."""
+        x = i % self.width
+        out = []
+        if x > 0:
+            out.append(i - 1)
+        if x < self.width - 1:
+            out.append(i + 1)
+        if i >= self.width:
+            out.append(i - self.width)
+        if i < len(self.grid) - self.width:
+            out.append(i + self.width)
+        return out
+
+    def compute_reachable(self):
+        """Flood fill from the head over the free (empty or food) cells
+        into self.reach, a row run at a time so large boards stay fast."""
+        w = self.width
+        n = len(self.grid)
+        # 0: free and not reached yet
+        todo = self.grid.translate(BLOCKED)
+        reach = bytearray(n)
+        hx, hy = self.snake[0]
+        stack = self.neighbours(hy * w + hx)
+        while stack:
+            i = stack.pop()
+            if todo[i]:
+                continue
+            row = i - i % w
+            left = todo.rfind(1, row, i) + 1 or row
+            right = todo.find(1, i, row + w)
+            if right == -1:
+                right = row + w
+            todo[left:right] = reach[left:right] = b"\x01" * (right - left)
+            # free runs above and below this one
+            for off in (-w, w):
+                if not 0 <= row + off < n:
+                    continue
+                j = todo.find(0, left + off, right + off)
+                while j != -1:
+                    stack.append(j)
+                    end = todo.find(1, j, right + off)
+                    if end == -1:
+                        break
+                    j = todo.find(0, end, right + off)
+        self.reach = reach
+        self.reach_valid = True
+
+    def reach_head_moved(self, old_head, new_head):
+        """The head went from old_head into the free cell new_head.
+
+        What was reachable through the new head still is. What was reached
+        through another free cell next to the old head stays reachable if
+        that cell is joined to the new head some other way; a short local
+        search finds out. A pocket it cuts off is dropped from the region;
+        when the search gives up, the region is rebuilt on the next spawn.
+        """
+        if not self.reach_valid:
+            return
+        h = old_head[1] * self.width + old_head[0]
+        c = new_head[1] * self.width + new_head[0]
+        self.reach[c] = 0
+        for n in self.neighbours(h):
+            if n == c or not self.reach[n]:
+                continue
+            pocket = self.search_towards(n, c)
+            if pocket is None:
+                continue
+            if pocket is False:
+                self.reach_valid = False
+                return
+            for i in pocket:
+                self.reach[i] = 0
+
+    def search_towards(self, start, target):
+        """Search the free cells from start, closest to target first, at
+        most LOCAL_SEARCH of them.
+
+        None if it gets next to target, the set of cells visited if it ran
+        out of them first (a pocket cut off from target), False if it gave up.
+        """
+        grid = self.grid
+        tx, ty = target % self.width, target // self.width
+        seen = {start}
+        heap = [(0, start)]
+        while heap:
+            if len(seen) > LOCAL_SEARCH:
+                return False
+            for n in self.neighbours(heapq.heappop(heap)[1]):
+                if n == target:
+                    return None
+                if n not in seen and (grid[n] == EMPTY or grid[n] == FOOD):
+                    seen.add(n)
+                    distance = abs(n % self.width - tx) + abs(n // self.width - ty)
+                    heapq.heappush(heap, (distance, n))
+        return seen
+
+    def reach_tail_freed(self, tail):
+        """The tail left its cell: it joins the region if it touches it,
+        together with any free cells it was walling off."""
+        if not self.reach_valid:
+            return
+        reach, grid = self.reach, self.grid
+        t = tail[1] * self.width + tail[0]
+        hx, hy = self.snake[0]
+        head = hy * self.width + hx
+        if not any(reach[n] or n == head for n in self.neighbours(t)):
+            return
+        reach[t] = 1
+        stack = [t]
+        while stack:
+            for n in self.neighbours(stack.pop()):
+                if not reach[n] and (grid[n] == EMPTY or grid[n] == FOOD):
+                    reach[n] = 1
+                    stack.append(n)
+
+    def random_reachable_cell(self):
+        """A random empty cell the snake can get to, None if there is none."""
+        if not self.reach_valid:
+            self.compute_reachable()
+        grid, reach = self.grid, self.reach
+        for _ in range(SPAWN_TRIES):
+            i = self.rng.randrange(len(grid))
+            if reach[i] and grid[i] == EMPTY:
+                return (i % self.width, i // self.width)
+        # a crowded board: pick from the full list
+        candidates = [i for i, r in enumerate(reach) if r and grid[i] == EMPTY]
+        if not candidates:
+            return None
+        i = self.rng.choice(candidates)
+        return (i % self.width, i // self.width)
+
+    def get_reachable_empty_cells(self):
+        if not self.reach_valid:
+            self.compute_reachable()
+        grid = self.grid
+        return [
+            (i % self.width, i // self.width)
+            for i, r in enumerate(self.reach)
+            if r and grid[i] == EMPTY
+        ]
+
+    def spawn_initial_foods(self):
+        self.foods = []
+        batches = max(1, len(self.grid) // CLASSIC_CELLS)
+        for _ in range(self.rng.randint(5, 8) * batches):
+            cell = self.random_reachable_cell()
+            if cell is None:
+                break
+            self.foods.append(cell)
+            self.grid[cell[1] * self.width + cell[0]] = FOOD
+
+    def spawn_single_food(self):
+        cell = self.random_reachable_cell()
+        if cell is None:
+            return
+        self.add_food(cell)
+
+    def add_food(self, cell):
+        self.foods.append(cell)
+        self.grid[cell[1] * self.width + cell[0]] = FOOD
+        if self.view is not None:
+            self.view.show_food(cell)
+
+    def remove_food(self, cell):
+        self.foods.remove(cell)
+        self.grid[cell[1] * self.width + cell[0]] = EMPTY
+        if self.view is not None:
+            self.view.hide_food(cell)
+
+    def change_direction(self, new_dx, new_dy):
+        dx, dy = self.direction
+        if (dx, dy) == (-new_dx, -new_dy):
+            return
+        self.direction = (new_dx, new_dy)
+
+    def step(self):
+        """Move one cell; False once the snake is dead."""
+        if self.game_over:
+            return False
+        self.time_s += self.speed_ms() / 1000
+        self.steps += 1
+
+        dx, dy = self.direction
+        head_x, head_y = self.snake[0]
+        new_head = (head_x + dx, head_y + dy)
+
+        if not (0 <= new_head[0] < self.width and 0 <= new_head[1] < self.height):
+            self.game_over = True
+            return False
+
+        i = new_head[1] * self.width + new_head[0]
+        cell = self.grid[i]
+        # the tail still counts: running into it ends the game
+        if cell == SNAKE or cell == WALL:
+            self.game_over = True
+            return False
+
+        grew = cell == FOOD
+        if grew:
+            self.score += 1
+            self.remove_food(new_head)
+        self.snake.appendleft(new_head)
+        self.grid[i] = SNAKE
+        self.reach_head_moved((head_x, head_y), new_head)
+        tail = None
+        if not grew:
+            tail = self.snake.pop()
+            self.grid[tail[1] * self.width + tail[0]] = EMPTY
+            self.reach_tail_freed(tail)
+        if self.view is not None:
+            self.view.move_snake_items(tail)
+        if grew:
+            self.spawn_single_food()
+        return True
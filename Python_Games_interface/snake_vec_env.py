@@ -0,0 +1,275 @@
+# snake_vec_env.py
+# Many games of snake stepped together with NumPy, for generating training
+# data for a bot: one step() moves every board at once with array ops.
+#
+#   env = SnakeVecEnv(1024, seed=0)
+#   obs = env.reset()                     # (1024, 25, 25) uint8
+#   obs, reward, done, info = env.step(actions)
+#
+#   python snake_vec_env.py --envs 1024 --steps 2000   # env-steps/s
+#
+# Same rules as snake_engine.SnakeEngine: the snake starts in the middle
+# heading right, walls at the engine's density away from the 5x5 center,
+# 5-8 foods per 25x25 cells, a new food for every one eaten, running into
+# a wall, the body (tail included) or the edge kills. One difference:
+# food goes to the cells the head can reach past the walls, worked out
+# once per game, instead of past walls and body after every move (the
+# body moves on, the walls do not).
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from snake_engine import (
+    BASE_SPEED,
+    CLASSIC_CELLS,
+    EMPTY,
+    FOOD,
+    GRID_HEIGHT,
+    GRID_WIDTH,
+    MIN_SPEED,
+    SNAKE,
+    SPAWN_TRIES,
+    SPEED_ACCEL_PER_SEC,
+    WALL,
+    WALL_DENSITY,
+)
+
+# observation value of the head cell (the rest are the grid values)
+HEAD = 4
+# actions: up, right, down, left; an action opposite to the current
+# direction is ignored, as in SnakeEngine.change_direction()
+ACTIONS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+DX = np.array([dx for dx, _ in ACTIONS], dtype=np.int64)
+DY = np.array([dy for _, dy in ACTIONS], dtype=np.int64)
+
+
+class SnakeVecEnv:
+    """num_envs boards of snake stepped together.
+
+    step() takes one action per board and returns (obs, reward, done,
+    info). Rewards are 1 for eating and -1 for dying. A board is done when
+    its snake dies or after max_steps steps; it is reset inside step(), so
+    obs already shows the new game, and info["score"], info["steps"] and
+    info["time_s"] hold how the finished one went (info["truncated"]:
+    stopped by max_steps, not dead).
+    """
+
+    def __init__(
+        self,
+        num_envs,
+        width=GRID_WIDTH,
+        height=GRID_HEIGHT,
+        seed=None,
+        wall_density=WALL_DENSITY,
+        max_steps=5000,
+        base_speed=BASE_SPEED,
+        min_speed=MIN_SPEED,
+        speed_accel=SPEED_ACCEL_PER_SEC,
+    ):
+        if width < 3 or height < 1:
+            raise ValueError("the board must hold the starting snake")
+        self.num_envs = num_envs
+        self.width = width
+        self.height = height
+        self.cells = width * height
+        self.rng = np.random.default_rng(seed)
+        self.max_steps = max_steps
+        self.base_speed = base_speed
+        self.min_speed = min_speed
+        self.speed_accel = speed_accel
+
+        cx, cy = width // 2, height // 2
+        # tail first, the order the snake is kept in below
+        self.start = np.array([cy * width + cx - 2, cy * width + cx - 1, cy * width + cx])
+        x = np.arange(self.cells) % width
+        y = np.arange(self.cells) // width
+        self.wall_free = (abs(x - cx) <= 2) & (abs(y - cy) <= 2)
+        self.num_walls = min(round(wall_density * self.cells), int((~self.wall_free).sum()))
+        batches = max(1, self.cells // CLASSIC_CELLS)
+        self.food_range = (5 * batches, min(8 * batches, self.cells))
+
+        n = num_envs
+        self.rows = np.arange(n)
+        # one byte per cell (EMPTY/WALL/SNAKE/FOOD), index y * width + x
+        self.grid = np.zeros((n, self.cells), dtype=np.uint8)
+        # cells the head can get to past the walls, from the start
+        self.reach = np.zeros((n, self.cells), dtype=bool)
+        # the snake as a ring buffer of cell indices: the head at
+        # body[i, head[i]], the tail length[i] - 1 cells before it
+        self.body = np.zeros((n, self.cells), dtype=np.int32)
+        self.head = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.direction = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.steps = np.zeros(n, dtype=np.int64)
+        self.time_s = np.zeros(n, dtype=np.float64)
+
+    def reset(self):
+        """Start a new game on every board; the observations."""
+        self.reset_envs(self.rows)
+        return self.observe()
+
+    def reset_envs(self, envs):
+        """Start a new game on the boards in envs (an index array)."""
+        n = len(envs)
+        if n == 0:
+            return
+        rows = envs[:, None]
+        grid = np.zeros((n, self.cells), dtype=np.uint8)
+        grid[:, self.start] = SNAKE
+        if self.num_walls:
+            # num_walls random cells out of the center, by random priority
+            prio = self.rng.random((n, self.cells))
+            prio[:, self.wall_free] = 2.0
+            walls = np.argpartition(prio, self.num_walls - 1, axis=1)[:, :self.num_walls]
+            np.put_along_axis(grid, walls, WALL, axis=1)
+        self.grid[envs] = grid
+        self.reach[envs] = self.flood(grid != WALL)
+
+        self.body[rows, np.arange(3)] = self.start
+        self.head[envs] = 2
+        self.length[envs] = 3
+        self.direction[envs] = 1
+        self.score[envs] = 0
+        self.steps[envs] = 0
+        self.time_s[envs] = 0.0
+        self.spawn_initial_foods(envs)
+
+    def flood(self, free):
+        """(n, cells) bool: the free cells connected to the head's start cell."""
+        n = len(free)
+        free = free.reshape(n, self.height, self.width)
+        reach = np.zeros_like(free)
+        reach[:, self.height // 2, self.width // 2] = True
+        count = 1
+        while True:
+            grown = reach.copy()
+            grown[:, 1:, :] |= reach[:, :-1, :]
+            grown[:, :-1, :] |= reach[:, 1:, :]
+            grown[:, :, 1:] |= reach[:, :, :-1]
+            grown[:, :, :-1] |= reach[:, :, 1:]
+            grown &= free
+            reach = grown
+            total = int(reach.sum())
+            if total == count:
+                return reach.reshape(n, self.cells)
+            count = total
+
+    def spawn_initial_foods(self, envs):
+        n = len(envs)
+        low, high = self.food_range
+        counts = self.rng.integers(low, high + 1, n)
+        prio = self.rng.random((n, self.cells))
+        prio[~(self.reach[envs] & (self.grid[envs] == EMPTY))] = np.inf
+        # the high lowest priorities, in order; the first counts[i] are the foods
+        cells = np.argpartition(prio, high - 1, axis=1)[:, :high]
+        order = np.argsort(np.take_along_axis(prio, cells, axis=1), axis=1)
+        cells = np.take_along_axis(cells, order, axis=1)
+        taken = np.arange(high) < counts[:, None]
+        taken &= np.isfinite(np.take_along_axis(prio, cells, axis=1))
+        self.grid[np.repeat(envs, taken.sum(axis=1)), cells[taken]] = FOOD
+
+    def spawn_food(self, envs):
+        """One food on each board in envs, on a random free reachable cell."""
+        if len(envs) == 0:
+            return
+        rows = envs[:, None]
+        tries = self.rng.integers(0, self.cells, (len(envs), SPAWN_TRIES))
+        ok = self.reach[rows, tries] & (self.grid[rows, tries] == EMPTY)
+        hit = ok.any(axis=1)
+        cells = tries[np.arange(len(envs)), ok.argmax(axis=1)]
+        self.grid[envs[hit], cells[hit]] = FOOD
+        # a crowded board: pick from all of its free cells
+        crowded = envs[~hit]
+        if len(crowded):
+            free = self.reach[crowded] & (self.grid[crowded] == EMPTY)
+            prio = np.where(free, self.rng.random(free.shape), 2.0)
+            cells = prio.argmin(axis=1)
+            some = free[np.arange(len(crowded)), cells]
+            self.grid[crowded[some], cells[some]] = FOOD
+
+    def observe(self):
+        """(num_envs, height, width) uint8: the grid values, HEAD on the head."""
+        obs = self.grid.copy()
+        obs[self.rows, self.body[self.rows, self.head]] = HEAD
+        return obs.reshape(self.num_envs, self.height, self.width)
+
+    def speed_ms(self):
+        """How long the next step takes on each board, in ms."""
+        speed = self.base_speed - (self.speed_accel * self.time_s).astype(np.int64)
+        return np.maximum(speed, self.min_speed)
+
+    def step(self, actions):
+        actions = np.asarray(actions, dtype=np.int64)
+        turn = actions != (self.direction + 2) % 4
+        self.direction = np.where(turn, actions, self.direction)
+        self.time_s += self.speed_ms() / 1000
+        self.steps += 1
+
+        rows = self.rows
+        old = self.body[rows, self.head]
+        x = old % self.width + DX[self.direction]
+        y = old // self.width + DY[self.direction]
+        inside = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        new = np.where(inside, y * self.width + x, 0)
+        cell = self.grid[rows, new]
+        # the tail still counts: running into it ends the game
+        dead = ~inside | (cell == WALL) | (cell == SNAKE)
+        ate = ~dead & (cell == FOOD)
+
+        moved = np.flatnonzero(~dead & ~ate)
+        tail = (self.head[moved] - self.length[moved] + 1) % self.cells
+        self.grid[moved, self.body[moved, tail]] = EMPTY
+        alive = np.flatnonzero(~dead)
+        self.head[alive] = (self.head[alive] + 1) % self.cells
+        self.body[alive, self.head[alive]] = new[alive]
+        self.grid[alive, new[alive]] = SNAKE
+        self.length += ate
+        self.score += ate
+        self.spawn_food(np.flatnonzero(ate))
+
+        reward = ate.astype(np.float32)
+        reward[dead] = -1.0
+        truncated = ~dead & (self.steps >= self.max_steps)
+        done = dead | truncated
+        info = {
+            "score": self.score.copy(),
+            "steps": self.steps.copy(),
+            "time_s": self.time_s.copy(),
+            "truncated": truncated,
+        }
+        self.reset_envs(np.flatnonzero(done))
+        return self.observe(), reward, done, info
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized snake speed check")
+    parser.add_argument("--envs", type=int, default=1024)
+    parser.add_argument("--steps", type=int, default=1000, help="steps of every board")
+    parser.add_argument("--width", type=int, default=GRID_WIDTH)
+    parser.add_argument("--height", type=int, default=GRID_HEIGHT)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    env = SnakeVecEnv(args.envs, args.width, args.height, seed=args.seed)
+    env.reset()
+    # random moves: they only turn, since a reversal is ignored
+    actions = np.random.default_rng(args.seed).integers(0, 4, (args.steps, args.envs))
+    games = 0
+    start = time.perf_counter()
+    for a in actions:
+        _, _, done, _ = env.step(a)
+        games += int(done.sum())
+    wall_s = time.perf_counter() - start
+    print(
+        f"{args.envs} boards x {args.steps} steps in {wall_s:.2f} s: "
+        f"{args.envs * args.steps / wall_s:,.0f} env-steps/s, {games} games ended",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
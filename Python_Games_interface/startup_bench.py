@@ -0,0 +1,336 @@
+# startup_bench.py
+# How long every window of the repo takes to come up, split into phases,
+# as JSON for tracking over time.
+#
+#   python startup_bench.py                       # every target, 3 runs each
+#   python startup_bench.py snake game_menu -n 10 -o startup.json
+#   python startup_bench.py --list
+#
+# Each run is a fresh `python -X importtime` child that executes the target
+# as __main__ with a few hooks in place:
+#   startup      process spawn -> the child's first line (interpreter start)
+#   imports      -> the window is being created (module-level imports)
+#   window       tk.Tk() / pygame.display.set_mode() itself
+#   widgets      -> the event loop is entered (building the UI)
+#   first_frame  -> the window is mapped and drawn once
+# then the window is closed. Dialogs are answered with their default
+# (askstring -> None) so nothing waits for a click. The -X importtime output
+# of the target gives the slowest imports, e.g. a UI module that pulls in a
+# large ML package at import time.
+#
+# Without a $DISPLAY an Xvfb server is started for the run (--use-display
+# runs on the current one instead). Without either, only the import phase
+# can be measured and the targets report "error".
+import argparse
+import json
+import os
+import runpy
+import select
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BASE_DIR)
+
+# name -> (script, toolkit)
+TARGETS = {
+    "game_menu": (os.path.join(BASE_DIR, "game_menu.py"), "tk"),
+    "tic_tac_toe": (os.path.join(BASE_DIR, "tic_tac_toe.py"), "tk"),
+    "snake": (os.path.join(BASE_DIR, "snake.py"), "tk"),
+    "minesweeper": (os.path.join(BASE_DIR, "minesweeper.py"), "tk"),
+    "game_2048": (os.path.join(BASE_DIR, "game_2048.py"), "tk"),
+    "flappy_bird": (os.path.join(BASE_DIR, "flappy_bird.py"), "tk"),
+    "memory_match": (os.path.join(BASE_DIR, "memory_match.py"), "tk"),
+    "typing_speed_test": (os.path.join(BASE_DIR, "typing_speed_test.py"), "tk"),
+    "leaderboard_menu": (os.path.join(BASE_DIR, "leaderboard_menu.py"), "tk"),
+    "smart_assistant": (os.path.join(ROOT_DIR, "Smart_Assistant", "app.py"), "tk"),
+    "chess": (os.path.join(ROOT_DIR, "chess", "gui", "main.py"), "pygame"),
+}
+PHASES = ["startup", "imports", "window", "widgets", "first_frame"]
+# the child's result line on stdout, and where its own imports end on stderr
+RESULT_MARK = "STARTUP_BENCH "
+BEGIN_MARK = "STARTUP_BENCH begin"
+TIMEOUT_S = 60
+TOP_IMPORTS = 10
+
+
+# ---------- child side ----------
+
+def _child(path, toolkit, spawned_at):
+    marks = {"entry": time.perf_counter()}
+    startup_ms = (time.time() - spawned_at) * 1000
+    result = {"startup": startup_ms}
+
+    def mark(name):
+        marks.setdefault(name, time.perf_counter())
+
+    def finish():
+        order = ["entry", "window_start", "window_end", "loop", "frame"]
+        for phase, (a, b) in zip(PHASES[1:], zip(order, order[1:])):
+            if a in marks and b in marks:
+                result[phase] = (marks[b] - marks[a]) * 1000
+
+    import pkgutil  # noqa: F401  runpy.run_path's own import, not the target's
+
+    # from here on every import counts: the hooks load the toolkit the
+    # target is about to import anyway
+    print(BEGIN_MARK, file=sys.stderr, flush=True)
+    if toolkit == "tk":
+        _hook_tk(mark)
+    else:
+        _hook_pygame(mark)
+
+    # the script's own directory comes first on sys.path, as with `python script.py`
+    sys.path[0] = os.path.dirname(path)
+    os.chdir(os.path.dirname(path))
+    try:
+        runpy.run_path(path, run_name="__main__")
+    except SystemExit:
+        pass
+    except BaseException as exc:
+        result["error"] = f"{type(exc).__name__}: {exc}"
+    finish()
+    if "frame" not in marks and "error" not in result:
+        result["error"] = "no frame was drawn"
+    print(RESULT_MARK + json.dumps(result), flush=True)
+    # skip atexit work of the target (flushing stores, joining threads)
+    os._exit(0)
+
+
+def _hook_tk(mark):
+    import tkinter
+    from tkinter import messagebox, simpledialog
+
+    tk_init = tkinter.Tk.__init__
+
+    def timed_init(self, *args, **kwargs):
+        mark("window_start")
+        tk_init(self, *args, **kwargs)
+        mark("window_end")
+
+    def first_frame_then_close(self, n=0):
+        mark("loop")
+        root = self._root()
+        root.wait_visibility(root)
+        root.update()
+        mark("frame")
+        root.destroy()
+
+    tkinter.Tk.__init__ = timed_init
+    tkinter.Misc.mainloop = first_frame_then_close
+    tkinter.mainloop = lambda n=0: first_frame_then_close(tkinter._default_root)
+    for module in (messagebox, simpledialog):
+        for name in dir(module):
+            if name.startswith(("ask", "show")):
+                setattr(module, name, lambda *args, **kwargs: None)
+
+
+def _hook_pygame(mark):
+    try:
+        import pygame
+    except ImportError:
+        # the target's own import then fails and is reported as its error
+        return
+
+    set_mode = pygame.display.set_mode
+
+    def timed_set_mode(*args, **kwargs):
+        mark("window_start")
+        surface = set_mode(*args, **kwargs)
+        mark("window_end")
+        return surface
+
+    def present(real):
+        def wrapper(*args, **kwargs):
+            mark("loop")
+            real(*args, **kwargs)
+            mark("frame")
+            raise SystemExit(0)
+        return wrapper
+
+    pygame.display.set_mode = timed_set_mode
+    pygame.display.flip = present(pygame.display.flip)
+    pygame.display.update = present(pygame.display.update)
+
+
+# ---------- parent side ----------
+
+def start_xvfb():
+    """Start a virtual X server on a free display; returns (process, display)
+    or None if Xvfb is missing or did not come up."""
+    exe = shutil.which("Xvfb")
+    if exe is None:
+        return None
+    # Xvfb picks the first free display and writes its number here once it
+    # accepts connections
+    read_fd, write_fd = os.pipe()
+    proc = subprocess.Popen(
+        [exe, "-displayfd", str(write_fd), "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        pass_fds=(write_fd,),
+    )
+    os.close(write_fd)
+    number = b""
+    try:
+        if select.select([read_fd], [], [], 5)[0]:
+            number = os.read(read_fd, 32).strip()
+    finally:
+        os.close(read_fd)
+    if not number:
+        proc.terminate()
+        proc.wait()
+        return None
+    return proc, ":" + number.decode()
+
+
+def parse_importtime(stderr):
+    """[(name, depth, self_us, cumulative_us)] of the imports after BEGIN_MARK."""
+    rows = []
+    lines = stderr.splitlines()
+    if BEGIN_MARK in lines:
+        lines = lines[lines.index(BEGIN_MARK) + 1:]
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+        except ValueError:
+            # the header line
+            continue
+        name = name[1:]
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        rows.append((name.strip(), depth, self_us, cumulative_us))
+    return rows
+
+
+def import_summary(rows, top=TOP_IMPORTS):
+    # what the target imports directly, with everything they pull in
+    direct = [r for r in rows if r[1] == 0]
+    slowest = sorted(direct, key=lambda r: r[3], reverse=True)[:top]
+    return {
+        "total_ms": round(sum(r[3] for r in direct) / 1000, 2),
+        "modules": len(rows),
+        "slowest": [
+            {"module": name, "cumulative_ms": round(cum / 1000, 2), "self_ms": round(own / 1000, 2)}
+            for name, _, own, cum in slowest
+        ],
+    }
+
+
+def run_once(name, env):
+    path, toolkit = TARGETS[name]
+    spawned_at = time.time()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.abspath(__file__),
+         "--child", path, toolkit, repr(spawned_at)],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=TIMEOUT_S,
+    )
+    result = None
+    for line in proc.stdout.splitlines():
+        if line.startswith(RESULT_MARK):
+            result = json.loads(line[len(RESULT_MARK):])
+    if result is None:
+        tail = proc.stderr.strip().splitlines()[-1:] or [f"exit code {proc.returncode}"]
+        result = {"error": tail[0]}
+    result["importtime"] = import_summary(parse_importtime(proc.stderr))
+    return result
+
+
+def bench(name, runs, env):
+    results = []
+    for _ in range(runs):
+        try:
+            results.append(run_once(name, env))
+        except subprocess.TimeoutExpired:
+            results.append({"error": f"timed out after {TIMEOUT_S} s"})
+    out = {"runs": runs, "phases_ms": {}}
+    for phase in PHASES:
+        values = [r[phase] for r in results if phase in r]
+        if values:
+            out["phases_ms"][phase] = round(statistics.median(values), 2)
+    if len(out["phases_ms"]) == len(PHASES):
+        out["phases_ms"]["total"] = round(sum(out["phases_ms"][p] for p in PHASES), 2)
+    # the import breakdown of the median run by import time
+    with_imports = sorted((r for r in results if "importtime" in r), key=lambda r: r["importtime"]["total_ms"])
+    if with_imports:
+        out["importtime"] = with_imports[len(with_imports) // 2]["importtime"]
+    errors = sorted({r["error"] for r in results if "error" in r})
+    if errors:
+        out["error"] = "; ".join(errors)
+    return out
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Startup / first frame benchmark")
+    parser.add_argument("targets", nargs="*", help="targets to run (default: all)")
+    parser.add_argument("-n", "--runs", type=int, default=3, help="runs per target; medians are reported")
+    parser.add_argument("-o", "--output", help="write the JSON here instead of stdout")
+    parser.add_argument("--use-display", action="store_true", help="run on $DISPLAY instead of Xvfb")
+    parser.add_argument("--list", action="store_true", help="list the targets")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, (path, toolkit) in TARGETS.items():
+            print(f"{name:<18} {toolkit:<7} {os.path.relpath(path, ROOT_DIR)}")
+        return 0
+    unknown = [t for t in args.targets if t not in TARGETS]
+    if unknown:
+        parser.error(f"unknown target(s): {', '.join(unknown)}")
+
+    # no leaderboard server, no launcher: the window on its own
+    env = dict(os.environ, LEADERBOARD_SERVER="", GAME_LAUNCH_MODE="inprocess")
+    xvfb = None
+    if not args.use_display:
+        started = start_xvfb()
+        if started is not None:
+            xvfb, env["DISPLAY"] = started
+    display = "xvfb" if xvfb is not None else env.get("DISPLAY")
+
+    report = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "display": display,
+        "targets": {},
+    }
+    try:
+        for name in args.targets or TARGETS:
+            print(f"{name} ...", file=sys.stderr)
+            report["targets"][name] = bench(name, args.runs, env)
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--child":
+        _child(sys.argv[2], sys.argv[3], float(sys.argv[4]))
+    sys.exit(main())
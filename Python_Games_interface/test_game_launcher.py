@@ -0,0 +1,42 @@
+# test_game_launcher.py
+#   python -m unittest test_game_launcher
+import os
+import tempfile
+import unittest
+
+import game_launcher
+import leaderboard_core as lb
+
+
+@unittest.skipUnless(game_launcher.AVAILABLE, "needs os.fork")
+class ForkedChildTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        self.server_address = lb.SERVER_ADDRESS
+        lb.SERVER_ADDRESS = None
+        # the store is opened after the fork, as in the launcher
+        lb.set_backend(None)
+
+    def tearDown(self):
+        lb.set_backend(None)
+        lb.SERVER_ADDRESS = self.server_address
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_submitted_score_is_saved_on_exit(self):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                lb.submit_score("snake", "forked", 7)
+                game_launcher._exit_child(0)
+            finally:
+                os._exit(1)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+        self.assertEqual([e["player"] for e in lb.get_leaderboard("snake")], ["forked"])
+
+
+if __name__ == "__main__":
+    unittest.main()
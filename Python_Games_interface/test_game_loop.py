@@ -0,0 +1,125 @@
+# test_game_loop.py
+#   python -m unittest test_game_loop
+import unittest
+from unittest import mock
+
+import game_loop
+from game_loop import FixedStepLoop
+
+
+class FakeOwner:
+    """Stands in for Tk: after() queues the callback, run() fires them
+    in deadline order, moving the fake clock forward to each one."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.pending = []
+        self.delays = []
+
+    def perf_counter(self):
+        return self.now
+
+    def after(self, ms, fn):
+        self.delays.append(ms)
+        self.pending.append((self.now + ms / 1000, fn))
+
+    def run(self, until):
+        while self.pending:
+            self.pending.sort(key=lambda p: p[0])
+            when, fn = self.pending[0]
+            if when > until:
+                break
+            self.pending.pop(0)
+            self.now = max(self.now, when)
+            fn()
+
+
+class FixedStepLoopTest(unittest.TestCase):
+    def setUp(self):
+        self.owner = FakeOwner()
+        patcher = mock.patch.object(game_loop.time, "perf_counter", self.owner.perf_counter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.updates = []
+        self.alphas = []
+
+    def make_loop(self, step_s=0.05, update=None, work_s=0.0):
+        def render(alpha):
+            self.alphas.append(alpha)
+            # time spent drawing
+            self.owner.now += work_s
+
+        return FixedStepLoop(
+            self.owner, update or self.updates.append, render, step_s, frame_ms=10
+        )
+
+    def test_updates_follow_game_time_not_frames(self):
+        loop = self.make_loop()
+        loop.start()
+        self.owner.run(self.owner.now + 1.0)
+        # one second of 50 ms steps, however many frames drew it
+        self.assertIn(len(self.updates), (19, 20))
+        self.assertEqual(set(self.updates), {0.05})
+        self.assertGreater(loop.frames, len(self.updates))
+        self.assertTrue(all(0 <= a < 1 for a in self.alphas))
+
+    def test_work_does_not_add_up_to_drift(self):
+        loop = self.make_loop(work_s=0.004)
+        loop.start()
+        start = self.owner.now
+        self.owner.run(start + 1.0)
+        # frames stay on the 10 ms grid: the delay shrinks by the work done
+        self.assertIn(loop.frames, (99, 100))
+        self.assertEqual(set(self.owner.delays[1:]), {6})
+
+    def test_long_stall_is_dropped_not_replayed(self):
+        loop = self.make_loop()
+        loop.start()
+        self.owner.run(self.owner.now + 0.1)
+        before = len(self.updates)
+        # the machine sleeps for two seconds
+        self.owner.now += 2.0
+        self.owner.run(self.owner.now + 0.001)
+        self.assertEqual(len(self.updates) - before, game_loop.MAX_CATCH_UP)
+        self.assertGreater(loop.dropped_steps, 30)
+        self.assertEqual(loop.stats()["dropped_steps"], loop.dropped_steps)
+
+    def test_stop_and_restart_ignore_stale_ticks(self):
+        loop = self.make_loop()
+        loop.start()
+        self.owner.run(self.owner.now + 0.2)
+        loop.stop()
+        self.owner.run(self.owner.now + 0.2)
+        stopped = len(self.updates)
+        # a restart while the old run's tick is still queued
+        loop.start()
+        loop.start()
+        self.owner.run(self.owner.now + 0.5)
+        self.assertIn(len(self.updates) - stopped, (9, 10))
+
+    def test_update_can_end_the_game(self):
+        loop = None
+
+        def update(dt):
+            self.updates.append(dt)
+            if len(self.updates) == 3:
+                loop.stop()
+
+        loop = self.make_loop(update=update)
+        loop.start()
+        self.owner.run(self.owner.now + 1.0)
+        self.assertEqual(len(self.updates), 3)
+        self.assertEqual(self.owner.pending, [])
+
+    def test_set_step(self):
+        loop = self.make_loop()
+        loop.start()
+        self.owner.run(self.owner.now + 0.5)
+        loop.set_step(0.025)
+        self.owner.run(self.owner.now + 0.5)
+        self.assertEqual(self.updates[-1], 0.025)
+        self.assertIn(self.updates.count(0.025), (19, 20, 21))
+
+
+if __name__ == "__main__":
+    unittest.main()
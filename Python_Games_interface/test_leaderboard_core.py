@@ -0,0 +1,216 @@
+# test_leaderboard_core.py
+#   python -m unittest test_leaderboard_core
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import leaderboard_core as lb
+
+
+class Clock(datetime):
+    """datetime whose now() the test sets."""
+
+    current = datetime(2025, 11, 5, 12, 0)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+class StoreTestCase(unittest.TestCase):
+    """Runs each test against a fresh local store in a temp directory."""
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        for name, value in (("SERVER_ADDRESS", None), ("BACKEND", "sqlite"), ("KEEP_TOP", 20)):
+            patcher = mock.patch.object(lb, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(lb, "datetime", Clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        Clock.current = datetime(2025, 11, 5, 12, 0)
+        lb._current_buckets.clear()
+        lb.set_backend(None)
+
+    def tearDown(self):
+        lb.set_backend(None)
+        lb._current_buckets.clear()
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def players(self, game_name, **kwargs):
+        return [e["player"] for e in lb.get_leaderboard(game_name, 100, **kwargs)]
+
+    def stored_boards(self):
+        return lb.get_backend().board_names()[1]
+
+
+class WindowTest(StoreTestCase):
+    def test_score_goes_on_every_window(self):
+        lb.add_score("snake", "a", 5)
+        for window in ("all", "day", "week"):
+            self.assertEqual(self.players("snake", window=window), ["a"], window)
+        self.assertIn("snake@day:2025-11-05", self.stored_boards())
+        self.assertIn("snake@week:2025-W45", self.stored_boards())
+
+    def test_next_day_starts_empty_and_drops_the_old_day(self):
+        lb.add_score("snake", "monday", 5)
+        # Thursday, same ISO week
+        Clock.current = datetime(2025, 11, 6, 9, 0)
+        self.assertEqual(self.players("snake", window="day"), [])
+        lb.add_score("snake", "tuesday", 3)
+        self.assertEqual(self.players("snake", window="day"), ["tuesday"])
+        self.assertEqual(self.players("snake", window="week"), ["monday", "tuesday"])
+        self.assertEqual(self.players("snake"), ["monday", "tuesday"])
+        boards = self.stored_boards()
+        self.assertNotIn("snake@day:2025-11-05", boards)
+        self.assertIn("snake@week:2025-W45", boards)
+
+    def test_next_week_drops_the_old_week(self):
+        lb.add_score("snake", "a", 5)
+        Clock.current = datetime(2025, 11, 12, 9, 0)
+        lb.add_score("snake", "b", 3)
+        self.assertEqual(self.players("snake", window="week"), ["b"])
+        self.assertNotIn("snake@week:2025-W45", self.stored_boards())
+        self.assertEqual(self.players("snake"), ["a", "b"])
+
+    def test_old_scores_only_count_all_time(self):
+        lb.add_scores([("snake", {
+            "player": "imported", "score": 9, "extra": {}, "time": "2025-10-01T08:00:00",
+        })])
+        lb.add_score("snake", "today", 1)
+        self.assertEqual(self.players("snake"), ["imported", "today"])
+        self.assertEqual(self.players("snake", window="day"), ["today"])
+        self.assertEqual(self.players("snake", window="week"), ["today"])
+
+    def test_windows_are_not_listed_as_games(self):
+        lb.add_score("snake", "a", 5)
+        # snake counts towards OVERALL, which is a game board of its own
+        self.assertEqual(sorted(lb.get_all_games()), [lb.OVERALL, "snake"])
+
+    def test_unknown_window(self):
+        with self.assertRaises(ValueError):
+            lb.get_leaderboard("snake", window="month")
+
+
+class PartitionTest(StoreTestCase):
+    def add(self, player, score, difficulty, time_s):
+        lb.add_score("minesweeper", player, score, {"difficulty": difficulty, "time_s": time_s})
+
+    def test_where_reads_one_value(self):
+        self.add("a", 10, "easy", 40)
+        self.add("b", 30, "hard", 90)
+        self.add("c", 20, "hard", 60)
+        hard = {"difficulty": "hard"}
+        self.assertEqual(self.players("minesweeper", where=hard), ["b", "c"])
+        self.assertEqual(self.players("minesweeper", where={"difficulty": "easy"}), ["a"])
+        self.assertEqual(self.players("minesweeper"), ["b", "c", "a"])
+        self.assertEqual(lb.get_count("minesweeper", where=hard), 2)
+        self.assertEqual(lb.get_rank("minesweeper", "c", where=hard), 2)
+        self.assertIsNone(lb.get_rank("minesweeper", "a", where=hard))
+        self.assertEqual(lb.get_stats("minesweeper", where=hard)["count"], 2)
+
+    def test_tie_breaks_apply_inside_a_partition(self):
+        self.add("slow", 10, "hard", 90)
+        self.add("fast", 10, "hard", 30)
+        hard = {"difficulty": "hard"}
+        self.assertEqual(self.players("minesweeper", where=hard), ["fast", "slow"])
+
+    def test_where_and_window(self):
+        self.add("monday", 10, "hard", 30)
+        Clock.current = datetime(2025, 11, 6, 9, 0)
+        self.add("tuesday", 5, "hard", 30)
+        hard = {"difficulty": "hard"}
+        self.assertEqual(self.players("minesweeper", window="day", where=hard), ["tuesday"])
+        self.assertEqual(
+            self.players("minesweeper", window="week", where=hard), ["monday", "tuesday"]
+        )
+
+    def test_partitions_are_not_listed_as_games(self):
+        self.add("a", 10, "easy", 40)
+        self.assertNotIn("minesweeper[difficulty=easy]", lb.get_all_games())
+
+    def test_where_needs_an_index(self):
+        self.add("a", 10, "easy", 40)
+        with self.assertRaises(ValueError):
+            lb.get_leaderboard("minesweeper", where={"time_s": 40})
+        with self.assertRaises(ValueError):
+            lb.get_leaderboard("snake", where={"difficulty": "easy"})
+
+    def test_reindex_fills_a_new_index(self):
+        lb.add_score("typing_test", "a", 60, {"mode": "words"})
+        lb.add_score("typing_test", "b", 80, {"mode": "quotes"})
+        with mock.patch.dict(lb.INDEXED_EXTRAS, {"typing_test": [("mode",)]}):
+            self.assertEqual(self.players("typing_test", where={"mode": "words"}), [])
+            lb.reindex("typing_test")
+            self.assertEqual(self.players("typing_test", where={"mode": "words"}), ["a"])
+            lb.add_score("typing_test", "c", 70, {"mode": "words"})
+            self.assertEqual(self.players("typing_test", where={"mode": "words"}), ["c", "a"])
+
+
+class OverallTest(StoreTestCase):
+    def points(self):
+        return {e["player"]: e["score"] for e in lb.get_leaderboard(lb.OVERALL, 100)}
+
+    def test_points_are_the_share_of_runs_beaten(self):
+        lb.add_score("snake", "first", 1)
+        self.assertEqual(self.points(), {"first": 0})
+        for i in range(9):
+            lb.add_score("snake", f"p{i}", 10 + i)
+        lb.add_score("flappy_bird", "p8", 5)
+        lb.add_score("flappy_bird", "first", 7)
+        points = self.points()
+        # p8's snake run beats 9 of 10, its flappy_bird run none of 2
+        self.assertEqual(points["p8"], 90)
+        self.assertEqual(points["first"], 50)
+        self.assertEqual(self.players(lb.OVERALL)[:2], ["p8", "p7"])
+        entry = lb.get_player_best(lb.OVERALL, "p8")
+        self.assertEqual(dict(entry["extra"]), {"snake": 90, "flappy_bird": 0})
+
+    def test_submit_rewrites_only_the_submitter_until_a_rescore(self):
+        for i in range(10):
+            lb.add_score("snake", f"p{i}", i)
+        before = self.points()
+        with mock.patch.object(lb, "OVERALL_RESCORE_GROWTH", 10.0):
+            lb.add_score("snake", "late", 100)
+            after = self.points()
+            self.assertEqual(after["late"], round(100 * 10 / 11, 1))
+            # everyone else keeps points scored against 10 runs
+            self.assertEqual({p: after[p] for p in before}, before)
+        with mock.patch.object(lb, "OVERALL_RESCORE_GROWTH", 0.0):
+            lb.add_score("snake", "later", 0)
+        # p9 now beats 0..8 and "later"
+        self.assertEqual(self.points()["p9"], round(100 * 10 / 12, 1))
+        # a rescore leaves nothing for reindex to change
+        rescored = self.points()
+        lb.reindex()
+        self.assertEqual(self.points(), rescored)
+
+    def test_one_entry_per_player(self):
+        for score in (5, 9, 7):
+            lb.add_score("snake", "a", score)
+        lb.add_score("snake", "b", 6)
+        self.assertEqual(lb.get_count(lb.OVERALL), 2)
+        self.assertEqual(lb.get_stats(lb.OVERALL)["count"], 2)
+        self.assertEqual(self.players(lb.OVERALL), ["a", "b"])
+
+    def test_other_games_do_not_count(self):
+        lb.add_score("pong", "a", 5)
+        self.assertNotIn(lb.OVERALL, lb.get_all_games())
+
+    def test_store_without_points_is_rebuilt_on_open(self):
+        lb.add_score("snake", "a", 5)
+        lb.add_score("snake", "b", 3)
+        # as written by the version that worked the points out when read
+        lb.get_backend().drop([lb.OVERALL, lb.OVERALL_SCORED])
+        lb.set_backend(None)
+        self.assertEqual(self.points(), {"a": 50, "b": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+# test_leaderboard_index.py
+#   python -m unittest test_leaderboard_index
+import random
+import unittest
+
+from leaderboard_index import GameIndex, SortedKeyList, make_sort_key
+
+
+class SmallSortedKeyList(SortedKeyList):
+    # tiny buckets, so a few hundred keys split and empty plenty of them
+    LOAD = 4
+
+
+def entry(player, score, **extra):
+    return {"player": player, "score": score, "extra": extra, "time": "2025-11-08T12:00:00"}
+
+
+class SortedKeyListTest(unittest.TestCase):
+    def check(self, keys, expected):
+        self.assertEqual(len(keys), len(expected))
+        self.assertEqual(list(keys), expected)
+        for i in (0, len(expected) // 2, len(expected) - 1):
+            if expected:
+                self.assertEqual(keys[i], expected[i])
+                self.assertEqual(keys[i - len(expected)], expected[i])
+
+    def test_matches_a_sorted_list(self):
+        rng = random.Random(1)
+        expected = sorted(rng.randrange(1000) for _ in range(100))
+        keys = SmallSortedKeyList(expected)
+        for step in range(2000):
+            if expected and rng.random() < 0.45:
+                key = rng.choice(expected)
+                expected.remove(key)
+                keys.remove(key)
+            else:
+                key = rng.randrange(1000)
+                expected.append(key)
+                expected.sort()
+                keys.add(key)
+            if step % 50 == 0:
+                self.check(keys, expected)
+        self.check(keys, expected)
+
+    def test_index_and_islice(self):
+        rng = random.Random(2)
+        expected = sorted(rng.randrange(500) for _ in range(300))
+        keys = SmallSortedKeyList()
+        for key in rng.sample(expected, len(expected)):
+            keys.add(key)
+        for probe in range(-1, 502, 7):
+            # position of the first key >= probe, like bisect_left
+            self.assertEqual(keys.index(probe), sum(k < probe for k in expected))
+        for start, stop in ((0, 10), (37, 80), (290, 400), (50, 50), (-5, 3)):
+            self.assertEqual(list(keys.islice(start, stop)), expected[max(start, 0):stop])
+
+    def test_pop_and_errors(self):
+        keys = SmallSortedKeyList([3, 1, 2])
+        self.assertEqual(keys.pop(), 3)
+        self.assertEqual(list(keys), [1, 2])
+        with self.assertRaises(ValueError):
+            keys.remove(5)
+        with self.assertRaises(IndexError):
+            keys[2]
+
+
+class GameIndexTest(unittest.TestCase):
+    def test_rank_and_page(self):
+        index = GameIndex([entry("a", 50), entry("b", 40), entry("c", 30)])
+        index.add(entry("d", 45))
+        self.assertEqual([e["player"] for e in index.page(0, 10)], ["a", "d", "b", "c"])
+        self.assertEqual([e["player"] for e in index.page(1, 2)], ["d", "b"])
+        self.assertEqual(index.page(4, 10), ())
+        self.assertEqual(index.rank("b"), 3)
+        self.assertIsNone(index.rank("nobody"))
+
+    def test_ties_rank_in_the_order_they_came(self):
+        index = GameIndex([entry("old", 10), entry("older-low", 5)])
+        index.add(entry("new", 10))
+        index.add(entry("newer", 10))
+        self.assertEqual(
+            [e["player"] for e in index.page(0, 10)], ["old", "new", "newer", "older-low"]
+        )
+        self.assertEqual(index.rank("newer"), 3)
+
+    def test_tie_breaks(self):
+        # minesweeper: equal scores, faster first, no time last
+        index = GameIndex(sort_key=make_sort_key([("time_s", "asc")]))
+        index.add(entry("slow", 10, time_s=90))
+        index.add(entry("none", 10))
+        index.add(entry("fast", 10, time_s=30))
+        self.assertEqual([e["player"] for e in index.page(0, 3)], ["fast", "slow", "none"])
+
+    def test_best_entry_per_player(self):
+        index = GameIndex()
+        for score in (3, 9, 5):
+            index.add(entry("a", score))
+        index.add(entry("b", 7))
+        self.assertEqual(index.best("a")["score"], 9)
+        self.assertEqual(index.rank("a"), 1)
+        self.assertEqual(index.rank("b"), 2)
+        self.assertEqual(len(index), 4)
+
+    def test_trim_forgets_players_cut_off(self):
+        index = GameIndex()
+        for player, score in (("a", 9), ("b", 8), ("c", 7), ("a", 1)):
+            index.add(entry(player, score))
+        index.trim(2)
+        self.assertEqual([e["player"] for e in index.page(0, 10)], ["a", "b"])
+        self.assertIsNone(index.rank("c"))
+        self.assertIsNone(index.best("c"))
+        self.assertEqual(index.best("a")["score"], 9)
+
+    def test_per_player_keeps_the_newest_entry(self):
+        index = GameIndex(per_player=True)
+        index.add(entry("a", 80))
+        index.add(entry("b", 60))
+        index.add(entry("a", 50))
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.best("a")["score"], 50)
+        self.assertEqual([e["player"] for e in index.page(0, 10)], ["b", "a"])
+
+    def test_matches_sorting_everything(self):
+        rng = random.Random(3)
+        index = GameIndex()
+        added = []
+        for _ in range(3000):
+            e = entry(f"p{rng.randrange(200)}", rng.randrange(100))
+            index.add(e)
+            added.append(e)
+        # stable sort: equal scores keep the order they were added in
+        expected = sorted(added, key=lambda e: -e["score"])
+        self.assertEqual(list(index.page(0, len(added))), expected)
+        for player in ("p0", "p17", "p199"):
+            first = next((i for i, e in enumerate(expected) if e["player"] == player), None)
+            self.assertEqual(index.rank(player), None if first is None else first + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+# test_leaderboard_sketch.py
+#   python -m unittest test_leaderboard_sketch
+import random
+import unittest
+from bisect import bisect_left
+
+from leaderboard_sketch import KllSketch
+
+# k=200 promises about 1% rank error; leave room for an unlucky run
+RANK_ERROR = 0.02
+
+
+def rank_of(ordered, value):
+    """Exact fraction of ordered strictly below value."""
+    return bisect_left(ordered, value) / len(ordered)
+
+
+class KllSketchTest(unittest.TestCase):
+    def setUp(self):
+        # compaction picks its offsets with the random module
+        random.seed(7)
+
+    def fill(self, values):
+        sketch = KllSketch()
+        for value in values:
+            sketch.update(value)
+        return sketch
+
+    def check_bounds(self, values):
+        sketch = self.fill(values)
+        ordered = sorted(values)
+        for q in (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99):
+            estimate = sketch.quantile(q)
+            # the estimate's true rank brackets q, allowing for ties
+            low = rank_of(ordered, estimate)
+            high = bisect_left(ordered, estimate + 1e-9) / len(ordered)
+            self.assertGreaterEqual(q, low - RANK_ERROR, f"q={q}")
+            self.assertLessEqual(q, high + RANK_ERROR, f"q={q}")
+        for probe in ordered[:: len(ordered) // 50]:
+            self.assertAlmostEqual(
+                sketch.fraction_below(probe), rank_of(ordered, probe), delta=RANK_ERROR
+            )
+        self.assertLess(sum(len(level) for level in sketch.levels), 1000)
+        return sketch
+
+    def test_uniform(self):
+        rng = random.Random(1)
+        self.check_bounds([rng.random() * 1000 for _ in range(100_000)])
+
+    def test_skewed_integers_with_ties(self):
+        rng = random.Random(2)
+        self.check_bounds([int(rng.expovariate(1 / 50)) for _ in range(100_000)])
+
+    def test_sorted_input(self):
+        self.check_bounds(list(range(50_000)))
+
+    def test_exact_parts(self):
+        values = [5, 1, 9, 3, 7] * 20_000
+        sketch = self.fill(values)
+        self.assertEqual(sketch.count, len(values))
+        self.assertEqual(sketch.min, 1)
+        self.assertEqual(sketch.max, 9)
+        self.assertAlmostEqual(sketch.mean(), 5)
+        self.assertEqual(sketch.quantile(0), 1)
+        self.assertEqual(sketch.quantile(1), 9)
+        self.assertEqual(sum(count for _, _, count in sketch.histogram(4)), len(values))
+
+    def test_small_sketch_is_exact(self):
+        sketch = self.fill([10, 20, 30, 40])
+        self.assertEqual(sketch.fraction_below(30), 0.5)
+        self.assertEqual(sketch.fraction_at_most(30), 0.75)
+        self.assertEqual(sketch.fractions_below([5, 10, 25, 50]), [0.0, 0.0, 0.5, 1.0])
+        self.assertEqual(sketch.quantile(0.5), 20)
+
+    def test_empty(self):
+        sketch = KllSketch()
+        self.assertIsNone(sketch.quantile(0.5))
+        self.assertIsNone(sketch.fraction_below(1))
+        self.assertEqual(sketch.fractions_below([1, 2]), [None, None])
+        self.assertEqual(sketch.histogram(), [])
+
+    def test_fractions_below_matches_fraction_below(self):
+        rng = random.Random(3)
+        sketch = self.fill(rng.randrange(10_000) for _ in range(20_000))
+        probes = [rng.randrange(-10, 10_010) for _ in range(200)]
+        self.assertEqual(
+            sketch.fractions_below(probes), [sketch.fraction_below(p) for p in probes]
+        )
+
+    def test_merge_keeps_the_bounds(self):
+        rng = random.Random(4)
+        left = [rng.gauss(100, 15) for _ in range(40_000)]
+        right = [rng.gauss(160, 15) for _ in range(60_000)]
+        sketch = self.fill(left)
+        sketch.merge(self.fill(right))
+        ordered = sorted(left + right)
+        self.assertEqual(sketch.count, len(ordered))
+        for probe in (80, 100, 130, 150, 175):
+            self.assertAlmostEqual(
+                sketch.fraction_below(probe), rank_of(ordered, probe), delta=RANK_ERROR
+            )
+
+    def test_dict_round_trip(self):
+        rng = random.Random(5)
+        sketch = self.fill(rng.randrange(1000) for _ in range(10_000))
+        copy = KllSketch.from_dict(sketch.to_dict())
+        self.assertEqual(copy.count, sketch.count)
+        self.assertEqual(copy.quantile(0.3), sketch.quantile(0.3))
+        self.assertEqual(copy.histogram(5), sketch.histogram(5))
+
+
+if __name__ == "__main__":
+    unittest.main()
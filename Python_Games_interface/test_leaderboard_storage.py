@@ -0,0 +1,196 @@
+# test_leaderboard_storage.py
+#   python -m unittest test_leaderboard_storage
+import multiprocessing as mp
+import os
+import random
+import tempfile
+import unittest
+
+import leaderboard_storage as storage
+
+TIE_BREAKS = {"minesweeper": [("time_s", "asc")]}
+PER_PLAYER = {"bests"}
+
+
+def ordering(board):
+    return TIE_BREAKS.get(board, ())
+
+
+def per_player(board):
+    return board in PER_PLAYER
+
+
+def make_backend(kind, workdir, keep, compact_log_bytes=64 * 1024):
+    path = os.path.join(workdir, "scores")
+    options = {"keep": keep, "ordering": ordering, "per_player": per_player}
+    if kind == "json":
+        return storage.JsonBackend(
+            path + ".json", path + ".log", compact_log_bytes=compact_log_bytes, **options
+        )
+    if kind == "binary":
+        return storage.BinaryBackend(
+            path + ".lbin", path + ".lbin.log", compact_log_bytes=compact_log_bytes, **options
+        )
+    return storage.SqliteBackend(path + ".db", **options)
+
+
+def records(seed, n):
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        board = rng.choice(["snake", "minesweeper", "bests"])
+        extra = {"time_s": rng.randrange(5)} if rng.random() < 0.8 else {}
+        out.append((board, {
+            "player": f"p{rng.randrange(15)}", "score": rng.randrange(30),
+            "extra": extra, "time": f"2025-11-08T12:{i // 60 % 60:02d}:{i % 60:02d}",
+        }))
+    return out
+
+
+def add_from_process(kind, workdir, writer, count):
+    backend = make_backend(kind, workdir, None, compact_log_bytes=4096)
+    for i in range(count):
+        backend.add([("stress", {
+            "player": f"w{writer}", "score": writer * count + i, "extra": {},
+            "time": "2025-11-08T12:00:00",
+        })])
+    backend.close()
+
+
+class BackendParityTest(unittest.TestCase):
+    KINDS = ("json", "binary", "sqlite")
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def fill(self, keep):
+        """One backend of each kind, fed the same batches with a compaction
+        halfway through."""
+        backends = {}
+        for kind in self.KINDS:
+            workdir = os.path.join(self.tmp.name, f"{kind}-{keep}")
+            os.mkdir(workdir)
+            backend = backends[kind] = make_backend(kind, workdir, keep)
+            self.addCleanup(backend.close)
+            batches = records(1, 400)
+            for start in range(0, len(batches), 25):
+                backend.add(batches[start:start + 25])
+                if start == 200:
+                    backend.compact()
+        return backends
+
+    def kept(self, backend, board, keep):
+        """What a reader sees: untrimmed SQLite rows past keep cut off."""
+        entries = backend.load_board(board)[2]
+        return entries if keep is None or per_player(board) else entries[:keep]
+
+    def check_parity(self, keep):
+        backends = self.fill(keep)
+        expected = backends["json"]
+        for kind, backend in backends.items():
+            for board in ("snake", "minesweeper", "bests"):
+                with self.subTest(kind=kind, board=board, keep=keep):
+                    entries = self.kept(backend, board, keep)
+                    self.assertEqual(entries, self.kept(expected, board, keep))
+                    self.assertEqual(backend.page(board, 3, 4), entries[3:7])
+                    count = backend.count(board)
+                    if keep is not None and not per_player(board):
+                        count = min(count, keep)
+                    self.assertEqual(len(entries), count)
+                    self.assertEqual(list(backend.iter_board(board))[:len(entries)], entries)
+                    self.assertEqual(backend.stats(board)[1].count, expected.stats(board)[1].count)
+            with self.subTest(kind=kind, keep=keep):
+                self.assertEqual(
+                    sorted(backend.board_names()[1]), ["bests", "minesweeper", "snake"]
+                )
+        return backends
+
+    def test_parity_keeping_everything(self):
+        backends = self.check_parity(None)
+        added = sum(1 for board, _ in records(1, 400) if board == "snake")
+        for kind, backend in backends.items():
+            with self.subTest(kind=kind):
+                self.assertEqual(backend.count("snake"), added)
+
+    def test_parity_under_keep(self):
+        backends = self.check_parity(5)
+        for kind, backend in backends.items():
+            with self.subTest(kind=kind):
+                entries = self.kept(backend, "snake", 5)
+                self.assertEqual(len(entries), 5)
+                scores = [e["score"] for e in entries]
+                self.assertEqual(scores, sorted(scores, reverse=True))
+                # every score counts in the sketch, trimmed or not
+                added = sum(1 for board, _ in records(1, 400) if board == "snake")
+                self.assertEqual(backend.stats("snake")[1].count, added)
+
+    def test_tie_breaks_and_per_player(self):
+        backends = self.fill(None)
+        for kind, backend in backends.items():
+            with self.subTest(kind=kind):
+                entries = self.kept(backend, "minesweeper", None)
+                keys = [(-e["score"], e["extra"].get("time_s", 99)) for e in entries]
+                self.assertEqual(keys, sorted(keys))
+                players = [e["player"] for e in self.kept(backend, "bests", None)]
+                self.assertEqual(len(players), len(set(players)))
+
+    def test_drop(self):
+        backends = self.fill(5)
+        for kind, backend in backends.items():
+            with self.subTest(kind=kind):
+                backend.drop(["snake"])
+                self.assertEqual(backend.load_board("snake")[2], [])
+                self.assertEqual(backend.stats("snake")[1].count, 0)
+                self.assertEqual(sorted(backend.board_names()[1]), ["bests", "minesweeper"])
+
+    def test_change_feed(self):
+        for kind in self.KINDS:
+            with self.subTest(kind=kind):
+                workdir = os.path.join(self.tmp.name, f"feed-{kind}")
+                os.mkdir(workdir)
+                backend = make_backend(kind, workdir, None)
+                self.addCleanup(backend.close)
+                backend.add(records(2, 10))
+                _, cursor, feed = backend.changes(None)
+                # no cursor yet: the caller has to load what it needs
+                self.assertIsNone(feed)
+                added = records(3, 10)
+                backend.add(added[:4])
+                backend.add(added[4:])
+                _, cursor, feed = backend.changes(cursor)
+                self.assertEqual([(board, entry) for _, board, entry in feed], added)
+                positions = [position for position, _, _ in feed]
+                self.assertEqual(positions, sorted(set(positions)))
+                self.assertEqual(backend.changes(cursor)[2], [])
+                backend.drop(["snake"])
+                self.assertIsNone(backend.changes(cursor)[2])
+
+
+class ConcurrentWriteTest(unittest.TestCase):
+    WRITERS = 4
+    SCORES = 60
+
+    def test_no_score_is_lost(self):
+        for kind in ("json", "binary", "sqlite"):
+            with self.subTest(kind=kind), tempfile.TemporaryDirectory() as workdir:
+                procs = [
+                    mp.Process(target=add_from_process, args=(kind, workdir, w, self.SCORES))
+                    for w in range(self.WRITERS)
+                ]
+                for proc in procs:
+                    proc.start()
+                for proc in procs:
+                    proc.join()
+                    self.assertEqual(proc.exitcode, 0)
+                backend = make_backend(kind, workdir, None)
+                try:
+                    scores = sorted(e["score"] for e in backend.load_board("stress")[2])
+                    self.assertEqual(scores, list(range(self.WRITERS * self.SCORES)))
+                    self.assertEqual(backend.stats("stress")[1].count, len(scores))
+                finally:
+                    backend.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
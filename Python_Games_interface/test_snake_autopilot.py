@@ -0,0 +1,36 @@
+# test_snake_autopilot.py
+#   python -m unittest test_snake_autopilot
+import unittest
+
+from snake_autopilot import Autopilot
+from snake_engine import SnakeEngine
+
+
+class CyclePolicyTest(unittest.TestCase):
+    def play(self, width, height, seed, steps, wall_density=None):
+        kwargs = {} if wall_density is None else {"wall_density": wall_density}
+        engine = SnakeEngine(width, height, seed=seed, **kwargs)
+        pilot = Autopilot("cycle")
+        pilot.play(engine, steps)
+        return engine, pilot
+
+    def test_keeps_eating_on_walled_boards(self):
+        # seeds that used to circle a few cells at length 3 for good
+        for width, height, seeds in ((25, 25, (6, 25)), (10, 10, (1, 4))):
+            for seed in seeds:
+                with self.subTest(board=(width, height), seed=seed):
+                    engine, pilot = self.play(width, height, seed, 3000)
+                    self.assertGreater(engine.score, 3)
+                    self.assertTrue(engine.game_over or not pilot.stalled(engine))
+
+    def test_fills_the_board_without_walls(self):
+        # the cycle covers every cell of an even board, so the snake only
+        # stops once it takes up all of them
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                engine, _ = self.play(10, 10, seed, 3000, wall_density=0)
+                self.assertEqual(len(engine.snake), 10 * 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
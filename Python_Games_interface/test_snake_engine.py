@@ -0,0 +1,105 @@
+# test_snake_engine.py
+#   python -m unittest test_snake_engine
+import random
+import unittest
+from collections import deque
+from unittest import mock
+
+import snake_engine
+from snake_autopilot import Autopilot
+from snake_engine import EMPTY, FOOD, SnakeEngine
+
+
+def flood_fill(engine):
+    """Reference for engine.reach: a plain BFS from the head."""
+    reach = bytearray(len(engine.grid))
+    hx, hy = engine.snake[0]
+    queue = deque([hy * engine.width + hx])
+    while queue:
+        for n in engine.neighbours(queue.popleft()):
+            if not reach[n] and engine.grid[n] in (EMPTY, FOOD):
+                reach[n] = 1
+                queue.append(n)
+    return reach
+
+
+class ReachabilityTest(unittest.TestCase):
+    def play(self, width, height, seed, steps, wander=0.2):
+        """Autopilot moves with some random ones mixed in, checking the
+        incrementally kept region after every step it stays valid."""
+        rng = random.Random(seed)
+        engine = SnakeEngine(width, height, seed=seed)
+        engine.reset()
+        pilot = Autopilot("auto")
+        checked = 0
+        for _ in range(steps):
+            if engine.game_over:
+                engine.reset()
+            elif rng.random() < wander:
+                engine.change_direction(*rng.choice([(1, 0), (-1, 0), (0, 1), (0, -1)]))
+            else:
+                engine.change_direction(*pilot.move(engine))
+            engine.step()
+            if engine.reach_valid and not engine.game_over:
+                self.assertEqual(engine.reach, flood_fill(engine), f"step {engine.steps}")
+                checked += 1
+        return checked
+
+    def test_matches_a_flood_fill(self):
+        for width, height, seed in ((25, 25, 1), (25, 25, 2), (12, 9, 3), (30, 20, 4)):
+            with self.subTest(board=(width, height), seed=seed):
+                checked = self.play(width, height, seed, 2000)
+                # the local updates, not the rebuilds, kept it valid most steps
+                self.assertGreater(checked, 1500)
+
+    def test_rebuilds_after_giving_up(self):
+        with mock.patch.object(snake_engine, "LOCAL_SEARCH", 4):
+            self.play(25, 25, 5, 2000)
+        engine = SnakeEngine(25, 25, seed=5)
+        engine.reset()
+        engine.reach_valid = False
+        self.assertIsNotNone(engine.random_reachable_cell())
+        self.assertTrue(engine.reach_valid)
+        self.assertEqual(engine.reach, flood_fill(engine))
+
+    def test_food_spawns_on_reachable_cells(self):
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                engine = SnakeEngine(25, 25, seed=seed)
+                engine.reset()
+                reach = flood_fill(engine)
+                for x, y in engine.foods:
+                    self.assertTrue(reach[y * engine.width + x])
+                cells = engine.get_reachable_empty_cells()
+                self.assertEqual(
+                    sorted(cells),
+                    sorted(
+                        (i % engine.width, i // engine.width)
+                        for i, r in enumerate(reach)
+                        if r and engine.grid[i] == EMPTY
+                    ),
+                )
+
+    def test_pocket_cut_off_by_the_head(self):
+        #   . . . . .        head H going up, then left: the body then
+        #   S S H . .        closes off the five cells on the right
+        #   W W W W .
+        engine = SnakeEngine(5, 3, seed=0, wall_density=0)
+        engine.snake = deque([(2, 1), (1, 1), (0, 1)])
+        engine.walls = [(0, 2), (1, 2), (2, 2), (3, 2)]
+        engine.foods = []
+        engine.reset_grid()
+        engine.compute_reachable()
+        for direction in ((0, -1), (-1, 0)):
+            engine.change_direction(*direction)
+            self.assertTrue(engine.step())
+        self.assertTrue(engine.reach_valid)
+        self.assertEqual(engine.reach, flood_fill(engine))
+        right = [(3, 0), (4, 0), (3, 1), (4, 1), (4, 2)]
+        self.assertFalse(any(engine.reach[y * 5 + x] for x, y in right))
+        # the cells the tail left are next to the head again
+        self.assertEqual(sorted(engine.get_reachable_empty_cells()), [(0, 0), (0, 1), (1, 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import messagebox, simpledialog
 import random
+from game_window import GameWindow, main
 
 COLORS = {
     "bg": "#1E1E2F",
@@ -16,18 +17,6 @@ COLORS = {
     "reset_fg": "#1E1E2F",
 }
 
-current_player = "X"
-board = [["" for _ in range(3)] for _ in range(3)]
-buttons = [[None for _ in range(3)] for _ in range(3)]
-game_over = False
-mode = None
-difficulty = None
-human_starts = True
-pvp_start_symbol = "X"
-score_x = 0
-score_o = 0
-score_draw = 0
-
 def evaluate_board(b):
     for row in range(3):
         if b[row][0] != "" and b[row][0] == b[row][1] == b[row][2]:
@@ -43,12 +32,7 @@ def evaluate_board(b):
         return "Draw"
     return None
 
-def check_winner():
-    return evaluate_board(board)
-
-def get_available_moves(b=None):
-    if b is None:
-        b = board
+def get_available_moves(b):
     return [(r, c) for r in range(3) for c in range(3) if b[r][c] == ""]
 
 def minimax(b, is_maximizing):
@@ -79,10 +63,10 @@ def minimax(b, is_maximizing):
                 best_score = score
         return best_score
 
-def best_move_impossible():
+def best_move_impossible(board):
     best_score = -999
     best_move = None
-    for (r, c) in get_available_moves():
+    for (r, c) in get_available_moves(board):
         board[r][c] = "O"
         score = minimax(board, False)
         board[r][c] = ""
@@ -91,8 +75,8 @@ def best_move_impossible():
             best_move = (r, c)
     return best_move
 
-def best_move_hard():
-    moves = get_available_moves()
+def best_move_hard(board):
+    moves = get_available_moves(board)
     for (r, c) in moves:
         board[r][c] = "O"
         if evaluate_board(board) == "O":
@@ -109,112 +93,10 @@ def best_move_hard():
         return (1, 1)
     return random.choice(moves) if moves else None
 
-def best_move_easy():
-    moves = get_available_moves()
+def best_move_easy(board):
+    moves = get_available_moves(board)
     return random.choice(moves) if moves else None
 
-def update_score_label():
-    if mode == "BOT":
-        score_label["text"] = f"You (X): {score_x}   Bot (O): {score_o}   Draws: {score_draw}"
-    else:
-        score_label["text"] = f"X wins: {score_x}   O wins: {score_o}   Draws: {score_draw}"
-
-def end_game(winner):
-    global game_over, score_x, score_o, score_draw
-    game_over = True
-    if winner == "Draw":
-        score_draw += 1
-        status_label["text"] = "It's a draw!"
-        update_score_label()
-        messagebox.showinfo("Game Over", "It's a draw!")
-        return
-    if winner == "X":
-        score_x += 1
-    else:
-        score_o += 1
-    update_score_label()
-    if mode == "BOT":
-        msg = "You win! 🎉" if winner == "X" else "Bot wins! 🤖"
-    else:
-        msg = f"Player {winner} wins!"
-    status_label["text"] = msg
-    messagebox.showinfo("Game Over", msg)
-
-def bot_move():
-    global current_player, game_over
-    if game_over:
-        return
-    if difficulty == "impossible":
-        move = best_move_impossible()
-    elif difficulty == "hard":
-        move = best_move_hard()
-    else:
-        move = best_move_easy()
-    if move is None:
-        return
-    r, c = move
-    board[r][c] = "O"
-    btn = buttons[r][c]
-    btn["text"] = "O"
-    btn["state"] = "disabled"
-    btn["bg"] = COLORS["btn_bg"]
-    btn["fg"] = COLORS["o_color"]
-    winner = check_winner()
-    if winner is not None:
-        end_game(winner)
-    else:
-        current_player = "X"
-        status_label["text"] = "Your turn (X)" if mode == "BOT" else "Player X's turn"
-
-def on_click(row, col):
-    global current_player, game_over
-    if game_over:
-        return
-    if mode == "BOT" and current_player == "O":
-        return
-    if board[row][col] != "":
-        return
-    board[row][col] = current_player
-    btn = buttons[row][col]
-    btn["text"] = current_player
-    btn["state"] = "disabled"
-    btn["bg"] = COLORS["btn_bg"]
-    btn["fg"] = COLORS["x_color"] if current_player == "X" else COLORS["o_color"]
-    winner = check_winner()
-    if winner is not None:
-        end_game(winner)
-    else:
-        if mode == "BOT":
-            current_player = "O"
-            status_label["text"] = "Bot's turn (O)..."
-            root.after(150, bot_move)
-        else:
-            current_player = "O" if current_player == "X" else "X"
-            status_label["text"] = f"Player {current_player}'s turn"
-
-def reset_game():
-    global current_player, board, game_over
-    board = [["" for _ in range(3)] for _ in range(3)]
-    game_over = False
-    for r in range(3):
-        for c in range(3):
-            btn = buttons[r][c]
-            btn["text"] = ""
-            btn["state"] = "normal"
-            btn["bg"] = COLORS["btn_bg"]
-            btn["fg"] = "white"
-    if mode == "BOT":
-        if human_starts:
-            current_player = "X"
-            status_label["text"] = "You (X) vs Bot (O) – your turn"
-        else:
-            current_player = "O"
-            status_label["text"] = "Bot (O) starts..."
-            root.after(300, bot_move)
-    else:
-        current_player = pvp_start_symbol
-        status_label["text"] = f"Player {current_player}'s turn"
-
 def on_enter(btn):
     if btn["state"] == "normal" and btn["text"] == "":
         btn["bg"] = COLORS["btn_hover"]
@@ -223,84 +105,196 @@ def on_leave(btn):
     if btn["state"] == "normal" and btn["text"] == "":
         btn["bg"] = COLORS["btn_bg"]
 
-root = tk.Tk()
-root.title("Tic Tac Toe")
-root.configure(bg=COLORS["bg"])
-window_width = 340
-window_height = 460
-screen_width = root.winfo_screenwidth()
-screen_height = root.winfo_screenheight()
-x_coord = int((screen_width / 2) - (window_width / 2))
-y_coord = int((screen_height / 2) - (window_height / 2))
-root.geometry(f"{window_width}x{window_height}+{x_coord}+{y_coord}")
 
-score_label = tk.Label(root, text="", font=("Arial", 12, "bold"), bg=COLORS["status_bg"], fg=COLORS["status_text"])
-score_label.pack(pady=(10, 5))
+class TicTacToe(GameWindow):
+    title = "Tic Tac Toe"
+
+    def __init__(self, window):
+        super().__init__(window)
+        self.current_player = "X"
+        self.board = [["" for _ in range(3)] for _ in range(3)]
+        self.buttons = [[None for _ in range(3)] for _ in range(3)]
+        self.game_over = False
+        self.mode = None
+        self.difficulty = None
+        self.human_starts = True
+        self.pvp_start_symbol = "X"
+        self.score_x = 0
+        self.score_o = 0
+        self.score_draw = 0
+
+        root = self.root
+        root.configure(bg=COLORS["bg"])
+        self.center(340, 460)
 
-board_frame = tk.Frame(root, bg=COLORS["board_bg"], padx=10, pady=10)
-board_frame.pack(pady=10)
+        self.score_label = tk.Label(root, text="", font=("Arial", 12, "bold"), bg=COLORS["status_bg"], fg=COLORS["status_text"])
+        self.score_label.pack(pady=(10, 5))
 
-for r in range(3):
-    for c in range(3):
-        btn = tk.Button(board_frame, text="", font=("Arial", 32, "bold"), width=3, height=1,
-                        bg=COLORS["btn_bg"], fg="white", activebackground=COLORS["btn_active"],
-                        activeforeground="black", borderwidth=0, relief="flat",
-                        command=lambda row=r, col=c: on_click(row, col))
-        btn.grid(row=r, column=c, padx=5, pady=5)
-        btn.bind("<Enter>", lambda e, b=btn: on_enter(b))
-        btn.bind("<Leave>", lambda e, b=btn: on_leave(b))
-        buttons[r][c] = btn
+        board_frame = tk.Frame(root, bg=COLORS["board_bg"], padx=10, pady=10)
+        board_frame.pack(pady=10)
 
-status_label = tk.Label(root, text="", font=("Arial", 14), bg=COLORS["status_bg"], fg=COLORS["status_text"])
-status_label.pack(pady=(5, 10))
+        for r in range(3):
+            for c in range(3):
+                btn = tk.Button(board_frame, text="", font=("Arial", 32, "bold"), width=3, height=1,
+                                bg=COLORS["btn_bg"], fg="white", activebackground=COLORS["btn_active"],
+                                activeforeground="black", borderwidth=0, relief="flat",
+                                command=lambda row=r, col=c: self.on_click(row, col))
+                btn.grid(row=r, column=c, padx=5, pady=5)
+                btn.bind("<Enter>", lambda e, b=btn: on_enter(b))
+                btn.bind("<Leave>", lambda e, b=btn: on_leave(b))
+                self.buttons[r][c] = btn
 
-reset_button = tk.Button(root, text="Reset", font=("Arial", 12, "bold"), bg=COLORS["reset_bg"],
-                         fg=COLORS["reset_fg"], activebackground=COLORS["btn_active"],
-                         activeforeground="black", relief="flat", padx=20, pady=5, command=reset_game)
-reset_button.pack(pady=5)
+        self.status_label = tk.Label(root, text="", font=("Arial", 14), bg=COLORS["status_bg"], fg=COLORS["status_text"])
+        self.status_label.pack(pady=(5, 10))
 
-def choose_mode_and_difficulty():
-    global mode, difficulty, human_starts, pvp_start_symbol, current_player
-    answer = messagebox.askquestion("Game Mode", "Do you want to play against the computer?\n\nYes = vs Bot\nNo = 2 Players", icon="question")
-    if answer == "yes":
-        mode = "BOT"
-        while True:
-            diff = simpledialog.askstring("Difficulty", "Choose difficulty:\n- easy\n- hard\n- impossible", parent=root)
-            if diff is None:
-                difficulty = "easy"
-                break
-            diff = diff.strip().lower()
-            if diff in ("easy", "hard", "impossible"):
-                difficulty = diff
-                break
+        reset_button = tk.Button(root, text="Reset", font=("Arial", 12, "bold"), bg=COLORS["reset_bg"],
+                                 fg=COLORS["reset_fg"], activebackground=COLORS["btn_active"],
+                                 activeforeground="black", relief="flat", padx=20, pady=5, command=self.reset_game)
+        reset_button.pack(pady=5)
+
+        self.after(100, self.choose_mode_and_difficulty)
+
+    def update_score_label(self):
+        if self.mode == "BOT":
+            self.score_label["text"] = f"You (X): {self.score_x}   Bot (O): {self.score_o}   Draws: {self.score_draw}"
+        else:
+            self.score_label["text"] = f"X wins: {self.score_x}   O wins: {self.score_o}   Draws: {self.score_draw}"
+
+    def end_game(self, winner):
+        self.game_over = True
+        if winner == "Draw":
+            self.score_draw += 1
+            self.status_label["text"] = "It's a draw!"
+            self.update_score_label()
+            messagebox.showinfo("Game Over", "It's a draw!", parent=self.root)
+            return
+        if winner == "X":
+            self.score_x += 1
+        else:
+            self.score_o += 1
+        self.update_score_label()
+        if self.mode == "BOT":
+            msg = "You win! 🎉" if winner == "X" else "Bot wins! 🤖"
+        else:
+            msg = f"Player {winner} wins!"
+        self.status_label["text"] = msg
+        messagebox.showinfo("Game Over", msg, parent=self.root)
+
+    def bot_move(self):
+        if self.game_over:
+            return
+        if self.difficulty == "impossible":
+            move = best_move_impossible(self.board)
+        elif self.difficulty == "hard":
+            move = best_move_hard(self.board)
+        else:
+            move = best_move_easy(self.board)
+        if move is None:
+            return
+        r, c = move
+        self.board[r][c] = "O"
+        btn = self.buttons[r][c]
+        btn["text"] = "O"
+        btn["state"] = "disabled"
+        btn["bg"] = COLORS["btn_bg"]
+        btn["fg"] = COLORS["o_color"]
+        winner = evaluate_board(self.board)
+        if winner is not None:
+            self.end_game(winner)
+        else:
+            self.current_player = "X"
+            self.status_label["text"] = "Your turn (X)" if self.mode == "BOT" else "Player X's turn"
+
+    def on_click(self, row, col):
+        if self.game_over:
+            return
+        if self.mode == "BOT" and self.current_player == "O":
+            return
+        if self.board[row][col] != "":
+            return
+        self.board[row][col] = self.current_player
+        btn = self.buttons[row][col]
+        btn["text"] = self.current_player
+        btn["state"] = "disabled"
+        btn["bg"] = COLORS["btn_bg"]
+        btn["fg"] = COLORS["x_color"] if self.current_player == "X" else COLORS["o_color"]
+        winner = evaluate_board(self.board)
+        if winner is not None:
+            self.end_game(winner)
+        else:
+            if self.mode == "BOT":
+                self.current_player = "O"
+                self.status_label["text"] = "Bot's turn (O)..."
+                self.after(150, self.bot_move)
+            else:
+                self.current_player = "O" if self.current_player == "X" else "X"
+                self.status_label["text"] = f"Player {self.current_player}'s turn"
+
+    def reset_game(self):
+        self.board = [["" for _ in range(3)] for _ in range(3)]
+        self.game_over = False
+        for r in range(3):
+            for c in range(3):
+                btn = self.buttons[r][c]
+                btn["text"] = ""
+                btn["state"] = "normal"
+                btn["bg"] = COLORS["btn_bg"]
+                btn["fg"] = "white"
+        if self.mode == "BOT":
+            if self.human_starts:
+                self.current_player = "X"
+                self.status_label["text"] = "You (X) vs Bot (O) – your turn"
             else:
-                messagebox.showerror("Invalid choice", "Please type: easy, hard, or impossible.")
-        ans_start = messagebox.askquestion("Who starts?", "Do you want to start first?\n\nYes = You (X)\nNo = Bot (O)", icon="question")
-        human_starts = (ans_start == "yes")
-        if human_starts:
-            current_player = "X"
-            status_label["text"] = "You (X) vs Bot (O) – your turn"
+                self.current_player = "O"
+                self.status_label["text"] = "Bot (O) starts..."
+                self.after(300, self.bot_move)
         else:
-            current_player = "O"
-            status_label["text"] = "Bot (O) starts..."
-            root.after(300, bot_move)
-    else:
-        mode = "PVP"
-        difficulty = None
-        while True:
-            sym = simpledialog.askstring("Who starts?", "Who should start first? X or O?", parent=root)
-            if sym is None:
-                pvp_start_symbol = "X"
-                break
-            sym = sym.strip().upper()
-            if sym in ("X", "O"):
-                pvp_start_symbol = sym
-                break
+            self.current_player = self.pvp_start_symbol
+            self.status_label["text"] = f"Player {self.current_player}'s turn"
+
+    def choose_mode_and_difficulty(self):
+        root = self.root
+        answer = messagebox.askquestion("Game Mode", "Do you want to play against the computer?\n\nYes = vs Bot\nNo = 2 Players", icon="question", parent=root)
+        if answer == "yes":
+            self.mode = "BOT"
+            while True:
+                diff = simpledialog.askstring("Difficulty", "Choose difficulty:\n- easy\n- hard\n- impossible", parent=root)
+                if diff is None:
+                    self.difficulty = "easy"
+                    break
+                diff = diff.strip().lower()
+                if diff in ("easy", "hard", "impossible"):
+                    self.difficulty = diff
+                    break
+                else:
+                    messagebox.showerror("Invalid choice", "Please type: easy, hard, or impossible.", parent=root)
+            ans_start = messagebox.askquestion("Who starts?", "Do you want to start first?\n\nYes = You (X)\nNo = Bot (O)", icon="question", parent=root)
+            self.human_starts = (ans_start == "yes")
+            if self.human_starts:
+                self.current_player = "X"
+                self.status_label["text"] = "You (X) vs Bot (O) – your turn"
             else:
-                messagebox.showerror("Invalid choice", "Please type: X or O.")
-        current_player = pvp_start_symbol
-        status_label["text"] = f"Player {current_player}'s turn"
-    update_score_label()
+                self.current_player = "O"
+                self.status_label["text"] = "Bot (O) starts..."
+                self.after(300, self.bot_move)
+        else:
+            self.mode = "PVP"
+            self.difficulty = None
+            while True:
+                sym = simpledialog.askstring("Who starts?", "Who should start first? X or O?", parent=root)
+                if sym is None:
+                    self.pvp_start_symbol = "X"
+                    break
+                sym = sym.strip().upper()
+                if sym in ("X", "O"):
+                    self.pvp_start_symbol = sym
+                    break
+                else:
+                    messagebox.showerror("Invalid choice", "Please type: X or O.", parent=root)
+            self.current_player = self.pvp_start_symbol
+            self.status_label["text"] = f"Player {self.current_player}'s turn"
+        self.update_score_label()
+
 
-root.after(100, choose_mode_and_difficulty)
-root.mainloop()
+if __name__ == "__main__":
+    main(TicTacToe)